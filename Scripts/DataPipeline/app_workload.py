@@ -0,0 +1,154 @@
+"""
+App Query Workload
+==================
+The read queries the iOS app runs against BibleData.sqlite, written out as the
+SQL GRDB generates for them, with a sampler for realistic arguments. Shared by
+index_advisor.py and the read-path benchmarks.
+
+Each WORKLOAD entry:
+  source:    the Swift method issuing the query
+  weight:    relative frequency in a typical reading session
+  arguments: the ARGUMENT_SAMPLERS kind its named parameters come from
+  sql:       the query
+
+The deprecated LIKE search (BibleRepository.searchVerses) is left out: its
+leading-wildcard pattern cannot use an index, and SearchService replaced it.
+"""
+
+import random
+import sqlite3
+
+WORKLOAD = {
+    "verse": {
+        "source": "BibleRepository.getVerse",
+        "weight": 10,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "verses" WHERE ("translation_id" = :translation) AND ("book_id" = :book) '
+               'AND ("chapter" = :chapter) AND ("verse" = :verse) LIMIT 1',
+    },
+    "chapter": {
+        "source": "BibleRepository.getChapter",
+        "weight": 30,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "verses" WHERE ("translation_id" = :translation) AND ("book_id" = :book) '
+               'AND ("chapter" = :chapter) ORDER BY "verse"',
+    },
+    "verse_count": {
+        "source": "BibleRepository.getVerseCount",
+        "weight": 5,
+        "arguments": "verse",
+        "sql": 'SELECT COUNT(*) FROM "verses" WHERE ("translation_id" = :translation) AND ("book_id" = :book) '
+               'AND ("chapter" = :chapter)',
+    },
+    "chapter_count": {
+        "source": "BibleRepository.getChapterCount",
+        "weight": 5,
+        "arguments": "verse",
+        "sql": "SELECT MAX(chapter) FROM verses WHERE translation_id = :translation AND book_id = :book",
+    },
+    "translations": {
+        "source": "BibleRepository.getAvailableTranslations",
+        "weight": 1,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "translations" WHERE id IN (SELECT DISTINCT translation_id FROM verses) '
+               'ORDER BY "sort_order"',
+    },
+    "compare": {
+        "source": "BibleRepository.getVerseInTranslations",
+        "weight": 3,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "verses" WHERE ("translation_id" IN (\'kjv\', \'asv\', \'web\', \'ylt\')) '
+               'AND ("book_id" = :book) AND ("chapter" = :chapter) AND ("verse" = :verse)',
+    },
+    "search": {
+        "source": "SearchService.search",
+        "weight": 8,
+        "arguments": "term",
+        "sql": "SELECT v.*, verses_fts.rowid as fts_rowid, bm25(verses_fts) as rank, "
+               "snippet(verses_fts, 0, '<mark>', '</mark>', '...', 32) as snippet "
+               "FROM verses_fts JOIN verses v ON verses_fts.rowid = v.rowid "
+               "WHERE verses_fts MATCH :term AND v.translation_id = :translation ORDER BY rank LIMIT 50",
+    },
+    "crossrefs": {
+        "source": "CrossRefService.getCrossReferences",
+        "weight": 15,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "cross_references" WHERE ("source_book_id" = :book) AND ("source_chapter" = :chapter) '
+               'AND ("source_verse_start" <= :verse) AND ("source_verse_end" >= :verse) ORDER BY "weight" DESC',
+    },
+    "incoming_crossrefs": {
+        "source": "CrossRefService.getIncomingCrossReferences",
+        "weight": 3,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "cross_references" WHERE ("target_book_id" = :book) AND ("target_chapter" = :chapter) '
+               'AND ("target_verse_start" <= :verse) AND ("target_verse_end" >= :verse) ORDER BY "weight" DESC',
+    },
+    "tokens": {
+        "source": "LanguageService.getTokens",
+        "weight": 10,
+        "arguments": "verse",
+        "sql": 'SELECT * FROM "language_tokens" WHERE ("book_id" = :book) AND ("chapter" = :chapter) '
+               'AND ("verse" = :verse) ORDER BY "position"',
+    },
+    "lemma_occurrences": {
+        "source": "LanguageService.getOccurrences",
+        "weight": 2,
+        "arguments": "lemma",
+        "sql": 'SELECT * FROM "language_tokens" WHERE ("lemma" = :lemma) ORDER BY "book_id", "chapter", "verse"',
+    },
+    "ai_cache": {
+        "source": "ai_cache (v6 migration)",
+        "weight": 8,
+        "arguments": "cache_key",
+        "sql": 'SELECT * FROM "ai_cache" WHERE ("cache_key" = :cache_key) LIMIT 1',
+    },
+}
+
+# Words people search for; any missing from a database just match nothing
+SEARCH_TERMS = [
+    "love", "faith", "grace", "light", "shepherd", "covenant", "mercy", "kingdom",
+    "spirit", "peace", "righteousness", "wisdom", "resurrection", "truth", "hope",
+]
+
+
+def sample_verses(conn: sqlite3.Connection, count: int, rng: random.Random) -> list:
+    """`count` random KJV verses as {book, chapter, verse, translation} argument dicts."""
+    verses = conn.execute("SELECT book_id, chapter, verse FROM verses WHERE translation_id = 'kjv'").fetchall()
+    return [{"book": book, "chapter": chapter, "verse": verse, "translation": "kjv"}
+            for book, chapter, verse in rng.choices(verses, k=count)] if verses else []
+
+
+def sample_terms(conn: sqlite3.Connection, count: int, rng: random.Random) -> list:
+    """`count` SEARCH_TERMS picks, searched in the KJV."""
+    return [{"term": term, "translation": "kjv"} for term in rng.choices(SEARCH_TERMS, k=count)]
+
+
+def sample_lemmas(conn: sqlite3.Connection, count: int, rng: random.Random) -> list:
+    """Lemmas weighted by use, so common words are looked up more often (as in the app)."""
+    lemmas = [row[0] for row in conn.execute("SELECT lemma FROM language_tokens WHERE lemma IS NOT NULL")]
+    return [{"lemma": lemma} for lemma in rng.choices(lemmas, k=count)] if lemmas else []
+
+
+def sample_cache_keys(conn: sqlite3.Connection, count: int, rng: random.Random) -> list:
+    """The bundled ai_cache is empty, so these are the misses a fresh install sees."""
+    return [{"cache_key": f"explain:{rng.randrange(1, 67)}:{rng.randrange(1, 151)}:{rng.randrange(1, 177)}"}
+            for _ in range(count)]
+
+
+ARGUMENT_SAMPLERS = {
+    "verse": sample_verses,
+    "term": sample_terms,
+    "lemma": sample_lemmas,
+    "cache_key": sample_cache_keys,
+}
+
+
+def sample_arguments(conn: sqlite3.Connection, count: int, seed: int = 0) -> dict:
+    """
+    `count` argument dicts for each WORKLOAD query (fewer if the database has no
+    rows to sample, e.g. lemmas after --skip-morphology). Seeded, so runs compare.
+    """
+    samples = {}
+    for kind, sampler in ARGUMENT_SAMPLERS.items():
+        samples[kind] = sampler(conn, count, random.Random(seed))
+    return {name: samples[query["arguments"]] for name, query in WORKLOAD.items()}
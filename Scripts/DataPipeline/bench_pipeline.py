@@ -0,0 +1,740 @@
+#!/usr/bin/env python3
+"""
+Bible Data Pipeline Benchmarks
+==============================
+Microbenchmarks for the stages of build_bible_database.py, run against the
+files in cache/ (and, for read-path benchmarks, a built database).
+
+Usage:
+    python bench_pipeline.py parser [--repeat N]
+    python bench_pipeline.py crossrefs [--repeat N]
+    python bench_pipeline.py fts [--database PATH] [--repeat N]
+    python bench_pipeline.py chapters [--database PATH] [--repeat N]
+    python bench_pipeline.py layout --clustered PATH [--database PATH] [--repeat N]
+    python bench_pipeline.py tokens --compact PATH [--database PATH] [--repeat N]
+    python bench_pipeline.py interlinear [--database PATH] [--repeat N]
+    python bench_pipeline.py concordance [--database PATH] [--limit N]
+    python bench_pipeline.py topk [--database PATH] [--repeat N]
+    python bench_pipeline.py reverse [--database PATH] [--repeat N]
+
+Each subcommand prints a before/after table so regressions are easy to spot
+when the builder changes.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import build_bible_database as builder
+
+
+def legacy_parse_stepbible_line(line: str, language: str) -> dict:
+    """The original dict-building parser, kept verbatim as the benchmark baseline."""
+    parts = line.split('\t')
+    if len(parts) < 5:
+        return None
+
+    try:
+        ref_col = parts[0].strip()
+
+        if '=' in ref_col:
+            ref_col = ref_col.split('=')[0]
+
+        if '#' not in ref_col:
+            return None
+
+        verse_ref, word_pos_str = ref_col.rsplit('#', 1)
+
+        ref_split = verse_ref.split('.')
+        if len(ref_split) < 3:
+            return None
+
+        book_abbrev = ref_split[0]
+        chapter = int(ref_split[1])
+        verse = int(ref_split[2])
+        book_id = builder.OSIS_TO_BOOK_ID.get(book_abbrev)
+
+        if not book_id:
+            return None
+
+        position = int(word_pos_str) if word_pos_str.isdigit() else 1
+
+        strongs_raw = parts[4] if len(parts) > 4 else ""
+        strongs = None
+        if strongs_raw:
+            import re
+            match = re.search(r'H(\d+[A-Z]?)', strongs_raw)
+            if match:
+                strongs = 'H' + match.group(1)
+            else:
+                match = re.search(r'G(\d+[A-Z]?)', strongs_raw)
+                if match:
+                    strongs = 'G' + match.group(1)
+
+        return {
+            "book_id": book_id,
+            "chapter": chapter,
+            "verse": verse,
+            "position": position,
+            "surface": parts[1] if len(parts) > 1 else "",
+            "transliteration": parts[2] if len(parts) > 2 else None,
+            "gloss": parts[3] if len(parts) > 3 else None,
+            "strong_id": strongs,
+            "morph": parts[5] if len(parts) > 5 else None,
+            "lemma": None,
+            "language": language
+        }
+    except (ValueError, IndexError):
+        return None
+
+
+def legacy_parse_to_tuple(line: str, language: str) -> tuple:
+    """Legacy parse plus the dict-to-tuple conversion import_morphology used to do."""
+    token = legacy_parse_stepbible_line(line, language)
+    if not token:
+        return None
+    return (
+        token["book_id"], token["chapter"], token["verse"], token["position"],
+        token["surface"], token["lemma"], token["morph"], token["strong_id"],
+        token["gloss"], token["language"]
+    )
+
+
+def load_morphology_lines() -> list:
+    """Read the cached STEPBible files into memory: [(filename, language, lines)]."""
+    files = []
+    for source_key, language in builder.MORPHOLOGY_SOURCES:
+        path = builder.CACHE_DIR / builder.SOURCES[source_key]["filename"]
+        if not path.exists():
+            print(f"  [missing] {path.name}")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+        lines = [line for line in lines if line and not line.startswith(('#', '$'))]
+        files.append((path.name, language, lines))
+    return files
+
+
+def time_parser(parse, files: list, repeat: int) -> tuple:
+    """Best-of-N wall time for parsing every line. Returns (seconds, lines, tokens)."""
+    best = None
+    for _ in range(repeat):
+        lines = tokens = 0
+        start = time.perf_counter()
+        for _, language, file_lines in files:
+            for line in file_lines:
+                if parse(line, language) is not None:
+                    tokens += 1
+            lines += len(file_lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, lines, tokens
+
+
+def bench_parser(args):
+    """Lines/sec of the legacy and current STEPBible parsers over the cached files."""
+    files = load_morphology_lines()
+    if not files:
+        print("Error: no STEPBible files in cache/. Run build_bible_database.py first.")
+        sys.exit(1)
+
+    print(f"STEPBible parser ({sum(len(f[2]) for f in files):,} lines, best of {args.repeat})")
+    results = [
+        ("legacy (dict + tuple)", time_parser(legacy_parse_to_tuple, files, args.repeat)),
+        ("current (tuple)", time_parser(builder.parse_stepbible_line, files, args.repeat)),
+    ]
+
+    baseline = results[0][1][0]
+    for name, (elapsed, lines, tokens) in results:
+        print(f"  {name:<24} {lines / elapsed:>12,.0f} lines/sec  "
+              f"{tokens:>9,} tokens  {baseline / elapsed:5.2f}x")
+
+    # Lemma coverage is the other half of the rewrite
+    with_lemma = total = 0
+    for _, language, file_lines in files:
+        for line in file_lines:
+            token = builder.parse_stepbible_line(line, language)
+            if token:
+                total += 1
+                with_lemma += token[5] is not None
+    if total:
+        print(f"  lemma coverage: {with_lemma:,}/{total:,} ({with_lemma / total:.1%})")
+
+
+def time_crossref_import(extract: bool) -> float:
+    """End-to-end cross-reference import into a fresh in-memory database."""
+    conn = sqlite3.connect(":memory:")
+    builder.create_tables(conn)
+    source = builder.SOURCES["crossrefs"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if extract:
+            # The old path: extract the zip into the cache, then read the text file
+            with tempfile.TemporaryDirectory() as tmp:
+                with zipfile.ZipFile(builder.CACHE_DIR / source["filename"]) as zf:
+                    zf.extractall(tmp)
+                builder.import_cross_references(conn, Path(tmp) / source["zip_member"])
+        else:
+            builder.import_cross_references(conn)
+        elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def bench_crossrefs(args):
+    """Cross-reference import: extract-then-read versus streaming from the zip."""
+    zip_path = builder.CACHE_DIR / builder.SOURCES["crossrefs"]["filename"]
+    if not zip_path.exists():
+        print(f"Error: {zip_path.name} not in cache/. Run build_bible_database.py first.")
+        sys.exit(1)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        member_size = zf.getinfo(builder.SOURCES["crossrefs"]["zip_member"]).file_size
+    print(f"Cross-reference import ({zip_path.stat().st_size / 1e6:.1f} MB zip, "
+          f"{member_size / 1e6:.1f} MB extracted, best of {args.repeat})")
+
+    results = []
+    for name, extract in (("extract + read", True), ("stream from zip", False)):
+        best = min(time_crossref_import(extract) for _ in range(args.repeat))
+        results.append((name, best))
+
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f"  {name:<24} {elapsed:8.2f}s  {baseline / elapsed:5.2f}x")
+    print(f"  disk written by extraction: {member_size / 1e6:.1f} MB (none when streaming)")
+
+
+# Search inputs as SearchService.buildFTSQuery turns them into MATCH expressions:
+# every plain term gets a trailing *, quoted input becomes a phrase.
+FTS_QUERIES = [
+    "love*", "faith*", "lord*", "god*", "jesus*", "spirit*",
+    "gr*", "be*", "so*",
+    "love* god*", "lord* AND shepherd*", "faith* OR hope*", "light* NOT dark*",
+    "king* david*", "son* man*", "kingdom* heaven*",
+    '"in the beginning"', '"the lord is my shepherd"', '"son of man"',
+]
+
+# SearchService.executeSearch, with the translation filter and default limit
+FTS_SEARCH_SQL = """
+    SELECT v.*,
+           verses_fts.rowid as fts_rowid,
+           bm25(verses_fts) as rank,
+           snippet(verses_fts, 0, '<mark>', '</mark>', '...', 32) as snippet
+    FROM verses_fts
+    JOIN verses v ON verses_fts.rowid = v.rowid
+    WHERE verses_fts MATCH ? AND v.translation_id = ?
+    ORDER BY rank
+    LIMIT 50
+"""
+
+
+def build_fts_profile(database: Path, profile: str) -> tuple:
+    """Copy verses from a built database into memory and index them with one profile."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("ATTACH DATABASE ? AS source", (str(database),))
+    builder.create_tables(conn)
+    # Keep rowids: the index maps to them
+    conn.execute("INSERT INTO verses (rowid, translation_id, book_id, chapter, verse, text) "
+                 "SELECT rowid, translation_id, book_id, chapter, verse, text FROM source.verses")
+    conn.commit()
+    conn.execute("DETACH DATABASE source")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        builder.rebuild_fts_index(conn, profile)
+        elapsed = time.perf_counter() - start
+    # Measure the index as the builder ships it, after VACUUM
+    conn.execute("VACUUM")
+    size = conn.execute(
+        "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'verses_fts%'"
+    ).fetchone()[0]
+    return conn, elapsed, size
+
+
+def time_fts_queries(conn: sqlite3.Connection, repeat: int) -> tuple:
+    """Per-query latencies (ms) over FTS_QUERIES, and the queries the profile can't run."""
+    latencies = []
+    unsupported = []
+    for query in FTS_QUERIES:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                conn.execute(FTS_SEARCH_SQL, (query, "kjv")).fetchall()
+            except sqlite3.OperationalError:
+                unsupported.append(query)
+                break
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, unsupported
+
+
+def bench_fts(args):
+    """Index size, build time and search latency for each FTS profile."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+
+    print(f"FTS profiles ({len(FTS_QUERIES)} app-style queries x {args.repeat}, "
+          f"translation 'kjv', limit 50)")
+    print(f"  {'profile':<10} {'size':>9} {'build':>7} {'p50':>8} {'p99':>8}  app  unsupported")
+    for profile, settings in builder.FTS_PROFILES.items():
+        conn, elapsed, size = build_fts_profile(args.database, profile)
+        latencies, unsupported = time_fts_queries(conn, args.repeat)
+        conn.close()
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]
+        print(f"  {profile:<10} {size / 1e6:7.2f}MB {elapsed:6.2f}s {p50:6.2f}ms {p99:6.2f}ms  "
+              f"{'yes' if settings['app_compatible'] else 'no ':<4} {len(unsupported)}")
+
+
+def has_rows(conn: sqlite3.Connection, table: str) -> bool:
+    """True if the database has `table` and it is not empty (builder-only tables are optional)."""
+    try:
+        return conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def read_chapter_tables(conn: sqlite3.Connection, translation_id: str, book_id: int, chapter: int) -> int:
+    """The normalised read: verses, then per-verse cross-reference and token counts."""
+    verses = conn.execute(
+        "SELECT * FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? ORDER BY verse",
+        (translation_id, book_id, chapter)
+    ).fetchall()
+    crossrefs = {}
+    for start, end in conn.execute(
+            "SELECT source_verse_start, source_verse_end FROM cross_references "
+            "WHERE source_book_id = ? AND source_chapter = ?", (book_id, chapter)):
+        for verse in range(start, (end or start) + 1):
+            crossrefs[verse] = crossrefs.get(verse, 0) + 1
+    tokens = dict(conn.execute(
+        "SELECT verse, COUNT(*) FROM language_tokens WHERE book_id = ? AND chapter = ? GROUP BY verse",
+        (book_id, chapter)
+    ).fetchall())
+    # Pair each verse with its counts, as a chapter_payloads decode returns them
+    verse_counts = [(row[3], crossrefs.get(row[3], 0), tokens.get(row[3], 0)) for row in verses]
+    return len(verse_counts)
+
+
+def read_chapter_verses(conn: sqlite3.Connection, translation_id: str, book_id: int, chapter: int) -> int:
+    """What the app does today on chapter open: the verses query alone."""
+    return len(conn.execute(
+        "SELECT * FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? ORDER BY verse",
+        (translation_id, book_id, chapter)
+    ).fetchall())
+
+
+def read_chapter_payload(conn: sqlite3.Connection, translation_id: str, book_id: int, chapter: int) -> int:
+    """One primary-key fetch of chapter_payloads, decoded to verse texts and counts."""
+    encoding, payload = conn.execute(
+        "SELECT encoding, payload FROM chapter_payloads WHERE translation_id = ? AND book_id = ? AND chapter = ?",
+        (translation_id, book_id, chapter)
+    ).fetchone()
+    return len(builder.decode_chapter_payload(payload, encoding)["verses"])
+
+
+def bench_chapters(args):
+    """Chapter read latency: normalised tables versus chapter_payloads."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    conn = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    if not has_rows(conn, "chapter_payloads"):
+        print("Error: no chapter_payloads. Build with --chapter-payloads json|deflate.")
+        sys.exit(1)
+    chapters = conn.execute("SELECT translation_id, book_id, chapter FROM chapter_payloads").fetchall()
+    encoding, payload_bytes = conn.execute(
+        "SELECT MIN(encoding), SUM(LENGTH(payload)) FROM chapter_payloads"
+    ).fetchone()
+
+    print(f"Chapter reads ({len(chapters):,} chapters in random order x {args.repeat}, "
+          f"payloads {encoding}, {payload_bytes / 1e6:.2f} MB)")
+    readers = [
+        ("verses only", read_chapter_verses),
+        ("verses + counts", read_chapter_tables),
+        ("chapter_payloads", read_chapter_payload),
+    ]
+    order = chapters * args.repeat
+    random.Random(0).shuffle(order)
+    for name, read in readers:
+        latencies = []
+        for key in order:
+            start = time.perf_counter()
+            read(conn, *key)
+            latencies.append((time.perf_counter() - start) * 1e6)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"  {name:<18} p50 {statistics.median(latencies):8.1f}us  p99 {p99:8.1f}us")
+    conn.close()
+
+
+# Token reads in each layout: (name, SQL). Only language_tokens differs between
+# the layouts (verses and cross_references stay rowid tables), so only its
+# queries are timed: LanguageService.getTokens for a verse, and a whole chapter.
+LAYOUT_QUERIES = [
+    ("tokens (verse)", "SELECT * FROM language_tokens WHERE book_id = :book AND chapter = :chapter "
+                       "AND verse = :verse ORDER BY position"),
+    ("tokens (chapter)", "SELECT * FROM language_tokens WHERE book_id = :book AND chapter = :chapter "
+                         "ORDER BY verse, position"),
+]
+
+
+def database_sizes(conn: sqlite3.Connection) -> dict:
+    """Bytes per table, with its indexes folded in, from dbstat."""
+    sizes = {}
+    for table, size in conn.execute("""
+        SELECT COALESCE(m.tbl_name, d.name), SUM(d.pgsize)
+        FROM dbstat d LEFT JOIN sqlite_master m ON m.name = d.name
+        GROUP BY 1
+    """):
+        sizes[table] = size
+    return sizes
+
+
+def bench_layout(args):
+    """language_tokens size and read latency: rowid layout against --layout clustered."""
+    databases = [("rowid", args.database), ("clustered", args.clustered)]
+    for _, path in databases:
+        if not path.exists():
+            print(f"Error: {path} not found. Build both layouts with build_bible_database.py first.")
+            sys.exit(1)
+
+    connections = {name: sqlite3.connect(f"file:{path}?mode=ro", uri=True) for name, path in databases}
+    verses = connections["rowid"].execute("SELECT DISTINCT book_id, chapter, verse FROM language_tokens").fetchall()
+    if not verses:
+        print("Error: no language_tokens; build both layouts without --skip-morphology.")
+        sys.exit(1)
+    order = verses * args.repeat
+    random.Random(0).shuffle(order)
+
+    sizes = {name: database_sizes(conn) for name, conn in connections.items()}
+    print(f"Size ({', '.join(f'{name}: {path.stat().st_size / 1e6:.1f} MB' for name, path in databases)})")
+    print(f"  {'language_tokens':<18} " + "  ".join(f"{name} {sizes[name].get('language_tokens', 0) / 1e6:6.1f} MB"
+                                                    for name, _ in databases) + "  (with indexes)")
+
+    print(f"\nToken reads ({len(verses):,} verses in random order x {args.repeat})")
+    for query_name, sql in LAYOUT_QUERIES:
+        results = []
+        for name, conn in connections.items():
+            latencies = []
+            for book_id, chapter, verse in order:
+                params = {"book": book_id, "chapter": chapter, "verse": verse}
+                start = time.perf_counter()
+                conn.execute(sql, params).fetchall()
+                latencies.append((time.perf_counter() - start) * 1e6)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            results.append(f"{name} p50 {statistics.median(latencies):7.1f}us p99 {p99:7.1f}us")
+        print(f"  {query_name:<18} " + "   ".join(results))
+
+    for conn in connections.values():
+        conn.close()
+
+
+# LanguageService.getTokens for one verse; the same SQL reads the compact view
+TOKEN_VERSE_SQL = ("SELECT * FROM language_tokens WHERE book_id = ? AND chapter = ? AND verse = ? "
+                   "ORDER BY position")
+
+
+def bench_tokens(args):
+    """Token storage size and per-verse token fetches: the app's table against --token-storage compact."""
+    databases = [("table", args.database), ("compact", args.compact)]
+    for _, path in databases:
+        if not path.exists():
+            print(f"Error: {path} not found. Build both token storages with build_bible_database.py first.")
+            sys.exit(1)
+
+    connections = {name: sqlite3.connect(f"file:{path}?mode=ro", uri=True) for name, path in databases}
+    token_tables = ["language_tokens", "language_tokens_compact"] + [
+        table for table, _ in builder.TOKEN_DICTIONARIES.values()]
+    print("Token storage (with indexes)")
+    for name, conn in connections.items():
+        sizes = database_sizes(conn)
+        print(f"  {name:<10} {sum(sizes.get(table, 0) for table in token_tables) / 1e6:6.1f} MB   "
+              f"database {dict(databases)[name].stat().st_size / 1e6:6.1f} MB")
+
+    verses = connections["table"].execute("SELECT DISTINCT book_id, chapter, verse FROM language_tokens").fetchall()
+    order = verses * args.repeat
+    random.Random(0).shuffle(order)
+    print(f"\nVerse token fetches ({len(verses):,} verses in random order x {args.repeat})")
+    for name, conn in connections.items():
+        latencies = []
+        for key in order:
+            start = time.perf_counter()
+            conn.execute(TOKEN_VERSE_SQL, key).fetchall()
+            latencies.append((time.perf_counter() - start) * 1e6)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"  {name:<10} p50 {statistics.median(latencies):7.1f}us  p99 {p99:7.1f}us")
+
+    for conn in connections.values():
+        conn.close()
+
+
+def render_chapter_rows(conn: sqlite3.Connection, book_id: int, chapter: int) -> int:
+    """Interlinear chapter from language_tokens: one row per token, grouped into verses."""
+    verses = {}
+    for row in conn.execute("SELECT * FROM language_tokens WHERE book_id = ? AND chapter = ? "
+                            "ORDER BY verse, position", (book_id, chapter)):
+        verses.setdefault(row[3], []).append(row)
+    return len(verses)
+
+
+def render_chapter_packed(conn: sqlite3.Connection, book_id: int, chapter: int) -> int:
+    """Interlinear chapter from verse_tokens: one rowid range read, one JSON decode per verse."""
+    verses = {}
+    for verse, tokens in conn.execute(
+            "SELECT verse, tokens FROM verse_tokens WHERE verse_key BETWEEN ? AND ?",
+            (builder.pack_verse_key(book_id, chapter, 0), builder.pack_verse_key(book_id, chapter, 999))):
+        verses[verse] = builder.decode_verse_tokens(tokens)
+    return len(verses)
+
+
+def bench_interlinear(args):
+    """Whole-chapter interlinear rendering: per-token rows against verse_tokens."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py --verse-tokens first.")
+        sys.exit(1)
+    conn = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    if not has_rows(conn, "verse_tokens"):
+        print("Error: verse_tokens is missing or empty. Build with --verse-tokens.")
+        sys.exit(1)
+
+    sizes = database_sizes(conn)
+    print(f"Size (with indexes): language_tokens {sizes.get('language_tokens', 0) / 1e6:.1f} MB, "
+          f"verse_tokens {sizes['verse_tokens'] / 1e6:.1f} MB")
+
+    chapters = conn.execute("SELECT DISTINCT book_id, chapter FROM verse_tokens").fetchall()
+    order = chapters * args.repeat
+    random.Random(0).shuffle(order)
+    print(f"\nChapter renders ({len(chapters):,} chapters in random order x {args.repeat})")
+    for name, render in (("per-token rows", render_chapter_rows), ("verse_tokens", render_chapter_packed)):
+        latencies = []
+        for book_id, chapter in order:
+            start = time.perf_counter()
+            render(conn, book_id, chapter)
+            latencies.append((time.perf_counter() - start) * 1e6)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"  {name:<16} p50 {statistics.median(latencies):8.1f}us  p99 {p99:8.1f}us")
+    conn.close()
+
+
+def bench_concordance(args):
+    """Every verse using a Strong's number: scanning language_tokens against strongs_concordance."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    conn = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    if not has_rows(conn, "strongs_concordance"):
+        print("Error: strongs_concordance is missing or empty. Build with --concordance.")
+        sys.exit(1)
+
+    sizes = database_sizes(conn)
+    print(f"Size (with indexes): strongs_concordance {sizes['strongs_concordance'] / 1e6:.1f} MB")
+
+    # The spellings language_tokens stores for each key ("G0026", "G0026G", ...)
+    spellings = {}
+    for (strong_id,) in conn.execute("SELECT DISTINCT strong_id FROM language_tokens WHERE strong_id IS NOT NULL"):
+        key = builder.strongs_key(strong_id)
+        if key is not None:
+            spellings.setdefault(key, []).append(strong_id)
+    keys = sorted(spellings)
+    random.Random(0).shuffle(keys)
+    keys = keys[:args.limit]
+
+    def scan(key):
+        placeholders = ", ".join("?" * len(spellings[key]))
+        return conn.execute(
+            f"SELECT DISTINCT book_id, chapter, verse FROM language_tokens WHERE strong_id IN ({placeholders})",
+            spellings[key]
+        ).fetchall()
+
+    def postings(key):
+        row = conn.execute("SELECT postings FROM strongs_concordance WHERE strong_id = ?", (key,)).fetchone()
+        return builder.decode_postings(row[0])
+
+    print(f"\nStrong's lookups ({len(keys):,} numbers in random order)")
+    for name, lookup in (("language_tokens", scan), ("strongs_concordance", postings)):
+        latencies = []
+        for key in keys:
+            start = time.perf_counter()
+            lookup(key)
+            latencies.append((time.perf_counter() - start) * 1e6)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"  {name:<20} p50 {statistics.median(latencies):9.1f}us  p99 {p99:9.1f}us")
+    conn.close()
+
+
+# Verse-tap lookups: (name, SQL). The first is CrossRefService.getCrossReferences
+# for a single verse, the second CrossRefGenerator's full ranked list.
+TOPK_QUERIES = [
+    ("app (overlap)", "SELECT * FROM cross_references WHERE source_book_id = :book AND source_chapter = :chapter "
+                      "AND source_verse_start <= :verse AND source_verse_end >= :verse ORDER BY weight DESC"),
+    ("generator", "SELECT target_book_id, target_chapter, target_verse_start, target_verse_end, weight "
+                  "FROM cross_references WHERE source_book_id = :book AND source_chapter = :chapter "
+                  f"AND source_verse_start = :verse ORDER BY {builder.CROSSREF_RANK_ORDER}"),
+    ("crossref_topk", "SELECT * FROM crossref_topk WHERE source_book_id = :book AND source_chapter = :chapter "
+                      "AND source_verse = :verse ORDER BY rank"),
+]
+
+
+def bench_topk(args):
+    """Verse-tap cross-reference lookups: sorted queries against crossref_topk."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    conn = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    if not has_rows(conn, "crossref_topk"):
+        print("Error: no crossref_topk. Build with --crossref-topk N.")
+        sys.exit(1)
+
+    verses = conn.execute("""
+        SELECT source_book_id, source_chapter, source_verse_start, COUNT(*)
+        FROM cross_references GROUP BY 1, 2, 3
+    """).fetchall()
+    random.Random(0).shuffle(verses)
+    limit = conn.execute("SELECT MAX(rank) FROM crossref_topk").fetchone()[0]
+    print(f"Cross-reference lookups (top {limit}, {len(verses):,} source verses x {args.repeat})")
+
+    for label, sample in (("all verses", verses), ("30+ references", [v for v in verses if v[3] >= 30])):
+        print(f"  {label} ({len(sample):,})")
+        for name, sql in TOPK_QUERIES:
+            latencies = []
+            for _ in range(args.repeat):
+                for book_id, chapter, verse, _ in sample:
+                    start = time.perf_counter()
+                    conn.execute(sql, {"book": book_id, "chapter": chapter, "verse": verse}).fetchall()
+                    latencies.append((time.perf_counter() - start) * 1e6)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            print(f"    {name:<16} p50 {statistics.median(latencies):7.1f}us  p99 {p99:7.1f}us")
+    conn.close()
+
+
+# Reverse lookups, "which references point into this verse": (name, SQL). The
+# first is CrossRefService.getIncomingCrossReferences for a single verse; the
+# R*Tree is built in memory by bench_reverse for comparison.
+REVERSE_QUERIES = [
+    ("app (overlap)", "SELECT * FROM cross_references WHERE target_book_id = :book AND target_chapter = :chapter "
+                      "AND target_verse_start <= :verse AND target_verse_end >= :verse ORDER BY weight DESC"),
+    ("crossref_reverse", "SELECT c.* FROM crossref_reverse r JOIN cross_references c ON c.id = r.crossref_id "
+                         "WHERE r.target_ordinal = :ordinal ORDER BY c.weight DESC"),
+    ("r*tree", "SELECT c.* FROM crossref_rtree t JOIN cross_references c ON c.id = t.crossref_id "
+               "WHERE t.target_start <= :ordinal AND t.target_end >= :ordinal ORDER BY c.weight DESC"),
+]
+
+
+def bench_reverse(args):
+    """Incoming cross-reference lookups: the app's overlap query against crossref_reverse and an R*Tree."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    source = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    conn = sqlite3.connect(":memory:")
+    source.backup(conn)
+    source.close()
+    if not has_rows(conn, "crossref_reverse"):
+        print("Error: crossref_reverse is missing or empty. Rebuild with --crossref-reverse.")
+        sys.exit(1)
+
+    conn.execute("CREATE VIRTUAL TABLE crossref_rtree USING rtree_i32(crossref_id, target_start, target_end)")
+    conn.execute("INSERT INTO crossref_rtree SELECT crossref_id, target_start, target_end FROM crossref_ordinals")
+    sizes = database_sizes(conn)
+    rtree_size = sum(size for table, size in sizes.items() if table.startswith("crossref_rtree"))
+    print(f"Size: crossref_reverse {sizes['crossref_reverse'] / 1e6:.1f} MB, "
+          f"crossref_ordinals {sizes['crossref_ordinals'] / 1e6:.1f} MB, r*tree {rtree_size / 1e6:.1f} MB")
+
+    verses = conn.execute("SELECT ordinal, book_id, chapter, verse FROM verse_ordinals").fetchall()
+    random.Random(0).shuffle(verses)
+    print(f"\nIncoming lookups ({len(verses):,} verses in random order x {args.repeat})")
+    for name, sql in REVERSE_QUERIES:
+        latencies = []
+        found = 0
+        for _ in range(args.repeat):
+            for ordinal, book_id, chapter, verse in verses:
+                start = time.perf_counter()
+                rows = conn.execute(sql, {"ordinal": ordinal, "book": book_id,
+                                          "chapter": chapter, "verse": verse}).fetchall()
+                latencies.append((time.perf_counter() - start) * 1e6)
+                found += len(rows)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"  {name:<18} p50 {statistics.median(latencies):7.1f}us  p99 {p99:7.1f}us  "
+              f"{found // args.repeat:,} references found")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Bible data pipeline stages")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_cmd = subparsers.add_parser("parser", help="STEPBible line parser throughput")
+    parser_cmd.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    parser_cmd.set_defaults(func=bench_parser)
+
+    crossrefs_cmd = subparsers.add_parser("crossrefs", help="Cross-reference import from the cached zip")
+    crossrefs_cmd.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    crossrefs_cmd.set_defaults(func=bench_crossrefs)
+
+    fts_cmd = subparsers.add_parser("fts", help="FTS profile index size against search latency")
+    fts_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                         help="Built database to take verses from")
+    fts_cmd.add_argument("--repeat", type=int, default=20, help="Runs of each query")
+    fts_cmd.set_defaults(func=bench_fts)
+
+    chapters_cmd = subparsers.add_parser("chapters", help="Chapter read latency with and without chapter_payloads")
+    chapters_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                              help="Database built with --chapter-payloads")
+    chapters_cmd.add_argument("--repeat", type=int, default=5, help="Reads of each chapter")
+    chapters_cmd.set_defaults(func=bench_chapters)
+
+    layout_cmd = subparsers.add_parser("layout", help="Token size and reads: rowid against clustered layout")
+    layout_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                            help="Database built with the default rowid layout")
+    layout_cmd.add_argument("--clustered", type=Path, required=True,
+                            help="Database built with --layout clustered")
+    layout_cmd.add_argument("--repeat", type=int, default=3, help="Reads of each chapter")
+    layout_cmd.set_defaults(func=bench_layout)
+
+    tokens_cmd = subparsers.add_parser("tokens", help="Token storage size and verse fetches: table against compact")
+    tokens_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                            help="Database built with the default token storage")
+    tokens_cmd.add_argument("--compact", type=Path, required=True,
+                            help="Database built with --token-storage compact")
+    tokens_cmd.add_argument("--repeat", type=int, default=3, help="Fetches of each verse")
+    tokens_cmd.set_defaults(func=bench_tokens)
+
+    interlinear_cmd = subparsers.add_parser("interlinear",
+                                            help="Chapter interlinear reads: token rows against verse_tokens")
+    interlinear_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                                 help="Database built with --verse-tokens")
+    interlinear_cmd.add_argument("--repeat", type=int, default=3, help="Renders of each chapter")
+    interlinear_cmd.set_defaults(func=bench_interlinear)
+
+    concordance_cmd = subparsers.add_parser("concordance",
+                                            help="Strong's number lookups: token scans against strongs_concordance")
+    concordance_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                                 help="Database built with --concordance")
+    concordance_cmd.add_argument("--limit", type=int, default=500, help="Strong's numbers to look up")
+    concordance_cmd.set_defaults(func=bench_concordance)
+
+    topk_cmd = subparsers.add_parser("topk", help="Verse-tap cross-reference lookups with and without crossref_topk")
+    topk_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                          help="Database built with --crossref-topk")
+    topk_cmd.add_argument("--repeat", type=int, default=3, help="Lookups of each verse")
+    topk_cmd.set_defaults(func=bench_topk)
+
+    reverse_cmd = subparsers.add_parser("reverse", help="Incoming cross-reference lookups with and without crossref_reverse")
+    reverse_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT,
+                             help="Database built with --crossref-reverse, copied into memory")
+    reverse_cmd.add_argument("--repeat", type=int, default=3, help="Lookups of each verse")
+    reverse_cmd.set_defaults(func=bench_reverse)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
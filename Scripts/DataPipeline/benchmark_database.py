@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+BibleData.sqlite Workload Benchmark
+===================================
+Opens a built database read-only, the way the app does, and runs a weighted mix
+of the app's queries (app_workload.WORKLOAD: chapter loads, FTS search,
+cross-references and tokens for a verse, ai_cache lookups, ...), printing
+p50/p95/p99 latency per query.
+
+Usage:
+    python benchmark_database.py [--database PATH] [--iterations N]
+                                 [--mmap-size BYTES] [--cache-kib KIB]
+                                 [--save PATH] [--baseline PATH] [--tolerance FRACTION]
+
+--save writes the results as JSON; --baseline compares against a saved run and
+exits 1 if any query's p50 got slower than the baseline by more than
+--tolerance and by more than --min-delta-us (so jitter on microsecond queries
+is ignored). p95/p99 are only compared for queries timed at least
+MIN_TAIL_SAMPLES times in both runs; otherwise they are reported, not gated.
+A baseline recorded with different settings exits 2 without comparing.
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import app_workload
+import build_bible_database as builder
+
+PERCENTILES = {"p50_us": 50, "p95_us": 95, "p99_us": 99}
+
+# Queries timed fewer times than this are reported but never compared
+MIN_COMPARED_SAMPLES = 20
+
+# p95/p99 from fewer samples than this are mostly scheduler noise, so they are
+# only compared for queries timed at least this often in both runs
+MIN_TAIL_SAMPLES = 300
+
+# Exit codes for a --baseline run
+EXIT_REGRESSION = 1
+EXIT_SETTINGS_MISMATCH = 2
+
+
+def open_database(path: Path, mmap_size: int, cache_kib: int) -> sqlite3.Connection:
+    """Read-only connection with the given memory-map and page-cache sizes."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute(f"PRAGMA cache_size = -{int(cache_kib)}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def run_mix(conn: sqlite3.Connection, iterations: int, warmup: int, seed: int) -> dict:
+    """
+    Run `iterations` queries drawn by WORKLOAD weight (after `warmup` untimed ones)
+    and return each query's latency percentiles. Queries with no arguments to
+    sample (e.g. lemma lookups after --skip-morphology) are left out of the mix.
+    """
+    samples = app_workload.sample_arguments(conn, min(iterations, 1000), seed)
+    names = [name for name in app_workload.WORKLOAD if samples[name]]
+    weights = [app_workload.WORKLOAD[name]["weight"] for name in names]
+    rng = random.Random(seed)
+    picks = rng.choices(names, weights=weights, k=warmup + iterations)
+
+    latencies = {name: [] for name in names}
+    next_sample = dict.fromkeys(names, 0)
+    for step, name in enumerate(picks):
+        arguments = samples[name][next_sample[name] % len(samples[name])]
+        next_sample[name] += 1
+        start = time.perf_counter()
+        conn.execute(app_workload.WORKLOAD[name]["sql"], arguments).fetchall()
+        if step >= warmup:
+            latencies[name].append((time.perf_counter() - start) * 1e6)
+
+    results = {}
+    for name, timings in latencies.items():
+        if not timings:
+            continue
+        # quantiles(n=100) returns the 1st..99th percentiles
+        cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+        results[name] = {"count": len(timings), **{key: round(cuts[pct - 1], 1) for key, pct in PERCENTILES.items()}}
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_us: float) -> list:
+    """
+    (query, percentile, baseline, current) for every gated percentile that
+    regressed: p50 always, p95/p99 only with MIN_TAIL_SAMPLES in both runs.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("queries", {}).get(name)
+        if not previous:
+            continue
+        samples = min(current["count"], previous["count"])
+        if samples < MIN_COMPARED_SAMPLES:
+            continue
+        for key in PERCENTILES if samples >= MIN_TAIL_SAMPLES else ["p50_us"]:
+            if (current[key] > previous[key] * (1 + tolerance)
+                    and current[key] - previous[key] > min_delta_us):
+                regressions.append((name, key, previous[key], current[key]))
+    return regressions
+
+
+def settings_mismatch(settings: dict, baseline: dict) -> list:
+    """(setting, baseline, current) for every run setting that differs from the baseline's."""
+    previous = baseline.get("settings", {})
+    return [(key, previous.get(key), value) for key, value in settings.items() if previous.get(key) != value]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's query mix against a built database")
+    parser.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT, help="Built database")
+    parser.add_argument("--iterations", type=int, default=5000, help="Timed queries in the mix")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed queries run first")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the mix and its arguments")
+    parser.add_argument("--mmap-size", type=int, default=0, metavar="BYTES",
+                        help="PRAGMA mmap_size (default: 0, SQLite's default of no memory map)")
+    parser.add_argument("--cache-kib", type=int, default=2000, metavar="KIB",
+                        help="Page cache size (default: 2000, SQLite's default)")
+    parser.add_argument("--save", type=Path, metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, metavar="PATH", help="Fail if slower than a saved run")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="Allowed slowdown against --baseline as a fraction (default: 0.20)")
+    parser.add_argument("--min-delta-us", type=float, default=5.0,
+                        help="Ignore slowdowns smaller than this many microseconds (default: 5)")
+    args = parser.parse_args()
+
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: cannot read baseline: {e}")
+            sys.exit(1)
+
+    conn = open_database(args.database, args.mmap_size, args.cache_kib)
+    print(f"{args.database.name}: {args.database.stat().st_size / 1e6:.1f} MB, SQLite {sqlite3.sqlite_version}, "
+          f"mmap_size {args.mmap_size:,}, cache {args.cache_kib:,} KiB")
+    print(f"Query mix: {args.iterations:,} queries after {args.warmup:,} warm-up (seed {args.seed})\n")
+    settings = {"iterations": args.iterations, "warmup": args.warmup, "seed": args.seed,
+                "mmap_size": args.mmap_size, "cache_kib": args.cache_kib}
+    results = run_mix(conn, args.iterations, args.warmup, args.seed)
+    conn.close()
+
+    print(f"  {'query':<20} {'count':>6} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for name, result in results.items():
+        print(f"  {name:<20} {result['count']:>6,} {result['p50_us']:>8.1f}us {result['p95_us']:>8.1f}us "
+              f"{result['p99_us']:>8.1f}us")
+
+    report = {
+        "database": str(args.database),
+        "size_bytes": args.database.stat().st_size,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "sqlite_version": sqlite3.sqlite_version,
+        "settings": settings,
+        "queries": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.save}")
+
+    if baseline is not None:
+        mismatched = settings_mismatch(settings, baseline)
+        if mismatched:
+            print(f"\nError: {args.baseline.name} was recorded with different settings; not comparing:")
+            for key, previous, current in mismatched:
+                print(f"  {key:<12} {previous} (baseline) vs {current}")
+            sys.exit(EXIT_SETTINGS_MISMATCH)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_us)
+        if regressions:
+            print(f"\nRegressions against {args.baseline.name} (tolerance {args.tolerance:.0%}):")
+            for name, key, previous, current in regressions:
+                print(f"  {name:<20} {key[:3]} {previous:8.1f}us -> {current:8.1f}us")
+            sys.exit(EXIT_REGRESSION)
+        print(f"\nNo regressions against {args.baseline.name} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
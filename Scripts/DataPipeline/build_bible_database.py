@@ -3,14 +3,14 @@
 Bible Data Pipeline
 ==================
 Downloads and processes Bible data from open-source repositories:
-- KJV verses from scrollmapper/bible_databases
+- KJV (and optional ASV, WEB, YLT) verses from scrollmapper/bible_databases
 - Cross-references from OpenBible.info
 - Morphology from STEPBible-Data
 
 Generates BibleData.sqlite for the iOS app.
 
 Usage:
-    python build_bible_database.py [--output PATH] [--skip-download]
+    python build_bible_database.py [--output PATH] [--skip-download] [--jobs N]
 
 License: This script is part of the BibleStudy iOS app.
 Data sources have their own licenses (see attributions).
@@ -21,10 +21,30 @@ import json
 import os
 import sys
 import argparse
+import contextlib
+import cProfile
 import hashlib
+import io
+import random
+import re
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from email.utils import formatdate
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
 
+import app_workload
+
 # Optional imports for download progress
 try:
     import requests
@@ -34,10 +54,41 @@ except ImportError:
     HAS_REQUESTS = False
     print("Warning: requests/tqdm not installed. Run: pip install requests tqdm")
 
+# Peak RSS for --profile (Unix only)
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+# Optional imports for --crossref-graph
+try:
+    import numpy as np
+    from scipy import sparse
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 CACHE_DIR = SCRIPT_DIR / "cache"
 DEFAULT_OUTPUT = SCRIPT_DIR.parent.parent / "BibleStudy" / "Resources" / "BibleData.sqlite"
+# Per-source checksums and per-stage outputs of the last build (see --incremental)
+MANIFEST_PATH = CACHE_DIR / "build_manifest.json"
+# Page cache for --fast builds (KiB); the whole database fits comfortably
+FAST_BUILD_CACHE_KIB = 512 * 1024
+# SHA-256 of each source file, checked before every build (see --pin-sources)
+PINNED_CHECKSUMS_PATH = SCRIPT_DIR / "pinned_sources.json"
+# Concurrent source downloads
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_TIMEOUT = 60
+# --profile report, written next to the output database
+BUILD_REPORT_SUFFIX = ".build-report.json"
+# Read buffer for streaming large source files
+SOURCE_READ_BUFFER = 1 << 20
+# Rows per executemany() call in the bulk importers (see write_in_chunks)
+INSERT_CHUNK_SIZE = 5000
 
 # Data source URLs
 SOURCES = {
@@ -47,11 +98,34 @@ SOURCES = {
         "license": "Public Domain",
         "attribution": "KJV text from scrollmapper/bible_databases"
     },
+    # Further public-domain translations (see TRANSLATIONS). Optional sources are
+    # never downloaded automatically; copy the file into cache/ to bundle it.
+    "asv_sqlite": {
+        "url": "https://github.com/scrollmapper/bible_databases/raw/master/formats/sqlite/ASV.db",
+        "filename": "ASV.db",
+        "optional": True,
+        "license": "Public Domain",
+        "attribution": "ASV text from scrollmapper/bible_databases"
+    },
+    "web_sqlite": {
+        "url": "https://github.com/scrollmapper/bible_databases/raw/master/formats/sqlite/WEB.db",
+        "filename": "WEB.db",
+        "optional": True,
+        "license": "Public Domain",
+        "attribution": "WEB text from scrollmapper/bible_databases"
+    },
+    "ylt_sqlite": {
+        "url": "https://github.com/scrollmapper/bible_databases/raw/master/formats/sqlite/YLT.db",
+        "filename": "YLT.db",
+        "optional": True,
+        "license": "Public Domain",
+        "attribution": "YLT text from scrollmapper/bible_databases"
+    },
     "crossrefs": {
         "url": "https://a.openbible.info/data/cross-references.zip",
         "filename": "cross-references.zip",
         "is_zip": True,
-        "extract_file": "cross_references.txt",
+        "zip_member": "cross_references.txt",
         "license": "CC BY 4.0",
         "attribution": "Cross-references compiled by OpenBible.info"
     },
@@ -131,94 +205,405 @@ OSIS_TO_BOOK_ID = {
 }
 
 
-def download_file(url: str, dest: Path, desc: str = None) -> bool:
-    """Download a file with progress bar."""
+def download_file(url: str, dest: Path, desc: str = None, position: int = 0, restarted: bool = False) -> str:
+    """
+    Download url to dest with a progress bar.
+
+    Data is written to dest.part and renamed when complete, so an interrupted
+    download resumes with an HTTP Range request (guarded by If-Range) instead of
+    starting over. If dest already exists, the request is conditional on the
+    ETag/Last-Modified saved from the previous download and a 304 leaves dest as is.
+    A 416 for the Range request discards the partial file and starts over once.
+
+    Returns "downloaded", "not-modified", or None on failure.
+    """
     if not HAS_REQUESTS:
         print(f"Error: Cannot download without requests library")
-        return False
+        return None
+
+    part = dest.with_name(dest.name + ".part")
+    meta_path = dest.with_name(dest.name + ".meta.json")
+    saved = {}
+    if meta_path.exists():
+        try:
+            saved = json.loads(meta_path.read_text())
+        except ValueError:
+            saved = {}
+
+    headers = {}
+    offset = 0
+    if part.exists() and (saved.get("etag") or saved.get("last_modified")):
+        offset = part.stat().st_size
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = saved.get("etag") or saved["last_modified"]
+    elif dest.exists():
+        if saved.get("etag"):
+            headers["If-None-Match"] = saved["etag"]
+        # Files cached before validators were recorded fall back to their mtime
+        headers["If-Modified-Since"] = saved.get("last_modified") or formatdate(dest.stat().st_mtime, usegmt=True)
 
     try:
-        response = requests.get(url, stream=True)
+        response = requests.get(url, stream=True, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+        if response.status_code == 304:
+            return "not-modified"
+        if response.status_code == 416 and not restarted:
+            # The partial file is no longer a prefix of the remote file; start over
+            response.close()
+            part.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            return download_file(url, dest, desc, position, restarted=True)
         response.raise_for_status()
-        total = int(response.headers.get('content-length', 0))
+        if response.status_code != 206:
+            # Full response: no partial, Range ignored, or If-Range saw a new version
+            offset = 0
 
         dest.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(dest, 'wb') as f:
-            with tqdm(total=total, unit='B', unit_scale=True, desc=desc or dest.name) as pbar:
-                for chunk in response.iter_content(chunk_size=8192):
+        meta_path.write_text(json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }))
+
+        total = offset + int(response.headers.get('content-length', 0))
+        with open(part, 'ab' if offset else 'wb') as f:
+            with tqdm(total=total, initial=offset, unit='B', unit_scale=True,
+                      desc=desc or dest.name, position=position) as pbar:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
                     pbar.update(len(chunk))
-        return True
+        os.replace(part, dest)
+        return "downloaded"
     except Exception as e:
         print(f"Error downloading {url}: {e}")
-        return False
+        return None
 
 
-def ensure_cache_files(skip_download: bool = False) -> bool:
-    """Ensure all required source files are cached."""
-    import zipfile
+def ensure_cache_files(skip_download: bool = False, refresh: bool = False) -> bool:
+    """Ensure all required source files are cached.
 
+    Missing files are downloaded concurrently. With refresh, cached files are
+    revalidated against the server and only re-downloaded if they changed.
+    """
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
     all_present = True
+    to_fetch = []
     for key, source in SOURCES.items():
         dest = CACHE_DIR / source["filename"]
 
-        # For zip files, check if the extracted file exists
-        if source.get("is_zip"):
-            extract_file = CACHE_DIR / source.get("extract_file", "")
-            if extract_file.exists():
-                print(f"  [cached] {source['extract_file']}")
-                continue
-            elif dest.exists():
-                # Zip exists but not extracted
-                print(f"  [extracting] {source['filename']}...")
-                try:
-                    with zipfile.ZipFile(dest, 'r') as zf:
-                        zf.extractall(CACHE_DIR)
-                    print(f"  [extracted] {source['extract_file']}")
-                    continue
-                except Exception as e:
-                    print(f"  Error extracting: {e}")
-                    all_present = False
-                    continue
-
-        if dest.exists():
+        if source.get("optional") and not dest.exists():
+            print(f"  [optional] {source['filename']} not in cache, skipping")
+        elif dest.exists() and not refresh:
             print(f"  [cached] {source['filename']}")
         elif skip_download:
-            print(f"  [missing] {source['filename']} (skipping download)")
-            all_present = False
+            print(f"  [{'cached' if dest.exists() else 'missing'}] {source['filename']} (skipping download)")
+            all_present = all_present and dest.exists()
         else:
-            print(f"  [downloading] {source['filename']}...")
-            if download_file(source["url"], dest, source["filename"]):
-                # Extract if it's a zip
-                if source.get("is_zip"):
-                    print(f"  [extracting] {source['filename']}...")
-                    try:
-                        with zipfile.ZipFile(dest, 'r') as zf:
-                            zf.extractall(CACHE_DIR)
-                        print(f"  [extracted] {source.get('extract_file', '')}")
-                    except Exception as e:
-                        print(f"  Error extracting: {e}")
-                        all_present = False
-            else:
+            to_fetch.append(key)
+
+    if to_fetch:
+        print(f"  [downloading] {', '.join(SOURCES[key]['filename'] for key in to_fetch)}...")
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {
+                key: executor.submit(download_file, SOURCES[key]["url"], CACHE_DIR / SOURCES[key]["filename"],
+                                     SOURCES[key]["filename"], position)
+                for position, key in enumerate(to_fetch)
+            }
+        for key, future in futures.items():
+            source = SOURCES[key]
+            status = future.result()
+            if status is None:
                 all_present = False
+                continue
+            print(f"  [{'unchanged' if status == 'not-modified' else 'downloaded'}] {source['filename']}")
 
     return all_present
 
 
-def compute_file_checksum(path: Path) -> str:
-    """Compute MD5 checksum of a file."""
-    md5 = hashlib.md5()
+def load_pinned_checksums() -> dict:
+    """Load the pinned SHA-256 checksums, keyed by cache filename."""
+    if not PINNED_CHECKSUMS_PATH.exists():
+        return {}
+    with open(PINNED_CHECKSUMS_PATH) as f:
+        return json.load(f)
+
+
+def pin_source_checksums():
+    """Pin the SHA-256 of every cached source file (run after a trusted download)."""
+    pinned = load_pinned_checksums()
+    for source in SOURCES.values():
+        path = CACHE_DIR / source["filename"]
+        if path.exists():
+            pinned[source["filename"]] = compute_file_checksum(path, "sha256")
+    with open(PINNED_CHECKSUMS_PATH, "w") as f:
+        json.dump(pinned, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"  Pinned {len(pinned)} source checksums in {PINNED_CHECKSUMS_PATH.name}")
+
+
+def verify_pinned_checksums() -> bool:
+    """Check cached source files against pinned_sources.json. Returns False on any mismatch."""
+    pinned = load_pinned_checksums()
+    ok = True
+    for source in SOURCES.values():
+        path = CACHE_DIR / source["filename"]
+        expected = pinned.get(source["filename"])
+        if not path.exists():
+            continue
+        if not expected:
+            print(f"  [unpinned] {source['filename']}")
+            continue
+        actual = compute_file_checksum(path, "sha256")
+        if actual != expected:
+            print(f"  [checksum mismatch] {source['filename']}: expected {expected[:12]}..., got {actual[:12]}...")
+            ok = False
+    return ok
+
+
+def compute_file_checksum(path: Path, algorithm: str = "md5") -> str:
+    """Compute the checksum of a file (MD5 by default)."""
+    digest = hashlib.new(algorithm)
     with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            md5.update(chunk)
-    return md5.hexdigest()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def combined_checksum(checksums: list) -> str:
+    """Combine several checksums (or any JSON-serialisable values) into one MD5."""
+    return hashlib.md5(json.dumps(checksums, sort_keys=True).encode()).hexdigest()
+
+
+def compute_source_checksums() -> dict:
+    """Checksum every cached source file, keyed by SOURCES key. Missing files map to None."""
+    checksums = {}
+    for key, source in SOURCES.items():
+        path = CACHE_DIR / source["filename"]
+        checksums[key] = compute_file_checksum(path) if path.exists() else None
+    return checksums
+
+
+def load_build_manifest() -> dict:
+    """Load the manifest written by the previous build, or {} if there is none."""
+    if not MANIFEST_PATH.exists():
+        return {}
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"  Warning: ignoring unreadable build manifest: {e}")
+        return {}
+
+
+def save_build_manifest(manifest: dict):
+    """Write the build manifest atomically."""
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def stage_fingerprint(name: str, checksums: dict, options: dict, fingerprints: dict) -> str:
+    """
+    Fingerprint a stage from the checksums of its source files, the options that
+    change its output, and the fingerprints of the stages it reads from.
+    """
+    stage = BUILD_STAGES[name]
+    return combined_checksum({
+        "sources": {key: checksums.get(key) for key in stage["sources"]},
+        "options": options.get(name),
+        "after": {upstream: fingerprints[upstream] for upstream in stage["after"]},
+    })
+
+
+def open_fast_build_database(existing: Path = None) -> sqlite3.Connection:
+    """
+    Open an in-memory database for --fast builds, optionally seeded from an existing
+    output. The build artifact is rewritten from scratch on failure, so journaling,
+    fsyncs and foreign key checks are all turned off.
+    """
+    conn = sqlite3.connect(":memory:")
+    if existing is not None:
+        source = sqlite3.connect(existing)
+        source.backup(conn)
+        source.close()
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(f"PRAGMA cache_size = -{FAST_BUILD_CACHE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA foreign_keys = OFF")
+    return conn
+
+
+def write_database_atomically(conn: sqlite3.Connection, output: Path):
+    """
+    Write a compacted copy of conn next to output with VACUUM INTO, then rename it
+    over output so readers never see a half-written file.
+    """
+    tmp_path = output.with_name(output.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn.execute("VACUUM INTO ?", (str(tmp_path),))
+
+    # Match the header of a regular build, which is left in WAL mode
+    tmp_conn = sqlite3.connect(tmp_path)
+    tmp_conn.execute("PRAGMA journal_mode = WAL")
+    tmp_conn.close()
+
+    for suffix in ("-wal", "-shm"):
+        Path(str(output) + suffix).unlink(missing_ok=True)
+    os.replace(tmp_path, output)
+
+
+# Secondary indexes (matching iOS migrations): (name, table, columns).
+# Built by create_indexes after the bulk load so inserts skip B-tree maintenance.
+SCHEMA_INDEXES = [
+    ("idx_verses_translation_book_chapter", "verses", "translation_id, book_id, chapter"),
+    ("idx_verses_text", "verses", "text"),
+    ("idx_crossrefs_source", "cross_references", "source_book_id, source_chapter, source_verse_start"),
+    ("idx_crossrefs_target", "cross_references", "target_book_id, target_chapter, target_verse_start"),
+    ("idx_tokens_verse", "language_tokens", "book_id, chapter, verse"),
+    ("idx_tokens_lemma", "language_tokens", "lemma"),
+    # --token-storage compact: the same two indexes on the table behind the language_tokens view
+    ("idx_tokens_compact_verse", "language_tokens_compact", "book_id, chapter, verse"),
+    ("idx_tokens_compact_lemma", "language_tokens_compact", "lemma"),
+    ("idx_highlights_verse", "highlights_cache", "book_id, chapter, verse_start"),
+    ("idx_highlights_user", "highlights_cache", "user_id"),
+    ("idx_highlights_category", "highlights_cache", "category"),
+    ("idx_notes_verse", "notes_cache", "book_id, chapter, verse_start"),
+    ("idx_notes_user", "notes_cache", "user_id"),
+    ("idx_ai_cache_key", "ai_cache", "cache_key"),
+    ("idx_ai_cache_verse", "ai_cache", "book_id, chapter, verse_start"),
+    ("idx_memorization_user", "memorization_items", "user_id"),
+    ("idx_memorization_next_review", "memorization_items", "user_id, next_review_date"),
+    ("idx_memorization_mastery", "memorization_items", "user_id, mastery_level"),
+    ("idx_collections_user", "study_collections", "user_id"),
+    ("idx_collections_pinned", "study_collections", "user_id, is_pinned"),
+    ("idx_collections_type", "study_collections", "user_id, type"),
+    ("idx_sessions_user", "reading_sessions", "user_id"),
+    ("idx_sessions_date", "reading_sessions", "user_id, started_at"),
+    ("idx_sessions_book", "reading_sessions", "user_id, book_id"),
+]
+
+# SCHEMA_INDEXES the app's migrations don't create
+BUILDER_INDEXES = {"idx_tokens_compact_verse", "idx_tokens_compact_lemma"}
+
+
+# Builder-only tables, not part of the app's migrations: name -> CREATE TABLE.
+# create_tables only creates those this build's options fill (see
+# builder_tables), so a default build ships none of them.
+BUILDER_TABLES = {
+    # Canonical verse numbering 1..31,102 (see build_verse_ordinals)
+    "verse_ordinals": """
+        CREATE TABLE IF NOT EXISTS verse_ordinals (
+            ordinal INTEGER PRIMARY KEY,
+            book_id INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL,
+            UNIQUE(book_id, chapter, verse)
+        )
+    """,
+    # Each cross-reference's full source and target spans as ordinals, including
+    # targets that run into the next chapter (see import_cross_references)
+    "crossref_ordinals": """
+        CREATE TABLE IF NOT EXISTS crossref_ordinals (
+            crossref_id INTEGER PRIMARY KEY,
+            source_start INTEGER NOT NULL,
+            source_end INTEGER NOT NULL,
+            target_start INTEGER NOT NULL,
+            target_end INTEGER NOT NULL
+        )
+    """,
+    # One row per verse a cross-reference target covers (see build_crossref_reverse)
+    "crossref_reverse": """
+        CREATE TABLE IF NOT EXISTS crossref_reverse (
+            target_ordinal INTEGER NOT NULL,
+            crossref_id INTEGER NOT NULL,
+            PRIMARY KEY (target_ordinal, crossref_id)
+        ) WITHOUT ROWID
+    """,
+    # Every token of a verse in one row (see import_morphology)
+    "verse_tokens": """
+        CREATE TABLE IF NOT EXISTS verse_tokens (
+            verse_key INTEGER PRIMARY KEY,
+            book_id INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            token_count INTEGER NOT NULL,
+            tokens TEXT NOT NULL
+        )
+    """,
+    # Verses using each Strong's number (see build_strongs_concordance)
+    "strongs_concordance": """
+        CREATE TABLE IF NOT EXISTS strongs_concordance (
+            strong_id TEXT PRIMARY KEY,
+            occurrences INTEGER NOT NULL,
+            verse_count INTEGER NOT NULL,
+            postings BLOB NOT NULL
+        )
+    """,
+    # Pre-ranked cross-references per source verse (see build_crossref_topk)
+    "crossref_topk": """
+        CREATE TABLE IF NOT EXISTS crossref_topk (
+            source_book_id INTEGER NOT NULL,
+            source_chapter INTEGER NOT NULL,
+            source_verse INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            crossref_id INTEGER NOT NULL,
+            target_book_id INTEGER NOT NULL,
+            target_chapter INTEGER NOT NULL,
+            target_verse_start INTEGER NOT NULL,
+            target_verse_end INTEGER NOT NULL,
+            weight REAL NOT NULL,
+            ref_count INTEGER NOT NULL,
+            PRIMARY KEY (source_book_id, source_chapter, source_verse, rank)
+        ) WITHOUT ROWID
+    """,
+    # PageRank of every verse in the cross-reference graph (see build_crossref_graph)
+    "verse_centrality": """
+        CREATE TABLE IF NOT EXISTS verse_centrality (
+            ordinal INTEGER PRIMARY KEY,
+            pagerank REAL NOT NULL,
+            rank INTEGER NOT NULL
+        )
+    """,
+    # Best 2-hop "see also" verses per verse (see build_crossref_graph)
+    "crossref_see_also": """
+        CREATE TABLE IF NOT EXISTS crossref_see_also (
+            ordinal INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            target_ordinal INTEGER NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (ordinal, rank)
+        ) WITHOUT ROWID
+    """,
+    # One precomputed payload per chapter (see build_chapter_payloads)
+    "chapter_payloads": """
+        CREATE TABLE IF NOT EXISTS chapter_payloads (
+            translation_id TEXT NOT NULL,
+            book_id INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse_count INTEGER NOT NULL,
+            encoding TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            PRIMARY KEY (translation_id, book_id, chapter)
+        ) WITHOUT ROWID
+    """,
+}
 
 
 def create_schema(conn: sqlite3.Connection):
-    """Create all database tables matching iOS app migrations v1-v16 EXACTLY."""
+    """Create all database tables and indexes matching iOS app migrations v1-v16 EXACTLY."""
+    create_tables(conn)
+    create_indexes(conn)
+
+
+def create_tables(conn: sqlite3.Connection, builder_tables: list = ()):
+    """
+    Create all database tables matching iOS app migrations v1-v16, without
+    secondary indexes, plus the named BUILDER_TABLES.
+    """
     cursor = conn.cursor()
 
     # GRDB migrations table - must be populated so iOS migrator skips all migrations
@@ -429,14 +814,7 @@ def create_schema(conn: sqlite3.Connection):
 
     # v15: FTS5 virtual table (matches iOS migration v15_fts5_search)
     # Using external content mode to sync with verses table
-    cursor.execute("""
-        CREATE VIRTUAL TABLE IF NOT EXISTS verses_fts USING fts5(
-            text,
-            content='verses',
-            content_rowid='rowid',
-            tokenize='porter unicode61'
-        )
-    """)
+    create_fts_table(conn)
 
     # v16: Data sources for attribution (matches iOS migration v16_data_sources)
     cursor.execute("""
@@ -454,31 +832,226 @@ def create_schema(conn: sqlite3.Connection):
         )
     """)
 
-    # Create indexes (matching iOS migrations)
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_verses_translation_book_chapter ON verses(translation_id, book_id, chapter)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_verses_text ON verses(text)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_crossrefs_source ON cross_references(source_book_id, source_chapter, source_verse_start)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_crossrefs_target ON cross_references(target_book_id, target_chapter, target_verse_start)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tokens_verse ON language_tokens(book_id, chapter, verse)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tokens_lemma ON language_tokens(lemma)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_highlights_verse ON highlights_cache(book_id, chapter, verse_start)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_highlights_user ON highlights_cache(user_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_highlights_category ON highlights_cache(category)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notes_verse ON notes_cache(book_id, chapter, verse_start)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notes_user ON notes_cache(user_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_cache_key ON ai_cache(cache_key)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_cache_verse ON ai_cache(book_id, chapter, verse_start)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_memorization_user ON memorization_items(user_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_memorization_next_review ON memorization_items(user_id, next_review_date)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_memorization_mastery ON memorization_items(user_id, mastery_level)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_collections_user ON study_collections(user_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_collections_pinned ON study_collections(user_id, is_pinned)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_collections_type ON study_collections(user_id, type)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON reading_sessions(user_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON reading_sessions(user_id, started_at)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_book ON reading_sessions(user_id, book_id)")
+    for table in builder_tables:
+        cursor.execute(BUILDER_TABLES[table])
+
+    conn.commit()
+
+
+def create_indexes(conn: sqlite3.Connection, tables: list = None, skip: set = frozenset()) -> int:
+    """Create the secondary indexes in SCHEMA_INDEXES, optionally only those on `tables`.
+
+    Existing indexes, and those on tables this database does not have (or has
+    as a view), are left alone. Indexes named in `skip` (an --index-plan's
+    drops) are not created, and dropped if an earlier build left them.
+    Returns the number of indexes created.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    created = 0
+    for name, table, columns in SCHEMA_INDEXES:
+        if tables is not None and table not in tables:
+            continue
+        if name in skip:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+            continue
+        if name in existing or table not in present:
+            continue
+        conn.execute(f"CREATE INDEX {name} ON {table}({columns})")
+        created += 1
+    conn.commit()
+    return created
+
+
+def load_index_plan(path: Path) -> set:
+    """Names of the indexes an index_advisor.py plan drops, checked against SCHEMA_INDEXES."""
+    with open(path) as f:
+        plan = json.load(f)
+    drops = {entry["name"] for entry in plan.get("drop", [])}
+    unknown = drops - {name for name, _, _ in SCHEMA_INDEXES}
+    if unknown:
+        raise ValueError(f"{path} drops indexes the builder does not create: {', '.join(sorted(unknown))}")
+    return drops
+
+
+def drop_indexes(conn: sqlite3.Connection, tables: list):
+    """Drop the SCHEMA_INDEXES on `tables` ahead of a bulk reload; create_indexes restores them."""
+    for name, table, _ in SCHEMA_INDEXES:
+        if table in tables:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+# --layout clustered: tables rebuilt as WITHOUT ROWID after the bulk load,
+# clustered on the columns the app's queries filter and sort by.
+#   primary_key: clustering key; id keeps rows unique and in import order
+#   replaces:    the app's secondary indexes the clustering key makes redundant,
+#                left out of a clustered build
+# LanguageService.getTokens reads one verse (book_id, chapter, verse) ordered by
+# position, so that lookup is now a single range of the table itself instead of
+# an idx_tokens_verse probe plus one table seek per token.
+# Only tables the app never writes are clustered: a WITHOUT ROWID table has no
+# AUTOINCREMENT, so an insert without an id (DataLoadingService's INSERT OR
+# IGNORE into cross_references) would fail NOT NULL and be silently ignored.
+# cross_references and verses therefore stay rowid tables; verses_fts also maps
+# to the verses rowid. Both are already inserted in verse order.
+LAYOUTS = ["rowid", "clustered"]
+CLUSTERED_TABLES = {
+    "language_tokens": {
+        "primary_key": "book_id, chapter, verse, position, id",
+        "replaces": ["idx_tokens_verse"],
+    },
+}
+
+
+def pack_verse_key(book_id: int, chapter: int, verse: int) -> int:
+    """Packed verse key (verse_tokens' primary key), e.g. John 3:16 -> 43003016."""
+    return book_id * 1_000_000 + chapter * 1_000 + verse
+
+
+def is_clustered(conn: sqlite3.Connection, table: str) -> bool:
+    """True if table has already been rebuilt by cluster_tables."""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return bool(row) and "WITHOUT ROWID" in row[0].upper()
+
+
+def clustered_indexes() -> set:
+    """The SCHEMA_INDEXES a --layout clustered build leaves out."""
+    return {name for layout in CLUSTERED_TABLES.values() for name in layout["replaces"]}
+
+
+def cluster_tables(conn: sqlite3.Connection) -> int:
+    """
+    Rebuild the CLUSTERED_TABLES that are still rowid tables as WITHOUT ROWID
+    tables on their clustering key, copying rows in key order and dropping the
+    indexes it replaces. Column names and ids are kept, so existing queries
+    still work. Returns the number of tables rebuilt.
+    """
+    rebuilt = 0
+    for table, layout in CLUSTERED_TABLES.items():
+        if is_clustered(conn, table):
+            continue
+
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        definitions = []
+        for _, name, column_type, notnull, default, _ in columns:
+            definition = f"{name} {column_type}"
+            # AUTOINCREMENT needs a rowid; ids are copied over instead
+            if notnull or name == "id":
+                definition += " NOT NULL"
+            if default is not None:
+                definition += f" DEFAULT {default}"
+            definitions.append(definition)
+        names = ", ".join(column[1] for column in columns)
+
+        for name in layout["replaces"]:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        conn.execute(f"DROP TABLE IF EXISTS {table}_clustered")
+        conn.execute(f"""
+            CREATE TABLE {table}_clustered (
+                {", ".join(definitions)},
+                PRIMARY KEY ({layout["primary_key"]})
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            INSERT INTO {table}_clustered ({names})
+            SELECT {names} FROM {table}
+            ORDER BY {layout["primary_key"]}
+        """)
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_clustered RENAME TO {table}")
+        rebuilt += 1
 
     conn.commit()
+    return rebuilt
+
+
+# --token-storage compact: language_tokens columns moved into lookup tables,
+# column -> (lookup table, foreign key column in language_tokens_compact)
+TOKEN_STORAGES = ["table", "compact"]
+TOKEN_DICTIONARIES = {
+    "morph": ("token_morphs", "morph_ref"),
+    "strong_id": ("token_strongs", "strong_ref"),
+    "gloss": ("token_glosses", "gloss_ref"),
+    "language": ("token_languages", "language_ref"),
+}
+
+
+def is_compacted(conn: sqlite3.Connection) -> bool:
+    """True if language_tokens has already been replaced by compact_tokens' view."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'language_tokens'").fetchone() is not None
+
+
+def compact_tokens(conn: sqlite3.Connection) -> int:
+    """
+    Dictionary-encode language_tokens: move the distinct values of each
+    TOKEN_DICTIONARIES column into a lookup table, store integer references in
+    language_tokens_compact, and replace language_tokens with a view exposing
+    the original columns, so the app's read queries are unchanged. Lookup ids
+    are assigned most frequent first, so common values take one byte.
+    Returns the number of tokens copied (0 if already compact).
+    """
+    if is_compacted(conn):
+        return 0
+
+    for column, (table, _) in TOKEN_DICTIONARIES.items():
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)")
+        conn.execute(f"""
+            INSERT INTO {table} (value)
+            SELECT {column} FROM language_tokens WHERE {column} IS NOT NULL
+            GROUP BY {column} ORDER BY COUNT(*) DESC, {column}
+        """)
+
+    references = [reference for _, reference in TOKEN_DICTIONARIES.values()]
+    conn.execute("DROP TABLE IF EXISTS language_tokens_compact")
+    conn.execute(f"""
+        CREATE TABLE language_tokens_compact (
+            id INTEGER PRIMARY KEY,
+            book_id INTEGER NOT NULL,
+            chapter INTEGER NOT NULL,
+            verse INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            surface TEXT NOT NULL,
+            lemma TEXT,
+            {", ".join(f"{reference} INTEGER" for reference in references)}
+        )
+    """)
+    joins = "\n".join(
+        f"LEFT JOIN {table} {reference} ON {reference}.value = t.{column}"
+        for column, (table, reference) in TOKEN_DICTIONARIES.items()
+    )
+    count = conn.execute(f"""
+        INSERT INTO language_tokens_compact
+        SELECT t.id, t.book_id, t.chapter, t.verse, t.position, t.surface, t.lemma,
+               {", ".join(f"{reference}.id" for reference in references)}
+        FROM language_tokens t
+        {joins}
+        ORDER BY t.id
+    """).rowcount
+
+    conn.execute("DROP TABLE language_tokens")
+    columns = ", ".join(f"{reference}.value AS {column}" for column, (_, reference) in TOKEN_DICTIONARIES.items())
+    joins = "\n".join(
+        f"LEFT JOIN {table} {reference} ON {reference}.id = t.{reference}"
+        for table, reference in TOKEN_DICTIONARIES.values()
+    )
+    conn.execute(f"""
+        CREATE VIEW language_tokens AS
+        SELECT t.id, t.book_id, t.chapter, t.verse, t.position, t.surface, t.lemma, {columns}
+        FROM language_tokens_compact t
+        {joins}
+    """)
+    conn.commit()
+    return count
+
+
+def drop_compact_tokens(conn: sqlite3.Connection):
+    """Drop compact_tokens' view and tables, so create_tables restores the plain language_tokens."""
+    conn.execute("DROP VIEW IF EXISTS language_tokens")
+    conn.execute("DROP TABLE IF EXISTS language_tokens_compact")
+    for table, _ in TOKEN_DICTIONARIES.values():
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
 
 
 def populate_books(conn: sqlite3.Connection):
@@ -573,448 +1146,1638 @@ def populate_books(conn: sqlite3.Connection):
     print(f"  Inserted {len(books_data)} books")
 
 
-def populate_translations(conn: sqlite3.Connection):
-    """Populate the translations table."""
+# Translations the builder can bundle, in display order. Only public-domain texts
+# are included; others (ESV, NIV, NASB, NLT, NKJV) require licensing agreements.
+#   source: SOURCES key of the scrollmapper SQLite file (KJV is required, the
+#           rest are imported only when their optional file is cached)
+TRANSLATIONS = {
+    "kjv": {
+        "name": "King James Version",
+        "abbreviation": "KJV",
+        "language": "en",
+        "description": "The classic 1611 English translation, beloved for its literary beauty and precision",
+        "copyright": "Public Domain",
+        "attribution": "KJV text from scrollmapper/bible_databases. 1769 Cambridge Edition.",
+        "source": "kjv_sqlite",
+    },
+    "asv": {
+        "name": "American Standard Version",
+        "abbreviation": "ASV",
+        "language": "en",
+        "description": "The 1901 American revision of the King James Version, known for its literal accuracy",
+        "copyright": "Public Domain",
+        "attribution": "ASV text from scrollmapper/bible_databases. 1901 edition.",
+        "source": "asv_sqlite",
+    },
+    "web": {
+        "name": "World English Bible",
+        "abbreviation": "WEB",
+        "language": "en",
+        "description": "A modern English update of the American Standard Version",
+        "copyright": "Public Domain",
+        "attribution": "WEB text from scrollmapper/bible_databases.",
+        "source": "web_sqlite",
+    },
+    "ylt": {
+        "name": "Young's Literal Translation",
+        "abbreviation": "YLT",
+        "language": "en",
+        "description": "Robert Young's 1862 word-for-word translation that follows the original tenses",
+        "copyright": "Public Domain",
+        "attribution": "YLT text from scrollmapper/bible_databases. 1898 revised edition.",
+        "source": "ylt_sqlite",
+    },
+}
+DEFAULT_TRANSLATION = "kjv"
+
+
+def available_translations() -> list:
+    """Registry ids whose source file is cached, in display order (KJV always)."""
+    return [
+        translation_id for translation_id, translation in TRANSLATIONS.items()
+        if translation_id == DEFAULT_TRANSLATION
+        or (CACHE_DIR / SOURCES[translation["source"]]["filename"]).exists()
+    ]
+
+
+def populate_translations(conn: sqlite3.Connection, translation_ids: list = None):
+    """Populate the translations table from TRANSLATIONS for the given ids (default: all cached)."""
     cursor = conn.cursor()
+    if translation_ids is None:
+        translation_ids = available_translations()
 
-    # Only KJV is included - it's public domain and fully redistributable
-    # Other translations (ESV, NIV, NASB, NLT, NKJV) require licensing agreements
     translations = [
         # (id, name, abbreviation, language, description, copyright, is_default, sort_order, is_available)
-        ("kjv", "King James Version", "KJV", "en",
-         "The classic 1611 English translation, beloved for its literary beauty and precision",
-         "Public Domain", 1, 1, 1),  # is_available = 1 (true)
+        (translation_id, TRANSLATIONS[translation_id]["name"], TRANSLATIONS[translation_id]["abbreviation"],
+         TRANSLATIONS[translation_id]["language"], TRANSLATIONS[translation_id]["description"],
+         TRANSLATIONS[translation_id]["copyright"], int(translation_id == DEFAULT_TRANSLATION),
+         sort_order, 1)
+        for sort_order, translation_id in enumerate(translation_ids, start=1)
     ]
 
+    # Upsert rather than REPLACE: REPLACE deletes the old row, which cascades to
+    # every verse of that translation when rebuilding an existing database
     cursor.executemany(
-        """INSERT OR REPLACE INTO translations
+        """INSERT INTO translations
            (id, name, abbreviation, language, description, copyright, is_default, sort_order, is_available)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(id) DO UPDATE SET
+               name = excluded.name, abbreviation = excluded.abbreviation,
+               language = excluded.language, description = excluded.description,
+               copyright = excluded.copyright, is_default = excluded.is_default,
+               sort_order = excluded.sort_order, is_available = excluded.is_available""",
         translations
     )
+    # A translation whose file was removed from cache/ leaves the bundle
+    placeholders = ", ".join("?" for _ in translation_ids)
+    cursor.execute(f"DELETE FROM translations WHERE id NOT IN ({placeholders})", translation_ids)
     conn.commit()
-    print(f"  Inserted {len(translations)} translations")
+    print(f"  Inserted {len(translations)} translations ({', '.join(translation_ids)})")
+
+
+# iOS schema order: (translation_id, book_id, chapter, verse, text)
+VERSE_INSERT_SQL = """INSERT OR REPLACE INTO verses (translation_id, book_id, chapter, verse, text)
+                      VALUES (?, ?, ?, ?, ?)"""
+TOKEN_INSERT_SQL = """INSERT OR IGNORE INTO language_tokens
+                      (book_id, chapter, verse, position, surface,
+                       lemma, morph, strong_id, gloss, language)
+                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+CROSSREF_INSERT_SQL = """INSERT INTO cross_references
+                         (source_book_id, source_chapter, source_verse_start, source_verse_end,
+                          target_book_id, target_chapter, target_verse_start, target_verse_end,
+                          weight, source)
+                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+VERSE_TOKENS_INSERT_SQL = """INSERT INTO verse_tokens
+                             (verse_key, book_id, chapter, verse, language, token_count, tokens)
+                             VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+
+def write_in_chunks(conn: sqlite3.Connection, sql: str, rows, chunk_size: int = INSERT_CHUNK_SIZE) -> int:
+    """
+    Insert rows from any iterable (typically a generator) with executemany,
+    chunk_size rows at a time, so at most one chunk is held in memory.
+    Returns the number of rows handed to SQLite (including any OR IGNORE skips).
+    """
+    cursor = conn.cursor()
+    rows = iter(rows)
+    count = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return count
+        cursor.executemany(sql, chunk)
+        count += len(chunk)
 
 
-def import_kjv_verses(conn: sqlite3.Connection) -> int:
-    """Import KJV verses from the cached SQLite database."""
-    source_db = CACHE_DIR / SOURCES["kjv_sqlite"]["filename"]
-    if not source_db.exists():
-        print(f"  Error: KJV source not found at {source_db}")
-        return 0
+# scrollmapper verse layouts, tried in order: (marker table, query yielding
+# book, chapter, verse, text). {code} is the translation code, e.g. "kjv".
+VERSE_SOURCE_FORMATS = [
+    # Legacy bible-sqlite: one t_<code> table per translation
+    ("t_{code}", "SELECT b, c, v, t FROM t_{code} ORDER BY b, c, v"),
+    # Current formats/sqlite: <CODE>_verses
+    ("{CODE}_verses", "SELECT book_id, chapter, verse, text FROM {CODE}_verses ORDER BY book_id, chapter, verse"),
+    # Generic verses table
+    ("verses", "SELECT book, chapter, verse, text FROM verses ORDER BY book, chapter, verse"),
+]
 
-    cursor = conn.cursor()
+
+def book_tables_query(source_conn: sqlite3.Connection, tables: list) -> str:
+    """
+    Query for the layout with one table per book (c, v, t) listed in key_english
+    (b, n). Only books whose table exists are included.
+    """
+    books = source_conn.execute("SELECT b, n FROM key_english ORDER BY b").fetchall()
+    selects = [f'SELECT {book_id} AS b, c, v, t FROM "{name}"' for book_id, name in books if name in tables]
+    if not selects:
+        return None
+    return f"SELECT b, c, v, t FROM ({' UNION ALL '.join(selects)}) ORDER BY b, c, v"
+
+
+def iter_verse_rows(source_db: Path, translation_id: str = "kjv"):
+    """
+    Yield normalised (translation_id, book_id, chapter, verse, text) rows from a
+    scrollmapper SQLite file, whichever layout it uses. Rows are streamed from
+    the source cursor, never collected.
+    """
     source_conn = sqlite3.connect(source_db)
-    source_cursor = source_conn.cursor()
+    try:
+        tables = [row[0] for row in source_conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        print(f"  Source tables: {tables[:5]}..." if len(tables) > 5 else f"  Source tables: {tables}")
+
+        query = None
+        for marker, sql in VERSE_SOURCE_FORMATS:
+            if marker.format(code=translation_id, CODE=translation_id.upper()) in tables:
+                query = sql.format(code=translation_id, CODE=translation_id.upper())
+                break
+        if query is None and "key_english" in tables:
+            query = book_tables_query(source_conn, tables)
+        if query is None:
+            raise ValueError(f"Unknown database format. Tables: {tables}")
+
+        for book_id, chapter, verse, text in source_conn.execute(query):
+            yield (translation_id, book_id, chapter, verse, ' '.join(str(text).split()))
+    finally:
+        source_conn.close()
+
+
+def load_translation_verses(translation_id: str, stream: bool = False) -> tuple:
+    """
+    Read one translation's verse rows. Returns (rows, error); rows is a list,
+    so it can come back from a worker process when --jobs > 1, or with stream
+    the iter_verse_rows generator for the writer to consume directly.
+    """
+    source_db = CACHE_DIR / SOURCES[TRANSLATIONS[translation_id]["source"]]["filename"]
+    if not source_db.exists():
+        return ([], f"Error: {translation_id.upper()} source not found at {source_db}")
+    rows = iter_verse_rows(source_db, translation_id)
+    if stream:
+        return (rows, None)
+    try:
+        return (list(rows), None)
+    except (ValueError, sqlite3.Error) as e:
+        return ([], f"Error: {source_db.name}: {e}")
 
-    # Check table structure - scrollmapper uses different formats
-    # Option 1: 't_kjv' table with columns id, b, c, v, t
-    # Option 2: 'verses' table with columns id, book, chapter, verse, text
-    # Option 3: Separate book tables like 'Genesis', 'Exodus', etc.
 
-    # Get list of tables
-    source_cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [row[0] for row in source_cursor.fetchall()]
-    print(f"  Source tables: {tables[:5]}..." if len(tables) > 5 else f"  Source tables: {tables}")
+def import_verses(conn: sqlite3.Connection, translation_ids: list = None, jobs: int = 1) -> int:
+    """Import the verses of every translation (default: all cached) into one table.
 
-    count = 0
-    batch = []
-
-    # Build batch with translation_id FIRST to match iOS schema order
-    if 't_kjv' in tables:
-        # Format 1: t_kjv table
-        source_cursor.execute("SELECT b, c, v, t FROM t_kjv ORDER BY b, c, v")
-        for row in source_cursor:
-            book_id, chapter, verse, text = row
-            text = ' '.join(str(text).split())
-            batch.append(("kjv", book_id, chapter, verse, text))  # translation_id first!
-    elif 'KJV_verses' in tables:
-        # Format 2: scrollmapper KJV_verses table (book_id, chapter, verse, text)
-        source_cursor.execute("SELECT book_id, chapter, verse, text FROM KJV_verses ORDER BY book_id, chapter, verse")
-        for row in source_cursor:
-            book_id, chapter, verse, text = row
-            text = ' '.join(str(text).split())
-            batch.append(("kjv", book_id, chapter, verse, text))  # translation_id first!
-    elif 'verses' in tables:
-        # Format 3: generic verses table
-        source_cursor.execute("SELECT book, chapter, verse, text FROM verses ORDER BY book, chapter, verse")
-        for row in source_cursor:
-            book_id, chapter, verse, text = row
-            text = ' '.join(str(text).split())
-            batch.append(("kjv", book_id, chapter, verse, text))  # translation_id first!
+    With jobs > 1 each translation is read in a worker process while the single
+    writer inserts finished translations in registry order; with one job, rows
+    stream straight from the source file to the writer. The FTS index is built
+    afterwards in one pass over all translations (see rebuild_fts_index).
+    """
+    if translation_ids is None:
+        translation_ids = available_translations()
+
+    executor = None
+    if jobs > 1 and len(translation_ids) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(translation_ids)))
+        print(f"  Reading {len(translation_ids)} translations with {min(jobs, len(translation_ids))} workers...")
+        results = executor.map(load_translation_verses, translation_ids)
     else:
-        # Format 4: Try individual book tables or key_english
-        if 'key_english' in tables:
-            # This is the scrollmapper format with separate tables
-            source_cursor.execute("""
-                SELECT b, c, v, t FROM (
-                    SELECT 1 as b, c, v, t FROM Genesis UNION ALL
-                    SELECT 2 as b, c, v, t FROM Exodus UNION ALL
-                    SELECT 3 as b, c, v, t FROM Leviticus
-                    -- This would need all 66 books
-                ) ORDER BY b, c, v
-            """)
-            for row in source_cursor:
-                book_id, chapter, verse, text = row
-                text = ' '.join(str(text).split())
-                batch.append(("kjv", book_id, chapter, verse, text))  # translation_id first!
-        else:
-            print(f"  Error: Unknown database format. Tables: {tables}")
-            source_conn.close()
-            return 0
-
-    # Insert in batches - iOS schema order: (translation_id, book_id, chapter, verse, text)
-    for i in range(0, len(batch), 1000):
-        chunk = batch[i:i+1000]
-        cursor.executemany(
-            "INSERT OR REPLACE INTO verses (translation_id, book_id, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
-            chunk
-        )
-        count += len(chunk)
+        results = (load_translation_verses(translation_id, stream=True) for translation_id in translation_ids)
+
+    total_count = 0
+    try:
+        for translation_id, (rows, error) in zip(translation_ids, results):
+            if error:
+                print(f"  {error}")
+                continue
+            try:
+                count = write_in_chunks(conn, VERSE_INSERT_SQL, rows)
+            except (ValueError, sqlite3.Error) as e:
+                # A streamed source can fail part-way; drop what it wrote, as --jobs > 1 writes nothing
+                conn.execute("DELETE FROM verses WHERE translation_id = ?", (translation_id,))
+                print(f"  Error: {SOURCES[TRANSLATIONS[translation_id]['source']]['filename']}: {e}")
+                continue
+            print(f"  Imported {count:,} {TRANSLATIONS[translation_id]['abbreviation']} verses")
+            total_count += count
+    finally:
+        if executor:
+            executor.shutdown()
 
-    source_conn.close()
     conn.commit()
+    return total_count
 
-    print(f"  Imported {count:,} KJV verses")
-    return count
+
+# verses_fts variants selectable with --fts-profile. All keep the app's tokenizer
+# and external content table, so SearchService's MATCH/bm25/snippet query runs
+# unchanged; app_compatible is False where a profile drops features it relies on.
+#   options: extra FTS5 options appended to the CREATE VIRTUAL TABLE
+FTS_PROFILES = {
+    "default": {
+        "options": "",
+        "description": "Matches the app's v15 migration",
+        "app_compatible": True,
+    },
+    "prefix": {
+        # SearchService appends * to every term, so short prefixes are the common case
+        "options": "prefix='2 3'",
+        "description": "Adds 2- and 3-character prefix indexes for the app's term* queries",
+        "app_compatible": True,
+    },
+    "column": {
+        "options": "detail=column",
+        "description": "Drops token positions; phrase and NEAR queries fail, snippets lose highlighting",
+        "app_compatible": False,
+    },
+    "minimal": {
+        "options": "detail=none, columnsize=0",
+        "description": "Document ids only; no phrase queries, and bm25 reads lengths from verses",
+        "app_compatible": False,
+    },
+}
+DEFAULT_FTS_PROFILE = "default"
 
 
-def rebuild_fts_index(conn: sqlite3.Connection):
+def create_fts_table(conn: sqlite3.Connection, profile: str = DEFAULT_FTS_PROFILE):
+    """Create verses_fts with the given FTS_PROFILES options, if it doesn't exist."""
+    options = FTS_PROFILES[profile]["options"]
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS verses_fts USING fts5(
+            text,
+            content='verses',
+            content_rowid='rowid',
+            tokenize='porter unicode61'{", " + options if options else ""}
+        )
+    """)
+
+
+def rebuild_fts_index(conn: sqlite3.Connection, profile: str = DEFAULT_FTS_PROFILE):
     """Rebuild the FTS5 index from verses table.
 
-    Uses the 'rebuild' command for external content FTS5 tables.
-    The FTS table is defined with content='verses' so it syncs automatically.
+    Recreates verses_fts with the chosen profile, then uses the 'rebuild'
+    command for external content FTS5 tables and 'optimize' to merge the
+    index into a single segment, the smallest and fastest layout for a
+    read-only database.
     """
     cursor = conn.cursor()
 
+    # The profile's options can only be set when the table is created
+    cursor.execute("DROP TABLE IF EXISTS verses_fts")
+    create_fts_table(conn, profile)
+
     # For external content FTS5, use the rebuild command
     # This re-indexes all content from the source table
     cursor.execute("INSERT INTO verses_fts(verses_fts) VALUES('rebuild')")
+    cursor.execute("INSERT INTO verses_fts(verses_fts) VALUES('optimize')")
 
     conn.commit()
 
     # Count indexed entries
     count = cursor.execute("SELECT COUNT(*) FROM verses_fts").fetchone()[0]
-    print(f"  Built FTS5 index with {count:,} entries")
+    print(f"  Built FTS5 index with {count:,} entries (profile: {profile})")
+    if not FTS_PROFILES[profile]["app_compatible"]:
+        print(f"  Warning: FTS profile '{profile}' is not compatible with the app's search: "
+              f"{FTS_PROFILES[profile]['description']}")
+    return count
 
 
-def parse_verse_ref(ref: str) -> tuple:
+def parse_osis_ref(ref: str) -> tuple:
+    """Parse 'Gen.1.1' into (book_id, chapter, verse). Returns None if parsing fails."""
+    parts = ref.split('.')
+    if len(parts) < 3:
+        return None
+    book_id = OSIS_TO_BOOK_ID.get(parts[0])
+    try:
+        return (book_id, int(parts[1]), int(parts[2])) if book_id else None
+    except ValueError:
+        return None
+
+
+def parse_verse_span(ref: str) -> tuple:
     """
-    Parse a verse reference like 'Gen.1.1' or 'Gen.1.1-Gen.1.3' into (book_id, chapter, verse_start, verse_end).
-    Returns (None, None, None, None) if parsing fails.
+    Parse a verse reference like 'Gen.1.1', 'Gen.1.1-Gen.1.3' or 'Gen.1.31-Gen.2.3' into
+    ((book_id, chapter, verse), (end_book_id, end_chapter, end_verse)). The end may lie
+    in a later chapter or book; an abbreviated end ('Gen.1.1-3' or 'Gen.1.1-2.3') stays
+    in the start's book. An end before the start is treated as a single verse.
+    Returns None if parsing fails.
     """
+    start_ref, _, end_ref = ref.partition('-')
+    start = parse_osis_ref(start_ref)
+    if start is None:
+        return None
+    if not end_ref:
+        return (start, start)
+
+    end_parts = end_ref.split('.')
     try:
-        # Handle range references (e.g., "Gen.1.1-Gen.1.3")
-        if '-' in ref:
-            parts = ref.split('-')
-            start_ref = parts[0]
-            end_ref = parts[1] if len(parts) > 1 else parts[0]
-
-            # Parse start
-            start_parts = start_ref.split('.')
-            if len(start_parts) < 3:
-                return (None, None, None, None)
-            book_abbrev = start_parts[0]
-            chapter = int(start_parts[1])
-            verse_start = int(start_parts[2])
-
-            # Parse end
-            end_parts = end_ref.split('.')
-            if len(end_parts) >= 3:
-                verse_end = int(end_parts[2])
-            elif len(end_parts) == 1:
-                # Just a verse number
-                verse_end = int(end_parts[0])
-            else:
-                verse_end = verse_start
-
-            book_id = OSIS_TO_BOOK_ID.get(book_abbrev)
-            if book_id:
-                return (book_id, chapter, verse_start, verse_end)
+        if len(end_parts) == 1:
+            end = (start[0], start[1], int(end_parts[0]))
+        elif len(end_parts) == 2:
+            end = (start[0], int(end_parts[0]), int(end_parts[1]))
         else:
-            # Single verse reference
-            parts = ref.split('.')
-            if len(parts) >= 3:
-                book_abbrev = parts[0]
-                chapter = int(parts[1])
-                verse = int(parts[2])
-                book_id = OSIS_TO_BOOK_ID.get(book_abbrev)
-                if book_id:
-                    return (book_id, chapter, verse, verse)
-    except (ValueError, IndexError):
-        pass
-
-    return (None, None, None, None)
-
-
-def import_cross_references(conn: sqlite3.Connection) -> int:
-    """Import cross-references from OpenBible.info."""
-    # Use the extracted file path if it's a zip
-    source_config = SOURCES["crossrefs"]
-    if source_config.get("is_zip"):
-        source_file = CACHE_DIR / source_config.get("extract_file", source_config["filename"])
-    else:
-        source_file = CACHE_DIR / source_config["filename"]
+            end = parse_osis_ref(end_ref)
+    except ValueError:
+        end = None
+    if end is None:
+        return None
+    return (start, max(start, end))
+
+
+def open_source_text(source_key: str) -> io.TextIOBase:
+    """
+    Open a cached source as a text stream. Zipped sources are read straight from
+    their zip member, so nothing is extracted to disk.
+    """
+    source = SOURCES[source_key]
+    path = CACHE_DIR / source["filename"]
+    if source.get("is_zip"):
+        zf = zipfile.ZipFile(path)
+        # ZipExtFile already buffers its inflated output; wrapping it in another
+        # BufferedReader only adds a copy. The member keeps its own handle on the
+        # archive, so zf can be closed now.
+        member = zf.open(source["zip_member"])
+        zf.close()
+        return io.TextIOWrapper(member, encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace', buffering=SOURCE_READ_BUFFER)
+
+
+# With --crossref-reverse, cross-references are staged with their canonical
+# verse ordinals, then split into cross_references and crossref_ordinals. ids
+# follow the file order, as a fresh AUTOINCREMENT table would assign them.
+# Without it, rows are inserted straight into cross_references.
+CROSSREF_STAGING_TABLE_SQL = """
+    CREATE TEMP TABLE crossref_staging (
+        source_book_id INTEGER NOT NULL,
+        source_chapter INTEGER NOT NULL,
+        source_verse_start INTEGER NOT NULL,
+        source_verse_end INTEGER NOT NULL,
+        target_book_id INTEGER NOT NULL,
+        target_chapter INTEGER NOT NULL,
+        target_verse_start INTEGER NOT NULL,
+        target_verse_end INTEGER NOT NULL,
+        weight REAL NOT NULL,
+        source TEXT NOT NULL,
+        source_start INTEGER,
+        source_end INTEGER,
+        target_start INTEGER,
+        target_end INTEGER
+    )
+"""
+CROSSREF_STAGING_INSERT_SQL = "INSERT INTO temp.crossref_staging VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+CROSSREF_FROM_STAGING_SQL = """
+    INSERT OR IGNORE INTO cross_references
+        (id, source_book_id, source_chapter, source_verse_start, source_verse_end,
+         target_book_id, target_chapter, target_verse_start, target_verse_end,
+         weight, source)
+    SELECT rowid, source_book_id, source_chapter, source_verse_start, source_verse_end,
+           target_book_id, target_chapter, target_verse_start, target_verse_end,
+           weight, source
+    FROM temp.crossref_staging
+    ORDER BY rowid
+"""
+CROSSREF_ORDINALS_FROM_STAGING_SQL = """
+    INSERT INTO crossref_ordinals (crossref_id, source_start, source_end, target_start, target_end)
+    SELECT rowid, source_start, source_end, target_start, target_end
+    FROM temp.crossref_staging
+    WHERE source_start IS NOT NULL AND target_start IS NOT NULL
+    ORDER BY rowid
+"""
+
+
+def import_cross_references(conn: sqlite3.Connection, source_file: Path = None, min_votes: int = 0,
+                            low_votes: str = "drop", stats: dict = None, reverse: bool = False) -> int:
+    """Import cross-references from OpenBible.info.
+
+    Reads the cached zip in place; source_file overrides it with a plain text file.
+    With reverse, maps each reference onto verse ordinals (the default
+    translation's verses in order, as build_verse_ordinals numbers them) and
+    fills crossref_ordinals and crossref_reverse alongside cross_references.
+    Duplicates are dropped as the file is read, and references with fewer than
+    min_votes votes are dropped or down-ranked (see LOW_VOTE_ACTIONS). Counts
+    are added to stats if given.
+    """
+    if source_file is None:
+        source_file = CACHE_DIR / SOURCES["crossrefs"]["filename"]
 
     if not source_file.exists():
         print(f"  Warning: Cross-references file not found at {source_file}")
         return 0
 
-    cursor = conn.cursor()
-    count = 0
-    skipped = 0
-    batch = []
+    if source_file == CACHE_DIR / SOURCES["crossrefs"]["filename"]:
+        stream = open_source_text("crossrefs")
+    else:
+        stream = open(source_file, 'r', encoding='utf-8', errors='replace', buffering=SOURCE_READ_BUFFER)
+
+    verse_keys = [tuple(row) for row in conn.execute(
+        "SELECT book_id, chapter, verse FROM verses WHERE translation_id = ? ORDER BY book_id, chapter, verse",
+        (DEFAULT_TRANSLATION,))]
+    if reverse and not verse_keys:
+        print("  Warning: no verses imported; cross-references will not be mapped to ordinals")
+
+    if stats is None:
+        stats = {}
+    stats.update({"skipped": 0, "multi_chapter": 0, "duplicates": 0, "low_votes": 0})
+    if reverse:
+        conn.execute("DROP TABLE IF EXISTS temp.crossref_staging")
+        conn.execute(CROSSREF_STAGING_TABLE_SQL)
+        with stream as f:
+            rows = iter_cross_reference_rows(f, stats, verse_keys, min_votes, low_votes, ordinals=True)
+            write_in_chunks(conn, CROSSREF_STAGING_INSERT_SQL, rows)
+        count = conn.execute(CROSSREF_FROM_STAGING_SQL).rowcount
+        mapped = conn.execute(CROSSREF_ORDINALS_FROM_STAGING_SQL).rowcount
+        conn.execute("DROP TABLE temp.crossref_staging")
+        expanded = build_crossref_reverse(conn)
+    else:
+        with stream as f:
+            rows = iter_cross_reference_rows(f, stats, verse_keys, min_votes, low_votes)
+            count = write_in_chunks(conn, CROSSREF_INSERT_SQL, rows)
+    conn.commit()
 
-    # Try different encodings
-    with open(source_file, 'r', encoding='utf-8', errors='replace') as f:
-        first_line = True
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
+    print(f"  Imported {count:,} cross-references (skipped {stats['skipped']:,} unparseable, "
+          f"{stats['multi_chapter']:,} spanning chapters)")
+    print(f"  Removed {stats['duplicates']:,} duplicates; {stats['low_votes']:,} below {min_votes} votes "
+          f"{'dropped' if low_votes == 'drop' else 'down-ranked'}")
+    if reverse:
+        print(f"  Mapped {mapped:,} to verse ordinals, {expanded:,} reverse-lookup rows")
+    return count
 
-            # Skip header line
-            if first_line:
-                first_line = False
-                if 'From Verse' in line or 'Votes' in line:
-                    continue
 
-            parts = line.split('\t')
-            if len(parts) < 2:
-                continue
+def span_ordinals(span: tuple, verse_keys: list) -> tuple:
+    """
+    Map a parse_verse_span span onto ordinals: (first, last) of the verses in
+    verse_keys (sorted (book_id, chapter, verse) tuples, ordinal = index + 1)
+    that it covers, or (None, None) if it covers none.
+    """
+    start, end = span
+    first = bisect_left(verse_keys, start) + 1
+    last = bisect_right(verse_keys, end)
+    return (first, last) if first <= last else (None, None)
+
+
+def chapter_verse_end(span: tuple, verse_keys: list) -> int:
+    """
+    The span's last verse within its start chapter, for the single-chapter
+    *_verse_end columns: its end verse, or the chapter's last verse when the
+    span runs on into the next chapter or book.
+    """
+    start, end = span
+    if end[:2] == start[:2]:
+        return end[2]
+    last = bisect_left(verse_keys, (start[0], start[1] + 1, 0)) - 1
+    if last >= 0 and verse_keys[last][:2] == start[:2]:
+        return max(start[2], verse_keys[last][2])
+    return start[2]
+
+
+def vote_weight(votes: int) -> float:
+    """Map OpenBible votes onto a 0.0-1.0 weight: 0 votes is 0.3, 100 or more is 1.0."""
+    return max(0.0, min(1.0, 0.3 + (votes / 100.0) * 0.7))
 
-            from_ref = parts[0]
-            to_ref = parts[1]
-            try:
-                votes = int(parts[2]) if len(parts) > 2 else 1
-            except ValueError:
-                votes = 1
 
-            # Parse references
-            src_book, src_ch, src_vs, src_ve = parse_verse_ref(from_ref)
-            tgt_book, tgt_ch, tgt_vs, tgt_ve = parse_verse_ref(to_ref)
+# What --low-votes does with references below --min-votes
+LOW_VOTE_ACTIONS = ["drop", "downrank"]
+# Weight of down-ranked references: below vote_weight(0), so they sort after
+# every reference that met the threshold
+DOWNRANKED_WEIGHT = 0.0
 
-            if None in (src_book, src_ch, src_vs, tgt_book, tgt_ch, tgt_vs):
-                skipped += 1
+
+def crossref_key(source_span: tuple, target_span: tuple) -> int:
+    """
+    Pack a reference's parsed source and target spans into one int for the
+    duplicate set. Uses the full spans, not the chapter-truncated *_verse_end
+    columns, so ranges that end in different chapters stay distinct.
+    """
+    key = 0
+    for verse in (*source_span, *target_span):
+        for value in verse:
+            key = (key << 16) | value
+    return key
+
+
+def iter_cross_reference_rows(lines, stats: dict, verse_keys: list, min_votes: int = 0,
+                              low_votes: str = "drop", ordinals: bool = False):
+    """
+    Yield cross_references rows (with ordinals, crossref_staging rows: the
+    source and target spans mapped onto verse ordinals appended) from
+    OpenBible.info's tab-separated lines.
+    Unparseable references are counted in stats["skipped"], ranges that cross
+    a chapter boundary in stats["multi_chapter"], references below min_votes in
+    stats["low_votes"], and repeats of an already yielded reference (same
+    source and target spans) in stats["duplicates"]; the first wins.
+    """
+    seen = set()
+    first_line = True
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        # Skip header line
+        if first_line:
+            first_line = False
+            if 'From Verse' in line or 'Votes' in line:
                 continue
 
-            # Calculate weight based on votes (normalize to 0.3-1.0 range)
-            weight = min(1.0, 0.3 + (votes / 100.0) * 0.7)
-
-            batch.append((
-                src_book, src_ch, src_vs, src_ve,
-                tgt_book, tgt_ch, tgt_vs, tgt_ve,
-                weight, "openbible"
-            ))
-
-            if len(batch) >= 5000:
-                cursor.executemany(
-                    """INSERT OR IGNORE INTO cross_references
-                       (source_book_id, source_chapter, source_verse_start, source_verse_end,
-                        target_book_id, target_chapter, target_verse_start, target_verse_end,
-                        weight, source)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    batch
-                )
-                count += len(batch)
-                batch = []
-
-    if batch:
-        cursor.executemany(
-            """INSERT OR IGNORE INTO cross_references
-               (source_book_id, source_chapter, source_verse_start, source_verse_end,
-                target_book_id, target_chapter, target_verse_start, target_verse_end,
-                weight, source)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            batch
+        parts = line.split('\t')
+        if len(parts) < 2:
+            continue
+
+        from_ref = parts[0]
+        to_ref = parts[1]
+        try:
+            votes = int(parts[2]) if len(parts) > 2 else 1
+        except ValueError:
+            votes = 1
+
+        # Parse references
+        source_span = parse_verse_span(from_ref)
+        target_span = parse_verse_span(to_ref)
+
+        if source_span is None or target_span is None:
+            stats["skipped"] += 1
+            continue
+        for start, end in (source_span, target_span):
+            if start[:2] != end[:2]:
+                stats["multi_chapter"] += 1
+
+        weight = vote_weight(votes)
+        if votes < min_votes:
+            stats["low_votes"] += 1
+            if low_votes == "drop":
+                continue
+            weight = DOWNRANKED_WEIGHT
+
+        key = crossref_key(source_span, target_span)
+        if key in seen:
+            stats["duplicates"] += 1
+            continue
+        seen.add(key)
+
+        row = (
+            *source_span[0], chapter_verse_end(source_span, verse_keys),
+            *target_span[0], chapter_verse_end(target_span, verse_keys),
+            weight, "openbible",
         )
-        count += len(batch)
+        if ordinals:
+            row += (*span_ordinals(source_span, verse_keys), *span_ordinals(target_span, verse_keys))
+        yield row
+
 
+def build_verse_ordinals(conn: sqlite3.Connection) -> int:
+    """
+    Number the default translation's verses 1..31,102 in canonical order
+    (book, chapter, verse), so a verse range is an interval of ordinals.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO verse_ordinals (ordinal, book_id, chapter, verse)
+        SELECT ROW_NUMBER() OVER (ORDER BY book_id, chapter, verse), book_id, chapter, verse
+        FROM verses
+        WHERE translation_id = ?
+    """, (DEFAULT_TRANSLATION,))
     conn.commit()
-    print(f"  Imported {count:,} cross-references (skipped {skipped:,} unparseable)")
+    count = cursor.rowcount
+    print(f"  Numbered {count:,} {DEFAULT_TRANSLATION.upper()} verses")
     return count
 
 
-def parse_stepbible_line(line: str, language: str) -> dict:
-    """Parse a STEPBible data line into token fields."""
-    # STEPBible TAHOT/TAGNT format is tab-separated:
-    # Gen.1.1#01=L \t HebrewText \t Transliteration \t Gloss \t Strong's \t Morphology \t ...
-    # Reference format: Book.Chapter.Verse#WordPos=Flag
+def build_crossref_reverse(conn: sqlite3.Connection) -> int:
+    """
+    Expand every cross-reference target into one crossref_reverse row per verse it
+    covers, so "which references point into this verse" is a primary-key probe.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO crossref_reverse (target_ordinal, crossref_id)
+        SELECT v.ordinal, c.crossref_id
+        FROM crossref_ordinals c
+        JOIN verse_ordinals v ON v.ordinal BETWEEN c.target_start AND c.target_end
+        ORDER BY v.ordinal, c.crossref_id
+    """)
+    return cursor.rowcount
+
+
+# STEPBible reference column: "Gen.1.1#01=L", or "Gen.31.55(32.1)#01=L" where
+# Hebrew versification differs (the English reference comes first)
+STEPBIBLE_REF_RE = re.compile(r"([1-3]?[A-Za-z]+)\.(\d+)\.(\d+)(?:\([^)]*\))?#(\d+)")
+STRONGS_RE = re.compile(r"[HG]\d+[A-Za-z]?")
+
+
+def parse_stepbible_line(line: str, language: str) -> tuple:
+    """
+    Parse a STEPBible data line into a language_tokens row:
+    (book_id, chapter, verse, position, surface, lemma, morph, strong_id, gloss, language).
+    Returns None for header, comment and unparseable lines.
+
+    TAHOT (hebrew) columns:
+        Ref | Hebrew | Transliteration | Translation | dStrongs | Grammar | ... | Expanded Strong tags
+        dStrongs braces the main word ("H9003/{H7225G}"); the expanded tags carry its
+        lexical form ("H9003=ב=in/{H7225G=רֵאשִׁית=: beginning}").
+    TAGNT (greek) columns:
+        Ref | Greek (translit) | Translation | dStrongs=Grammar | Lemma=Gloss | ...
+    """
+    ref = STEPBIBLE_REF_RE.match(line)
+    if not ref:
+        return None
+
+    book, chapter, verse, position = ref.groups()
+    book_id = OSIS_TO_BOOK_ID.get(book)
+    if not book_id:
+        return None
+
     parts = line.split('\t')
     if len(parts) < 5:
         return None
 
-    try:
-        ref_col = parts[0].strip()
-
-        # Parse reference like "Gen.1.1#01=L" or "Gen.1.1#01"
-        # Remove any flag after = (like =L, =Q, =K)
-        if '=' in ref_col:
-            ref_col = ref_col.split('=')[0]
-
-        # Split by # to get verse ref and word position
-        if '#' not in ref_col:
-            return None
-
-        verse_ref, word_pos_str = ref_col.rsplit('#', 1)
-
-        # Parse verse reference (Book.Chapter.Verse)
-        ref_split = verse_ref.split('.')
-        if len(ref_split) < 3:
-            return None
-
-        book_abbrev = ref_split[0]
-        chapter = int(ref_split[1])
-        verse = int(ref_split[2])
-        book_id = OSIS_TO_BOOK_ID.get(book_abbrev)
-
-        if not book_id:
-            return None
-
-        # Parse word position
-        position = int(word_pos_str) if word_pos_str.isdigit() else 1
-
-        # Extract Strong's number from the complex format
-        # Format is like "H9003/{H7225G}" or "{H1254A}"
-        strongs_raw = parts[4] if len(parts) > 4 else ""
-        strongs = None
-        if strongs_raw:
-            # Extract first Strong's number found
-            import re
-            match = re.search(r'H(\d+[A-Z]?)', strongs_raw)
-            if match:
-                strongs = 'H' + match.group(1)
-            else:
-                match = re.search(r'G(\d+[A-Z]?)', strongs_raw)
-                if match:
-                    strongs = 'G' + match.group(1)
-
-        return {
-            "book_id": book_id,
-            "chapter": chapter,
-            "verse": verse,
-            "position": position,  # iOS column name
-            "surface": parts[1] if len(parts) > 1 else "",  # iOS column name
-            "transliteration": parts[2] if len(parts) > 2 else None,  # Not in iOS schema, will be ignored
-            "gloss": parts[3] if len(parts) > 3 else None,
-            "strong_id": strongs,  # iOS column name
-            "morph": parts[5] if len(parts) > 5 else None,  # iOS column name
-            "lemma": None,  # Lemma is embedded in Strong's field, complex to extract
-            "language": language
-        }
-    except (ValueError, IndexError):
-        return None
+    if language == "greek":
+        surface = parts[1].split(' (', 1)[0]
+        gloss = parts[2]
+        strong_id, _, morph = parts[3].partition('=')
+        lemma = parts[4].partition('=')[0]
+    else:
+        surface = parts[1]
+        gloss = parts[3]
+        strongs_raw = parts[4]
+        start = strongs_raw.find('{')
+        if start >= 0:
+            strong_id = strongs_raw[start + 1:strongs_raw.find('}', start)]
+        else:
+            match = STRONGS_RE.search(strongs_raw)
+            strong_id = match.group(0) if match else None
+        morph = parts[5] if len(parts) > 5 else None
+        lemma = None
+        if len(parts) > 11:
+            expanded = parts[11]
+            start = expanded.find('{')
+            form_start = expanded.find('=', start) if start >= 0 else -1
+            form_end = expanded.find('=', form_start + 1) if form_start >= 0 else -1
+            if form_end >= 0:
+                lemma = expanded[form_start + 1:form_end]
+
+    return (
+        book_id,
+        int(chapter),
+        int(verse),
+        int(position),
+        surface,
+        lemma or None,
+        morph or None,
+        strong_id or None,
+        gloss or None,
+        language
+    )
 
 
-def import_morphology(conn: sqlite3.Connection) -> int:
-    """Import morphology data from STEPBible files."""
-    cursor = conn.cursor()
-    total_count = 0
+# STEPBible morphology files in canonical book order: (source_key, language)
+MORPHOLOGY_SOURCES = [
+    ("stepbible_hebrew_1", "hebrew"),
+    ("stepbible_hebrew_2", "hebrew"),
+    ("stepbible_hebrew_3", "hebrew"),
+    ("stepbible_hebrew_4", "hebrew"),
+    ("stepbible_greek_1", "greek"),
+    ("stepbible_greek_2", "greek"),
+]
 
-    # Define file groups: (source_key_prefix, language)
-    file_groups = [
-        (["stepbible_hebrew_1", "stepbible_hebrew_2", "stepbible_hebrew_3", "stepbible_hebrew_4"], "hebrew"),
-        (["stepbible_greek_1", "stepbible_greek_2"], "greek"),
-    ]
+# Data-loading stages in execution order.
+#   sources: SOURCES keys whose files feed the stage
+#   after:   stages whose output the stage reads (a re-run upstream forces a re-run here)
+#   tables:  tables the stage fills, cleared before the stage re-runs
+BUILD_STAGES = {
+    "verses": {
+        "title": "Importing verses",
+        "sources": [translation["source"] for translation in TRANSLATIONS.values()],
+        "after": [],
+        "tables": ["verses"],
+    },
+    "fts": {
+        "title": "Building full-text search index",
+        "sources": [],
+        "after": ["verses"],
+        "tables": [],
+    },
+    "ordinals": {
+        "title": "Numbering verses",
+        "sources": [],
+        "after": ["verses"],
+        "tables": ["verse_ordinals"],
+    },
+    "crossrefs": {
+        "title": "Importing cross-references",
+        "sources": ["crossrefs"],
+        "after": ["verses"],
+        "tables": ["cross_references", "crossref_ordinals", "crossref_reverse"],
+    },
+    "morphology": {
+        "title": "Importing morphology data",
+        "sources": [key for key, _ in MORPHOLOGY_SOURCES],
+        "after": [],
+        "tables": ["language_tokens", "verse_tokens"],
+    },
+    "concordance": {
+        "title": "Building Strong's concordance",
+        "sources": [],
+        "after": ["ordinals", "morphology"],
+        "tables": ["strongs_concordance"],
+    },
+    "topk": {
+        "title": "Ranking top cross-references",
+        "sources": [],
+        "after": ["crossrefs"],
+        "tables": ["crossref_topk"],
+    },
+    "graph": {
+        "title": "Analysing the cross-reference graph",
+        "sources": [],
+        "after": ["crossrefs"],
+        "tables": ["verse_centrality", "crossref_see_also"],
+    },
+    "chapters": {
+        "title": "Building chapter payloads",
+        "sources": [],
+        "after": ["verses", "crossrefs", "morphology"],
+        "tables": ["chapter_payloads"],
+    },
+}
+
+# data_sources rows and the SOURCES files behind each (for the checksum column)
+DATA_SOURCE_FILES = {
+    **{translation_id: [translation["source"]] for translation_id, translation in TRANSLATIONS.items()},
+    "openbible-crossrefs": ["crossrefs"],
+    "stepbible-morphology": [key for key, _ in MORPHOLOGY_SOURCES],
+}
 
-    for source_keys, language in file_groups:
-        count = 0
-        skipped = 0
-        batch = []
 
-        for source_key in source_keys:
-            if source_key not in SOURCES:
+def iter_morphology_tokens(source_key: str, language: str, stats: dict):
+    """
+    Yield token tuples from one STEPBible file in file order, counting
+    unparseable lines in stats["skipped"].
+    """
+    source_file = CACHE_DIR / SOURCES[source_key]["filename"]
+    with open(source_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            # Skip header lines and comments
+            if not line or line.startswith('#') or line.startswith('$'):
                 continue
 
-            source_file = CACHE_DIR / SOURCES[source_key]["filename"]
-            if not source_file.exists():
-                print(f"  Warning: {SOURCES[source_key]['filename']} not found")
+            token = parse_stepbible_line(line, language)
+            if not token:
+                stats["skipped"] += 1
                 continue
 
-            print(f"  Processing {SOURCES[source_key]['filename']}...")
+            yield token
+
+
+# Each STEPBible file is staged in file order in its own SQLite file (in a
+# worker process when --jobs > 1), then streamed into language_tokens sorted by
+# (book_id, chapter, verse, position); the staging rowid keeps equal keys in file
+# order. Neither path holds more than one insert chunk of a file in memory, and
+# --jobs 1 and --jobs N assign the same ids to the same rows.
+TOKEN_STAGING_TABLE_SQL = """
+    CREATE TABLE token_staging (
+        book_id INTEGER NOT NULL,
+        chapter INTEGER NOT NULL,
+        verse INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        surface TEXT NOT NULL,
+        lemma TEXT,
+        morph TEXT,
+        strong_id TEXT,
+        gloss TEXT,
+        language TEXT NOT NULL
+    )
+"""
+TOKEN_STAGING_INSERT_SQL = "INSERT INTO token_staging VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+TOKENS_FROM_STAGING_SQL = """
+    INSERT OR IGNORE INTO main.language_tokens
+        (book_id, chapter, verse, position, surface, lemma, morph, strong_id, gloss, language)
+    SELECT book_id, chapter, verse, position, surface, lemma, morph, strong_id, gloss, language
+    FROM staging.token_staging
+    ORDER BY book_id, chapter, verse, position, rowid
+"""
 
-            try:
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip header lines and comments
-                        if not line or line.startswith('#') or line.startswith('$'):
-                            continue
-
-                        token = parse_stepbible_line(line, language)
-                        if not token:
-                            skipped += 1
-                            continue
-
-                        batch.append((
-                            token["book_id"],
-                            token["chapter"],
-                            token["verse"],
-                            token["position"],
-                            token["surface"],
-                            token["lemma"],
-                            token["morph"],
-                            token["strong_id"],
-                            token["gloss"],
-                            token["language"]
-                        ))
-
-                        if len(batch) >= 5000:
-                            cursor.executemany(
-                                """INSERT OR IGNORE INTO language_tokens
-                                   (book_id, chapter, verse, position, surface,
-                                    lemma, morph, strong_id, gloss, language)
-                                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                                batch
-                            )
-                            count += len(batch)
-                            batch = []
-            except Exception as e:
-                print(f"  Error reading {source_file}: {e}")
-                continue
 
-        if batch:
-            cursor.executemany(
-                """INSERT OR IGNORE INTO language_tokens
-                   (book_id, chapter, verse, position, surface,
-                    lemma, morph, strong_id, gloss, language)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                batch
-            )
-            count += len(batch)
+def stage_morphology_file(source_key: str, language: str, staging_db: Path) -> tuple:
+    """
+    Stream one STEPBible file into a new staging_db's token_staging table.
+    Returns (tokens, skipped, error). Runs in a worker process when --jobs > 1.
+    """
+    stats = {"skipped": 0}
+    conn = sqlite3.connect(staging_db)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(TOKEN_STAGING_TABLE_SQL)
+        count = write_in_chunks(conn, TOKEN_STAGING_INSERT_SQL, iter_morphology_tokens(source_key, language, stats))
+        conn.commit()
+    except Exception as e:
+        return (0, stats["skipped"], f"Error reading {CACHE_DIR / SOURCES[source_key]['filename']}: {e}")
+    finally:
+        conn.close()
+    return (count, stats["skipped"], None)
+
 
+def import_staged_tokens(conn: sqlite3.Connection, staging_db: Path, verse_tokens: bool) -> int:
+    """
+    Copy a stage_morphology_file staging_db into language_tokens in verse
+    order, inside SQLite (its sorter spills to disk rather than growing). With
+    verse_tokens, the file's rows are read back in verse order to pack
+    verse_tokens. Returns the packed verses.
+    """
+    first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM language_tokens").fetchone()[0]
+    # ATTACH and DETACH cannot run inside a transaction
+    conn.commit()
+    conn.execute("ATTACH DATABASE ? AS staging", (str(staging_db),))
+    try:
+        conn.execute(TOKENS_FROM_STAGING_SQL)
         conn.commit()
-        print(f"  Imported {count:,} {language} tokens (skipped {skipped:,})")
+    finally:
+        # A no-op after the commit; ends a failed copy's transaction so DETACH can run
+        conn.rollback()
+        conn.execute("DETACH DATABASE staging")
+
+    if not verse_tokens:
+        return 0
+    rows = conn.execute("""
+        SELECT book_id, chapter, verse, position, surface, lemma, morph, strong_id, gloss, language
+        FROM language_tokens WHERE id > ? ORDER BY book_id, chapter, verse, position
+    """, (first_id,))
+    return write_in_chunks(conn, VERSE_TOKENS_INSERT_SQL, iter_verse_token_rows(rows))
+
+
+# --verse-tokens: fields of each token in a verse_tokens array, in order
+VERSE_TOKEN_FIELDS = ["position", "surface", "lemma", "morph", "strong_id", "gloss"]
+
+
+def iter_verse_token_rows(tokens: list):
+    """
+    Yield one verse_tokens row per verse from language_tokens tuples sorted in
+    verse order. tokens holds a compact JSON array per verse, one
+    VERSE_TOKEN_FIELDS array per token (null for missing values).
+    """
+    for (book_id, chapter, verse), group in groupby(tokens, key=itemgetter(0, 1, 2)):
+        group = list(group)
+        packed = json.dumps([token[3:9] for token in group], ensure_ascii=False, separators=(',', ':'))
+        yield (pack_verse_key(book_id, chapter, verse), book_id, chapter, verse,
+               group[0][9], len(group), packed)
+
+
+def decode_verse_tokens(tokens: str) -> list:
+    """Inverse of iter_verse_token_rows' packing: one dict per token, keyed by VERSE_TOKEN_FIELDS."""
+    return [dict(zip(VERSE_TOKEN_FIELDS, token)) for token in json.loads(tokens)]
+
+
+def import_morphology(conn: sqlite3.Connection, jobs: int = 1, verse_tokens: bool = False) -> int:
+    """Import morphology data from STEPBible files.
+
+    Each file is staged in its own SQLite file (in a worker process with
+    jobs > 1), then the single writer streams each staged file, sorted into
+    verse order, in MORPHOLOGY_SOURCES order. Memory stays bounded, and every
+    job count writes identical rows and ids.
+    With verse_tokens, each verse's tokens are also packed into one verse_tokens row.
+    """
+    total_count = 0
+
+    sources = []
+    for source_key, language in MORPHOLOGY_SOURCES:
+        if source_key not in SOURCES:
+            continue
+        if not (CACHE_DIR / SOURCES[source_key]["filename"]).exists():
+            print(f"  Warning: {SOURCES[source_key]['filename']} not found")
+            continue
+        sources.append((source_key, language))
+
+    staging_dir = tempfile.TemporaryDirectory(prefix="morphology-")
+    staging_dbs = [Path(staging_dir.name) / f"{source_key}.sqlite" for source_key, _ in sources]
+    executor = None
+    if jobs > 1 and len(sources) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(sources)))
+        print(f"  Parsing {len(sources)} files with {min(jobs, len(sources))} workers...")
+        results = executor.map(stage_morphology_file, *zip(*sources), staging_dbs)
+    else:
+        results = (stage_morphology_file(source_key, language, staging_db)
+                   for (source_key, language), staging_db in zip(sources, staging_dbs))
+
+    counts = {}
+    skipped_counts = {}
+    packed_verses = 0
+    try:
+        for (source_key, language), staging_db, (count, skipped, error) in zip(sources, staging_dbs, results):
+            print(f"  Processing {SOURCES[source_key]['filename']}...")
+            if error:
+                print(f"  {error}")
+                continue
+            packed_verses += import_staged_tokens(conn, staging_db, verse_tokens)
+            staging_db.unlink()
+
+            counts[language] = counts.get(language, 0) + count
+            skipped_counts[language] = skipped_counts.get(language, 0) + skipped
+    finally:
+        if executor:
+            executor.shutdown()
+        staging_dir.cleanup()
+
+    conn.commit()
+    for language, count in counts.items():
+        print(f"  Imported {count:,} {language} tokens (skipped {skipped_counts[language]:,})")
         total_count += count
+    if verse_tokens:
+        print(f"  Packed tokens into {packed_verses:,} verse_tokens rows")
 
     return total_count
 
 
-def record_data_sources(conn: sqlite3.Connection, verse_count: int, crossref_count: int, token_count: int):
-    """Record data source attribution in the database."""
+# Strong's numbers as STEPBible writes them ("G0026", "H7225G"): the
+# concordance key drops the zero padding and the disambiguation suffix ("G26")
+STRONGS_KEY_RE = re.compile(r"([GH])0*(\d+)")
+
+
+def strongs_key(strong_id: str) -> str:
+    """Concordance key for a Strong's number, e.g. 'H7225G' -> 'H7225'. None if it is not one."""
+    match = STRONGS_KEY_RE.match(strong_id.upper())
+    return match.group(1) + match.group(2) if match else None
+
+
+def encode_postings(ordinals: list) -> bytes:
+    """
+    Encode ascending verse ordinals as the gaps between them (the first from 0),
+    each an unsigned LEB128 varint: 7 bits per byte, high bit set on all but
+    the last byte. Most gaps fit in one or two bytes.
+    """
+    out = bytearray()
+    previous = 0
+    for ordinal in ordinals:
+        gap = ordinal - previous
+        previous = ordinal
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+    return bytes(out)
+
+
+def decode_postings(postings: bytes) -> list:
+    """Inverse of encode_postings: the ascending verse ordinals."""
+    ordinals = []
+    ordinal = gap = shift = 0
+    for byte in postings:
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        ordinal += gap
+        ordinals.append(ordinal)
+        gap = shift = 0
+    return ordinals
+
+
+def build_strongs_concordance(conn: sqlite3.Connection) -> int:
+    """
+    Fill strongs_concordance with one row per Strong's number (see strongs_key):
+    its total token occurrences and the ordinals of the verses using it, as
+    encode_postings postings. "Every use of G26" is then one primary-key fetch.
+    """
+    occurrences = Counter()
+    postings = {}
+    unmapped = 0
+    for strong_id, ordinal in conn.execute("""
+        SELECT t.strong_id, o.ordinal
+        FROM language_tokens t
+        LEFT JOIN verse_ordinals o ON o.book_id = t.book_id AND o.chapter = t.chapter AND o.verse = t.verse
+        WHERE t.strong_id IS NOT NULL
+    """):
+        key = strongs_key(strong_id)
+        if key is None:
+            continue
+        if ordinal is None:
+            unmapped += 1
+            continue
+        occurrences[key] += 1
+        postings.setdefault(key, set()).add(ordinal)
+
+    def rows():
+        for key in sorted(postings):
+            ordinals = sorted(postings[key])
+            yield (key, occurrences[key], len(ordinals), encode_postings(ordinals))
+
+    count = write_in_chunks(
+        conn,
+        "INSERT INTO strongs_concordance (strong_id, occurrences, verse_count, postings) VALUES (?, ?, ?, ?)",
+        rows()
+    )
+    conn.commit()
+
+    size = conn.execute("SELECT COALESCE(SUM(LENGTH(postings)), 0) FROM strongs_concordance").fetchone()[0]
+    print(f"  Indexed {count:,} Strong's numbers over {sum(occurrences.values()):,} tokens "
+          f"({size / 1024:,.0f} KB of postings; {unmapped:,} tokens outside verse_ordinals)")
+    return count
+
+
+# Ranking shared by crossref_topk and CrossRefGenerator.get_cross_references:
+# weight first, then a deterministic tie-break on the target
+CROSSREF_RANK_ORDER = ("weight DESC, target_book_id ASC, target_chapter ASC, "
+                       "target_verse_start ASC, target_verse_end ASC")
+
+
+def build_crossref_topk(conn: sqlite3.Connection, limit: int) -> int:
+    """Fill crossref_topk with the `limit` best cross-references of each source verse.
+
+    Rows are ranked 1..limit in CROSSREF_RANK_ORDER, so a verse tap is a primary
+    key range read with no sort. ref_count is the verse's full cross-reference
+    count; when it exceeds the rows stored, the list was truncated. Sources are
+    keyed by source_verse_start (OpenBible sources are single verses).
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        INSERT INTO crossref_topk
+            (source_book_id, source_chapter, source_verse, rank, crossref_id,
+             target_book_id, target_chapter, target_verse_start, target_verse_end, weight, ref_count)
+        SELECT source_book_id, source_chapter, source_verse_start, rank, id,
+               target_book_id, target_chapter, target_verse_start, target_verse_end, weight, ref_count
+        FROM (
+            SELECT *,
+                   ROW_NUMBER() OVER source_verse AS rank,
+                   COUNT(*) OVER (PARTITION BY source_book_id, source_chapter, source_verse_start) AS ref_count
+            FROM cross_references
+            WINDOW source_verse AS (
+                PARTITION BY source_book_id, source_chapter, source_verse_start
+                ORDER BY {CROSSREF_RANK_ORDER}
+            )
+        )
+        WHERE rank <= ?
+        ORDER BY source_book_id, source_chapter, source_verse_start, rank
+    """, (limit,))
+    count = cursor.rowcount
+    conn.commit()
+
+    truncated = cursor.execute("SELECT COUNT(*) FROM crossref_topk WHERE rank = 1 AND ref_count > ?",
+                               (limit,)).fetchone()[0]
+    print(f"  Ranked {count:,} cross-references (top {limit}; {truncated:,} verses truncated)")
+    return count
+
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-10
+PAGERANK_MAX_ITERATIONS = 100
+
+
+def crossref_graph(conn: sqlite3.Connection) -> "sparse.csr_matrix":
+    """
+    Load the cross-references as a sparse verse-by-verse adjacency matrix, indexed
+    by ordinal - 1. Each reference adds its weight split evenly across the verses
+    its target covers, so a ten-verse range counts as much as a single verse.
+    """
+    count = conn.execute("SELECT COUNT(*) FROM verse_ordinals").fetchone()[0]
+    edges = np.array(conn.execute("""
+        SELECT o.source_start - 1, r.target_ordinal - 1, c.weight / (o.target_end - o.target_start + 1)
+        FROM crossref_reverse r
+        JOIN crossref_ordinals o ON o.crossref_id = r.crossref_id
+        JOIN cross_references c ON c.id = r.crossref_id
+    """).fetchall(), dtype=np.float64).reshape(-1, 3)
+    # Repeated (source, target) pairs are summed by the conversion to CSR
+    return sparse.coo_matrix((edges[:, 2], (edges[:, 0].astype(np.int32), edges[:, 1].astype(np.int32))),
+                             shape=(count, count)).tocsr()
+
+
+def pagerank(adjacency: "sparse.csr_matrix") -> tuple:
+    """
+    Weighted PageRank by power iteration. Verses with no outgoing references
+    spread their score evenly over every verse. Returns (scores, iterations).
+    """
+    count = adjacency.shape[0]
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inverse_out = np.divide(1.0, out_weight, out=np.zeros(count), where=~dangling)
+    transposed = adjacency.T.tocsr()
+
+    scores = np.full(count, 1.0 / count)
+    for iteration in range(1, PAGERANK_MAX_ITERATIONS + 1):
+        spread = PAGERANK_DAMPING * scores[dangling].sum() + (1.0 - PAGERANK_DAMPING)
+        updated = PAGERANK_DAMPING * (transposed @ (scores * inverse_out)) + spread / count
+        converged = np.abs(updated - scores).sum() < PAGERANK_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores, iteration
+
+
+def iter_see_also_rows(adjacency: "sparse.csr_matrix", limit: int):
+    """
+    Yield crossref_see_also rows: for each verse, the `limit` verses two references
+    away that it does not already reference, scored by the summed weight of the
+    paths to them (ties go to the earlier verse).
+    """
+    two_hop = (adjacency @ adjacency).tocsr()
+    # Drop the verse itself and the verses it references directly
+    two_hop.setdiag(0)
+    two_hop = two_hop - two_hop.multiply(adjacency > 0)
+    two_hop.eliminate_zeros()
+    two_hop.sort_indices()
+
+    for row in range(two_hop.shape[0]):
+        start, end = two_hop.indptr[row], two_hop.indptr[row + 1]
+        if start == end:
+            continue
+        targets = two_hop.indices[start:end]
+        scores = two_hop.data[start:end]
+        # Stable sort on -score keeps ordinal order among equal scores
+        best = np.argsort(-scores, kind="stable")[:limit]
+        for rank, index in enumerate(best, start=1):
+            yield (row + 1, rank, int(targets[index]) + 1, float(scores[index]))
+
+
+def build_crossref_graph(conn: sqlite3.Connection, see_also: int) -> int:
+    """
+    Analyse the whole cross-reference graph with SciPy sparse matrices: fill
+    verse_centrality with each verse's PageRank and crossref_see_also with its
+    `see_also` best 2-hop recommendations. Both are keyed by verse ordinal.
+    """
+    adjacency = crossref_graph(conn)
+    scores, iterations = pagerank(adjacency)
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+
+    cursor = conn.cursor()
+    cursor.executemany("INSERT INTO verse_centrality (ordinal, pagerank, rank) VALUES (?, ?, ?)",
+                       zip(range(1, len(scores) + 1), scores.tolist(), ranks.tolist()))
+    count = write_in_chunks(conn, "INSERT INTO crossref_see_also (ordinal, rank, target_ordinal, score) "
+                                  "VALUES (?, ?, ?, ?)", iter_see_also_rows(adjacency, see_also))
+    conn.commit()
+    print(f"  PageRank over {adjacency.shape[0]:,} verses and {adjacency.nnz:,} edges "
+          f"converged in {iterations} iterations")
+    print(f"  Stored {count:,} see-also recommendations (top {see_also} per verse)")
+    return count
+
+
+# chapter_payloads encodings (--chapter-payloads). "deflate" is raw DEFLATE with
+# no zlib header, which Apple's Compression framework reads as COMPRESSION_ZLIB.
+CHAPTER_PAYLOAD_ENCODINGS = ["none", "json", "deflate"]
+
+
+def encode_chapter_payload(verses: list, crossref_counts: Counter, token_counts: Counter,
+                           book_id: int, chapter: int, encoding: str) -> bytes:
+    """
+    Encode one chapter as compact JSON:
+      v: verse numbers
+      text: all verse texts concatenated
+      o: verse boundaries in text, len(v) + 1 offsets in Unicode scalars
+      x, t: cross-references whose source range covers / tokens in each verse
+    """
+    offsets = [0]
+    for _, text in verses:
+        offsets.append(offsets[-1] + len(text))
+    payload = json.dumps({
+        "v": [verse for verse, _ in verses],
+        "text": "".join(text for _, text in verses),
+        "o": offsets,
+        "x": [crossref_counts[(book_id, chapter, verse)] for verse, _ in verses],
+        "t": [token_counts[(book_id, chapter, verse)] for verse, _ in verses],
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if encoding == "deflate":
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        payload = compressor.compress(payload) + compressor.flush()
+    return payload
+
+
+def decode_chapter_payload(payload: bytes, encoding: str) -> dict:
+    """Inverse of encode_chapter_payload, adding "verses": the verse texts split out."""
+    if encoding == "deflate":
+        payload = zlib.decompress(payload, -15)
+    chapter = json.loads(payload)
+    text, offsets = chapter["text"], chapter["o"]
+    chapter["verses"] = [text[offsets[i]:offsets[i + 1]] for i in range(len(chapter["v"]))]
+    return chapter
+
+
+def build_chapter_payloads(conn: sqlite3.Connection, encoding: str = "json") -> int:
+    """Fill chapter_payloads from verses, cross_references and language_tokens.
+
+    Lets a reader render a chapter, with its per-verse cross-reference and
+    token counts, from one primary-key lookup instead of three queries.
+    """
+    # A cross-reference counts against every verse its source range covers
+    crossref_counts = Counter()
+    for book_id, chapter, start, end in conn.execute(
+            "SELECT source_book_id, source_chapter, source_verse_start, source_verse_end FROM cross_references"):
+        for verse in range(start, (end or start) + 1):
+            crossref_counts[(book_id, chapter, verse)] += 1
+    token_counts = Counter(dict(
+        ((book_id, chapter, verse), count) for book_id, chapter, verse, count in conn.execute(
+            "SELECT book_id, chapter, verse, COUNT(*) FROM language_tokens GROUP BY book_id, chapter, verse")
+    ))
+
+    def rows():
+        verses = conn.execute(
+            "SELECT translation_id, book_id, chapter, verse, text FROM verses "
+            "ORDER BY translation_id, book_id, chapter, verse"
+        )
+        for (translation_id, book_id, chapter), group in groupby(verses, key=itemgetter(0, 1, 2)):
+            chapter_verses = [(verse, text) for _, _, _, verse, text in group]
+            yield (translation_id, book_id, chapter, len(chapter_verses), encoding,
+                   encode_chapter_payload(chapter_verses, crossref_counts, token_counts,
+                                          book_id, chapter, encoding))
+
+    count = write_in_chunks(
+        conn,
+        "INSERT INTO chapter_payloads (translation_id, book_id, chapter, verse_count, encoding, payload) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows()
+    )
+    conn.commit()
+
+    size = conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM chapter_payloads").fetchone()[0]
+    print(f"  Built {count:,} chapter payloads ({encoding}, {size / (1024 * 1024):.2f} MB)")
+    return count
+
+
+# --page-layout-search: the output is rewritten with each candidate page size and
+# object order, and a variant replaces it only if its cold chapter reads are
+# clearly faster: every variant (and the output itself) is timed in
+# PAGE_LAYOUT_TRIALS interleaved rounds, and the fastest must beat the output in
+# every round and by PAGE_LAYOUT_MIN_GAIN on the median, so run-to-run noise
+# keeps the built file.
+#   built:         the builder's own file (tables and indexes in creation order)
+#   reading-first: the tables read at launch and on a chapter open, each followed
+#                  by its indexes, at the start of the file; verses_fts last
+# Rows are already in verse order: verses and tokens are inserted that way, and
+# cross-references keep OpenBible's source-verse order.
+PAGE_LAYOUT_PAGE_SIZES = [4096, 8192, 16384, 65536]
+PAGE_LAYOUT_ORDERS = ["built", "reading-first"]
+PAGE_LAYOUT_TRIALS = 5
+PAGE_LAYOUT_MIN_GAIN = 0.15
+READING_FIRST_TABLES = [
+    "grdb_migrations", "translations", "verses", "chapter_payloads", "verse_tokens",
+    "cross_references", "crossref_topk", "language_tokens",
+]
+
+
+def write_page_layout(source: Path, target: Path, page_size: int, order: str):
+    """Copy the built database at `source` to `target` with the given page size and PAGE_LAYOUT_ORDERS order."""
+    target.unlink(missing_ok=True)
+    if order == "built":
+        shutil.copyfile(source, target)
+        conn = sqlite3.connect(target)
+        # The page size can only change outside WAL mode
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute(f"PRAGMA page_size = {page_size}")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.close()
+        return
+
+    conn = sqlite3.connect(target, isolation_level=None)
+    conn.execute(f"PRAGMA page_size = {page_size}")
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("ATTACH DATABASE ? AS src", (str(source),))
+    schema = conn.execute("SELECT type, name, tbl_name, sql FROM src.sqlite_master WHERE sql IS NOT NULL").fetchall()
+    virtual = [name for kind, name, _, sql in schema if kind == "table" and sql.upper().startswith("CREATE VIRTUAL")]
+    shadow = {name for _, name, _, _ in schema if any(name.startswith(table + "_") for table in virtual)}
+    tables = [name for kind, name, _, _ in schema
+              if kind == "table" and name not in virtual and name not in shadow and not name.startswith("sqlite_")]
+    first = {name: position for position, name in enumerate(READING_FIRST_TABLES)}
+    tables.sort(key=lambda name: first.get(name, len(first)))
+    definitions = {name: sql for _, name, _, sql in schema}
+
+    conn.execute("BEGIN")
+    for table in tables:
+        conn.execute(definitions[table])
+        conn.execute(f"INSERT INTO main.{table} SELECT * FROM src.{table}")
+        for kind, name, owner, sql in schema:
+            if kind == "index" and owner == table:
+                conn.execute(sql)
+    # External-content FTS tables are rebuilt from the copied rows
+    for table in virtual:
+        conn.execute(definitions[table])
+        conn.execute(f"INSERT INTO main.{table}({table}) VALUES ('rebuild')")
+    for kind, name, _, sql in schema:
+        if kind in ("view", "trigger"):
+            conn.execute(sql)
+    # Copying into AUTOINCREMENT tables filled sqlite_sequence; match the source's
+    if any(name == "sqlite_sequence" for _, name, _, _ in schema):
+        conn.execute("DELETE FROM main.sqlite_sequence")
+        conn.execute("INSERT INTO main.sqlite_sequence SELECT * FROM src.sqlite_sequence")
+    conn.execute("COMMIT")
+
+    for table in tables:
+        copied, original = (conn.execute(f"SELECT COUNT(*) FROM {schema_name}.{table}").fetchone()[0]
+                            for schema_name in ("main", "src"))
+        if copied != original:
+            raise RuntimeError(f"{target.name}: {table} has {copied:,} rows, expected {original:,}")
+    conn.execute("DETACH DATABASE src")
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+
+
+def evict_from_page_cache(path: Path) -> bool:
+    """Ask the OS to drop its cached pages of `path`, so the next reads hit storage. False where unsupported."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def time_page_layout(path: Path, chapters: list, repeat: int) -> dict:
+    """
+    Cold-start timings for one variant, `repeat` times over: with the file evicted
+    from the OS cache, open it, read grdb_migrations and the first chapter (what
+    the app does at launch), then read the other chapters, each for the first time.
+    Needs at least two chapters (the first is part of the cold open) and a
+    repeat of at least 1.
+    """
+    if len(chapters) < 2 or repeat < 1:
+        raise ValueError(f"time_page_layout needs two or more chapters and repeat >= 1, "
+                         f"got {len(chapters)} and {repeat}")
+    chapter_sql = app_workload.WORKLOAD["chapter"]["sql"]
+    opens, reads = [], []
+    evicted = True
+    for _ in range(repeat):
+        evicted = evict_from_page_cache(path) and evicted
+        start = time.perf_counter()
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        conn.execute("SELECT identifier FROM grdb_migrations").fetchall()
+        conn.execute(chapter_sql, chapters[0]).fetchall()
+        opens.append((time.perf_counter() - start) * 1e3)
+        for arguments in chapters[1:]:
+            start = time.perf_counter()
+            conn.execute(chapter_sql, arguments).fetchall()
+            reads.append((time.perf_counter() - start) * 1e6)
+        conn.close()
+    return {
+        "cold_open_ms": round(statistics.median(opens), 2),
+        "chapter_p50_us": round(statistics.median(reads), 1),
+        "chapter_p99_us": round(statistics.quantiles(reads, n=100)[98] if len(reads) > 1 else reads[0], 1),
+        "evicted": evicted,
+    }
+
+
+def layout_beats(candidate: dict, incumbent: dict, min_gain: float) -> bool:
+    """
+    Whether `candidate` reads chapters faster than `incumbent` in every trial and
+    by at least `min_gain` (a fraction) on the median of its trials.
+    """
+    trials = list(zip(candidate["trial_chapter_p50_us"], incumbent["trial_chapter_p50_us"]))
+    return (bool(trials) and all(ours < theirs for ours, theirs in trials)
+            and candidate["chapter_p50_us"] <= incumbent["chapter_p50_us"] * (1 - min_gain))
+
+
+def search_page_layouts(output: Path, page_sizes: list, chapters: int = 200, repeat: int = 3,
+                        trials: int = PAGE_LAYOUT_TRIALS, min_gain: float = PAGE_LAYOUT_MIN_GAIN) -> dict:
+    """
+    Write every page size x PAGE_LAYOUT_ORDERS variant of the built `output` and
+    time cold opens and first chapter reads on each and on `output` itself, in
+    `trials` interleaved rounds. The fastest variant (lowest median chapter read
+    across rounds, then cold open) replaces `output` only if it is faster in every
+    round and at least `min_gain` faster on the median. Returns the timings.
+    """
+    conn = sqlite3.connect(f"file:{output}?mode=ro", uri=True)
+    sample = app_workload.sample_verses(conn, chapters, random.Random(0))
+    built_page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    conn.close()
+    if len(sample) < 2:
+        print("  Fewer than two chapters to read; keeping the built file")
+        return None
+
+    # The output is the incumbent; re-paging it at its own size in built order only copies it
+    current = {"page_size": built_page_size, "order": "built", "path": output, "size_bytes": output.stat().st_size}
+    variants = []
+    for page_size in page_sizes:
+        for order in PAGE_LAYOUT_ORDERS:
+            if (page_size, order) == (built_page_size, "built"):
+                continue
+            path = output.with_name(f"{output.stem}.{page_size}-{order}{output.suffix}")
+            start = time.perf_counter()
+            write_page_layout(output, path, page_size, order)
+            variants.append({"page_size": page_size, "order": order, "path": path,
+                             "size_bytes": path.stat().st_size,
+                             "write_seconds": round(time.perf_counter() - start, 2)})
+
+    runs = {id(variant): [] for variant in [current, *variants]}
+    for _ in range(trials):
+        for variant in [current, *variants]:
+            runs[id(variant)].append(time_page_layout(variant["path"], sample, repeat))
+    for variant in [current, *variants]:
+        timings = runs[id(variant)]
+        variant.update({
+            "cold_open_ms": round(statistics.median(run["cold_open_ms"] for run in timings), 2),
+            "chapter_p50_us": round(statistics.median(run["chapter_p50_us"] for run in timings), 1),
+            "chapter_p99_us": round(statistics.median(run["chapter_p99_us"] for run in timings), 1),
+            "trial_chapter_p50_us": [run["chapter_p50_us"] for run in timings],
+            "evicted": all(run["evicted"] for run in timings),
+        })
+        print(f"  {variant['page_size']:>6} {variant['order']:<14} {variant['size_bytes'] / 1e6:7.1f} MB  "
+              f"cold open {variant['cold_open_ms']:7.2f}ms  chapter p50 {variant['chapter_p50_us']:8.1f}us  "
+              f"p99 {variant['chapter_p99_us']:8.1f}us" + ("  (built)" if variant is current else ""))
+    if not current["evicted"]:
+        print("  Note: this OS cannot drop cached pages, so these are warm-cache timings")
+
+    best = min(variants, key=lambda variant: (variant["chapter_p50_us"], variant["cold_open_ms"]), default=None)
+    if best is not None and not layout_beats(best, current, min_gain):
+        best = None
+    for variant in [current, *variants]:
+        path = variant.pop("path")
+        if variant is best:
+            best_path = path
+        elif variant is not current:
+            path.unlink()
+    if best is None:
+        print(f"  Kept the built file (no variant was {min_gain:.0%} faster in all {trials} rounds)")
+        best = current
+    else:
+        for suffix in ("-wal", "-shm"):
+            Path(str(output) + suffix).unlink(missing_ok=True)
+        os.replace(best_path, output)
+        print(f"  Kept page_size {best['page_size']}, {best['order']} order")
+    return {"chosen": {"page_size": best["page_size"], "order": best["order"]},
+            "trials": trials, "min_gain": min_gain, "built": current, "variants": variants}
+
+
+# --shards: the finished database split into a core pack (verses, FTS and every
+# other table, with the sharded tables left empty) plus one pack per testament or
+# per book holding those tables' rows, so the app can fetch and ATTACH packs on
+# demand. Values are each table's WHERE clause for a pack's {books}; the
+# cross-reference side tables follow their cross-reference's source book.
+SHARD_LAYOUTS = ["testament", "book"]
+SHARDED_TABLES = {
+    "cross_references": "source_book_id IN ({books})",
+    "crossref_ordinals": "crossref_id IN (SELECT id FROM cross_references WHERE source_book_id IN ({books}))",
+    "crossref_reverse": "crossref_id IN (SELECT id FROM cross_references WHERE source_book_id IN ({books}))",
+    "crossref_topk": "source_book_id IN ({books})",
+    "language_tokens": "book_id IN ({books})",
+    "verse_tokens": "book_id IN ({books})",
+}
+# Genesis-Malachi
+OLD_TESTAMENT_BOOK_IDS = range(1, 40)
+
+
+def shard_groups(layout: str) -> list:
+    """(pack name, book ids) for each pack of a SHARD_LAYOUTS layout."""
+    if layout == "testament":
+        return [("ot", list(OLD_TESTAMENT_BOOK_IDS)),
+                ("nt", [book_id for book_id in range(1, len(BOOK_NAMES) + 1) if book_id not in OLD_TESTAMENT_BOOK_IDS])]
+    return [(f"book-{book_id:02d}", [book_id]) for book_id in range(1, len(BOOK_NAMES) + 1)]
+
+
+def write_shard_packs(output: Path, layout: str, sharded_tables: dict = SHARDED_TABLES) -> dict:
+    """
+    Split the built `output` into <stem>-packs/: <stem>-core.sqlite plus one pack per
+    shard_groups entry with rows (see SHARDED_TABLES; generate_commentary.py passes
+    its own), and manifest.json with each pack's SHA-256, size, books and per-table
+    row counts. Returns the manifest.
+    """
+    pack_dir = output.with_name(f"{output.stem}-packs")
+    pack_dir.mkdir(exist_ok=True)
+    for stale in [*pack_dir.glob(f"{output.stem}-*.sqlite"), pack_dir / "manifest.json"]:
+        stale.unlink(missing_ok=True)
+
+    source = sqlite3.connect(f"file:{output}?mode=ro", uri=True)
+    schema = {name: (kind, table, sql) for kind, name, table, sql in source.execute(
+        "SELECT type, name, tbl_name, sql FROM sqlite_master WHERE sql IS NOT NULL")}
+    tables = [table for table in sharded_tables if schema.get(table, ("",))[0] == "table"]
+    expected = {table: source.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    virtual = [name for name, (kind, _, sql) in schema.items() if kind == "table" and sql.upper().startswith("CREATE VIRTUAL")]
+    counts = {}
+    for name, (kind, _, _) in schema.items():
+        if (kind == "table" and not name.startswith("sqlite_") and name not in tables
+                and not any(name.startswith(table + "_") for table in virtual)):
+            counts[name] = source.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+    source.close()
+
+    def describe(path: Path, name: str, books: list, rows: dict) -> dict:
+        return {"name": name, "file": path.name, "sha256": compute_file_checksum(path, "sha256"),
+                "size_bytes": path.stat().st_size, "books": books, "rows": rows}
+
+    # Core: everything, with the sharded tables emptied but kept for the schema
+    core_path = pack_dir / f"{output.stem}-core.sqlite"
+    shutil.copyfile(output, core_path)
+    conn = sqlite3.connect(core_path)
+    for table in tables:
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    packs = [describe(core_path, "core", None, counts)]
+
+    totals = dict.fromkeys(tables, 0)
+    for name, books in shard_groups(layout):
+        path = pack_dir / f"{output.stem}-{name}.sqlite"
+        book_list = ", ".join(map(str, books))
+        conn = sqlite3.connect(path)
+        conn.execute("ATTACH DATABASE ? AS src", (str(output),))
+        rows = {}
+        for table in tables:
+            conn.execute(schema[table][2])
+            conn.execute(f"INSERT INTO main.{table} SELECT * FROM src.{table} "
+                         f"WHERE {sharded_tables[table].format(books=book_list)}")
+            rows[table] = conn.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+            for index, (kind, owner, sql) in schema.items():
+                if kind == "index" and owner == table:
+                    conn.execute(sql)
+        conn.commit()
+        conn.execute("DETACH DATABASE src")
+        conn.close()
+        if not any(rows.values()):
+            path.unlink()
+            continue
+        for table, count in rows.items():
+            totals[table] += count
+        packs.append(describe(path, name, books, rows))
+
+    missing = {table: expected[table] - totals[table] for table in tables if totals[table] != expected[table]}
+    if missing:
+        raise RuntimeError(f"shard packs are missing rows: {missing}")
+
+    manifest = {
+        "database": output.name,
+        "sha256": compute_file_checksum(output, "sha256"),
+        "layout": layout,
+        "built_at": datetime.utcnow().isoformat(),
+        "packs": packs,
+    }
+    with open(pack_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# Cross-reference tables, measured with their indexes for the build report
+CROSSREF_TABLES = ["cross_references", "crossref_ordinals", "crossref_reverse"]
+
+
+def table_bytes(conn: sqlite3.Connection, tables: list) -> int:
+    """
+    Bytes used by `tables` and their indexes, from the dbstat virtual table.
+    Returns None if SQLite was built without it.
+    """
+    placeholders = ",".join("?" * len(tables))
+    try:
+        return conn.execute(f"""
+            SELECT COALESCE(SUM(d.pgsize), 0) FROM dbstat d JOIN sqlite_master m ON m.name = d.name
+            WHERE m.tbl_name IN ({placeholders})
+        """, tables).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+def record_data_sources(conn: sqlite3.Connection, crossref_count: int, token_count: int,
+                        checksums: dict = None):
+    """Record data source attribution in the database.
+
+    Every bundled translation gets a row with its verse count. checksums maps
+    SOURCES keys to file checksums; each data source records the combined
+    checksum of the files it was imported from.
+    """
     cursor = conn.cursor()
     now = datetime.utcnow().isoformat()
 
+    source_checksums = {}
+    for source_id, keys in DATA_SOURCE_FILES.items():
+        if checksums and all(checksums.get(key) for key in keys):
+            source_checksums[source_id] = (checksums[keys[0]] if len(keys) == 1
+                                           else combined_checksum([checksums[key] for key in keys]))
+
+    verse_counts = dict(cursor.execute("SELECT translation_id, COUNT(*) FROM verses GROUP BY translation_id"))
     sources = [
-        ("kjv", "King James Version", "1.0",
+        (translation_id, translation["name"], "1.0",
          "https://github.com/scrollmapper/bible_databases",
-         "Public Domain", None,
-         "KJV text from scrollmapper/bible_databases. 1769 Cambridge Edition.",
-         verse_count, now, None),
-
+         SOURCES[translation["source"]]["license"], None,
+         translation["attribution"],
+         verse_counts[translation_id], now, source_checksums.get(translation_id))
+        for translation_id, translation in TRANSLATIONS.items() if translation_id in verse_counts
+    ] + [
         ("openbible-crossrefs", "OpenBible Cross-References", "1.0",
          "https://www.openbible.info/labs/cross-references/",
          "CC BY 4.0", "https://creativecommons.org/licenses/by/4.0/",
          "Cross-references compiled by OpenBible.info",
-         crossref_count, now, None),
+         crossref_count, now, source_checksums.get("openbible-crossrefs")),
 
         ("stepbible-morphology", "STEPBible Morphology", "1.0",
          "https://github.com/STEPBible/STEPBible-Data",
          "CC BY 4.0", "https://creativecommons.org/licenses/by/4.0/",
          "Hebrew and Greek morphological data from STEPBible.org",
-         token_count, now, None),
+         token_count, now, source_checksums.get("stepbible-morphology")),
     ]
 
+    # Translations no longer bundled lose their attribution row
+    dropped = [translation_id for translation_id in TRANSLATIONS if translation_id not in verse_counts]
+    cursor.executemany("DELETE FROM data_sources WHERE id = ?", [(translation_id,) for translation_id in dropped])
     cursor.executemany(
         """INSERT OR REPLACE INTO data_sources
            (id, name, version, source_url, license, license_url, attribution, record_count, imported_at, checksum)
@@ -1025,85 +2788,472 @@ def record_data_sources(conn: sqlite3.Connection, verse_count: int, crossref_cou
     print(f"  Recorded {len(sources)} data sources")
 
 
+def peak_rss_mb() -> dict:
+    """High-water RSS of this process and of finished worker processes, in MB."""
+    if not HAS_RESOURCE:
+        return {}
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+class BuildProfiler:
+    """
+    Times each step of main(). Wall time is always recorded (the summary prints
+    some of it); with enabled=True each stage also records CPU time, rows/sec
+    and the process RSS high-water mark.
+
+    trace_memory adds the tracemalloc peak of Python allocations per stage and
+    pstats_prefix a cProfile dump per stage. Both instrument every call and slow
+    the build several times over, so their wall times are not comparable with
+    plain --profile runs. SQLite's own allocations only show up in RSS.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False, pstats_prefix: Path = None):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.pstats_prefix = pstats_prefix if enabled else None
+        self.stages = []
+        if self.trace_memory:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block. Set record["rows"] inside it for rows/sec."""
+        record = {"name": name, "rows": None}
+        profile = None
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if self.pstats_prefix:
+            profile = cProfile.Profile()
+            profile.enable()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            if profile:
+                profile.disable()
+            if self.enabled:
+                record["cpu_seconds"] = round(time.process_time() - cpu_start, 3)
+                if record["rows"] and record["seconds"] > 0:
+                    record["rows_per_sec"] = round(record["rows"] / record["seconds"])
+                if self.trace_memory:
+                    record["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                record["peak_rss_mb"] = peak_rss_mb()
+                if profile:
+                    pstats_path = Path(f"{self.pstats_prefix}.{name}.pstats")
+                    profile.dump_stats(pstats_path)
+                    record["pstats"] = pstats_path.name
+            self.stages.append(record)
+
+    def write_report(self, path: Path, report: dict):
+        """Write the JSON build report; stage records go under "stages"."""
+        stages = [dict(record, seconds=round(record["seconds"], 3)) for record in self.stages]
+        report = dict(report, stages=stages, peak_rss_mb=peak_rss_mb())
+        if self.trace_memory:
+            tracemalloc.stop()
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    def print_summary(self):
+        """One line per profiled stage, slowest first."""
+        print("\n  Stage profile:")
+        for record in sorted(self.stages, key=lambda r: r["seconds"], reverse=True):
+            rate = f"{record['rows_per_sec']:>10,} rows/s" if "rows_per_sec" in record else " " * 17
+            rss = record["peak_rss_mb"].get("self", 0)
+            python_peak = f"  py peak {record['python_peak_mb']:6.1f} MB" if "python_peak_mb" in record else ""
+            print(f"    {record['name']:<12} {record['seconds']:7.2f}s {rate}  RSS {rss:6.1f} MB{python_peak}")
+
+
+def builder_tables(args: argparse.Namespace) -> list:
+    """The BUILDER_TABLES this build's options fill."""
+    # --crossref-graph reads the reverse-lookup tables, and every ordinal table needs verse_ordinals
+    reverse = args.crossref_reverse or args.crossref_graph > 0
+    concordance = args.concordance and not args.skip_morphology
+    enabled = {
+        "verse_ordinals": reverse or concordance,
+        "crossref_ordinals": reverse,
+        "crossref_reverse": reverse,
+        "verse_tokens": args.verse_tokens and not args.skip_morphology,
+        "strongs_concordance": concordance,
+        "crossref_topk": args.crossref_topk > 0,
+        "verse_centrality": args.crossref_graph > 0,
+        "crossref_see_also": args.crossref_graph > 0,
+        "chapter_payloads": args.chapter_payloads != "none",
+    }
+    return [table for table in BUILDER_TABLES if enabled[table]]
+
+
+def page_size_list(value: str) -> list:
+    """argparse type for --page-sizes: powers of two from 512 to 65536."""
+    sizes = [int(size) for size in value.split(",") if size.strip()]
+    for size in sizes:
+        if size < 512 or size > 65536 or size & (size - 1):
+            raise argparse.ArgumentTypeError(f"{size} is not a power of two from 512 to 65536")
+    return sizes
+
+
 def main():
     parser = argparse.ArgumentParser(description="Build Bible database from open sources")
     parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
                         help="Output SQLite database path")
     parser.add_argument("--skip-download", action="store_true",
                         help="Skip downloading, use cached files only")
+    parser.add_argument("--refresh-sources", action="store_true",
+                        help="Revalidate cached source files (ETag/Last-Modified) and fetch any that changed")
+    parser.add_argument("--pin-sources", action="store_true",
+                        help="Record the SHA-256 of the cached source files in pinned_sources.json")
     parser.add_argument("--skip-morphology", action="store_true",
                         help="Skip morphology import (faster for testing)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Read translations and parse morphology files in N worker processes (default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse the existing output and only re-run stages whose inputs changed")
+    parser.add_argument("--fast", action="store_true",
+                        help="Build in memory without journaling, then atomically replace the output")
+    parser.add_argument("--layout", choices=LAYOUTS, default="rowid",
+                        help="Table layout: rowid (the app's) or clustered (WITHOUT ROWID tokens on their verse columns)")
+    parser.add_argument("--token-storage", choices=TOKEN_STORAGES, default="table",
+                        help="language_tokens as the app's table, or compact (lookup tables behind a view)")
+    parser.add_argument("--verse-tokens", action="store_true",
+                        help="Also pack each verse's tokens into one verse_tokens row (compact JSON)")
+    parser.add_argument("--concordance", action="store_true",
+                        help="Also index the verses using each Strong's number in strongs_concordance")
+    parser.add_argument("--crossref-reverse", action="store_true",
+                        help="Also store cross-reference spans as verse ordinals and a per-verse reverse-lookup table")
+    parser.add_argument("--crossref-topk", type=int, default=0, metavar="N",
+                        help="Also store the N best-ranked cross-references per verse in crossref_topk (0: off)")
+    parser.add_argument("--crossref-graph", type=int, default=0, metavar="N",
+                        help="Also store verse PageRank and the N best 2-hop see-also verses per verse "
+                             "(0: off; needs numpy and scipy)")
+    parser.add_argument("--chapter-payloads", choices=CHAPTER_PAYLOAD_ENCODINGS, default="none",
+                        help="Also build one precomputed payload per chapter, as JSON or deflated JSON")
+    parser.add_argument("--min-votes", type=int, default=0, metavar="N",
+                        help="Cross-references with fewer OpenBible votes are dropped or down-ranked (default: 0)")
+    parser.add_argument("--low-votes", choices=LOW_VOTE_ACTIONS, default="drop",
+                        help="What to do with cross-references below --min-votes (default: drop)")
+    parser.add_argument("--fts-profile", choices=list(FTS_PROFILES), default=DEFAULT_FTS_PROFILE,
+                        help="Full-text index layout (default: the app's; see bench_pipeline.py fts)")
+    parser.add_argument("--index-plan", type=Path, metavar="PATH",
+                        help="Skip the indexes an index_advisor.py plan drops")
+    parser.add_argument("--page-layout-search", action="store_true",
+                        help="Try each --page-sizes value with each object order and keep one only if "
+                             "it reads clearly faster than the built file")
+    parser.add_argument("--page-sizes", type=page_size_list, default=PAGE_LAYOUT_PAGE_SIZES, metavar="LIST",
+                        help="Comma-separated page sizes for --page-layout-search "
+                             f"(default: {','.join(map(str, PAGE_LAYOUT_PAGE_SIZES))})")
+    parser.add_argument("--shards", choices=SHARD_LAYOUTS,
+                        help="Also split the output into a core pack and per-testament or per-book packs")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Record per-stage time, rows/sec and memory in <output>{BUILD_REPORT_SUFFIX}")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="With --profile, also record each stage's peak Python allocations (slow)")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="With --profile, also dump a cProfile .pstats file per stage next to the output (slow)")
     args = parser.parse_args()
+    skipped_indexes = set()
+    if args.index_plan:
+        try:
+            skipped_indexes = load_index_plan(args.index_plan)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: cannot use --index-plan: {e}")
+            sys.exit(1)
+    if args.token_storage == "compact" and args.layout == "clustered":
+        print("Error: --token-storage compact cannot be combined with --layout clustered")
+        sys.exit(1)
+    if args.shards and args.token_storage == "compact":
+        print("Error: --shards needs --token-storage table (compact tokens live behind a view)")
+        sys.exit(1)
+    if args.crossref_graph > 0 and not HAS_SCIPY:
+        print("Error: --crossref-graph needs numpy and scipy. Run: pip install numpy scipy")
+        sys.exit(1)
+
+    build_start = time.perf_counter()
+    report_path = args.output.with_suffix(BUILD_REPORT_SUFFIX)
+    profiler = BuildProfiler(
+        enabled=args.profile,
+        trace_memory=args.trace_memory,
+        pstats_prefix=args.output.with_suffix("") if args.cprofile else None,
+    )
+
+    total_steps = 3 + len(BUILD_STAGES)
 
     print("=" * 60)
     print("Bible Data Pipeline")
     print("=" * 60)
 
     # Step 1: Ensure source files
-    print("\n[1/7] Checking source files...")
-    if not ensure_cache_files(args.skip_download):
-        if not args.skip_download:
-            print("Error: Some source files could not be downloaded.")
-            print("Run with --skip-download if files are already cached.")
+    print(f"\n[1/{total_steps}] Checking source files...")
+    with profiler.stage("sources"):
+        if not ensure_cache_files(args.skip_download, args.refresh_sources):
+            if not args.skip_download:
+                print("Error: Some source files could not be downloaded.")
+                print("Run with --skip-download if files are already cached.")
+                sys.exit(1)
+
+        if args.pin_sources:
+            pin_source_checksums()
+        if not verify_pinned_checksums():
+            print("Error: Source files do not match pinned_sources.json.")
+            print("If the upstream data was deliberately refreshed, re-pin with --pin-sources.")
             sys.exit(1)
 
+        checksums = compute_source_checksums()
+    translation_ids = available_translations()
+    extra_tables = builder_tables(args)
+    options = {
+        "fts": {"profile": args.fts_profile},
+        "ordinals": {"enabled": "verse_ordinals" in extra_tables},
+        "crossrefs": {"layout": args.layout, "min_votes": args.min_votes, "low_votes": args.low_votes,
+                      "reverse": "crossref_reverse" in extra_tables},
+        "topk": {"limit": args.crossref_topk},
+        "graph": {"see_also": args.crossref_graph},
+        "morphology": {"skip": args.skip_morphology, "layout": args.layout, "storage": args.token_storage,
+                       "verse_tokens": args.verse_tokens},
+        "concordance": {"enabled": "strongs_concordance" in extra_tables},
+        "chapters": {"encoding": args.chapter_payloads},
+    }
+    fingerprints = {}
+    for name in BUILD_STAGES:
+        fingerprints[name] = stage_fingerprint(name, checksums, options, fingerprints)
+
+    # The whole database is rebuilt if the builder itself or the output location changed
+    builder_checksum = compute_file_checksum(Path(__file__))
+    manifest = load_build_manifest() if args.incremental else {}
+    reuse_output = (
+        args.incremental
+        and args.output.exists()
+        and manifest.get("builder") == builder_checksum
+        and manifest.get("output") == str(args.output.resolve())
+    )
+    previous_stages = manifest.get("stages", {}) if reuse_output else {}
+    if args.incremental and not reuse_output:
+        print("  No reusable build manifest; running a full build")
+    # Drop the manifest until this build completes, so a failed build is never reused
+    MANIFEST_PATH.unlink(missing_ok=True)
+
+    # The last build's size, so the summary shows what this one changed
+    previous_size = args.output.stat().st_size if args.output.exists() else None
+
     # Step 2: Create output database
-    print(f"\n[2/7] Creating database at {args.output}...")
+    print(f"\n[2/{total_steps}] {'Opening' if reuse_output else 'Creating'} database at {args.output}...")
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    if args.output.exists():
-        args.output.unlink()
+    # A stale report must not be mistaken for this build's
+    report_path.unlink(missing_ok=True)
+    with profiler.stage("open"):
+        if args.fast:
+            # The previous output stays in place until the finished build is renamed over it
+            conn = open_fast_build_database(args.output if reuse_output else None)
+        else:
+            if args.output.exists() and not reuse_output:
+                args.output.unlink()
 
-    conn = sqlite3.connect(args.output)
-    conn.execute("PRAGMA foreign_keys = ON")
-    conn.execute("PRAGMA journal_mode = WAL")
+            conn = sqlite3.connect(args.output)
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
 
     # Step 3: Create schema
-    print("\n[3/7] Creating schema (migrations v1-v16)...")
-    create_schema(conn)
-    # Note: Books are hardcoded in Book.swift, not stored in database
-    populate_translations(conn)
-
-    # Step 4: Import verses
-    print("\n[4/7] Importing KJV verses...")
-    verse_count = import_kjv_verses(conn)
-
-    # Step 5: Build FTS index
-    print("\n[5/7] Building full-text search index...")
-    rebuild_fts_index(conn)
-
-    # Step 6: Import cross-references
-    print("\n[6/7] Importing cross-references...")
-    crossref_count = import_cross_references(conn)
-
-    # Step 7: Import morphology (optional)
-    token_count = 0
-    if not args.skip_morphology:
-        print("\n[7/7] Importing morphology data...")
-        token_count = import_morphology(conn)
-    else:
-        print("\n[7/7] Skipping morphology (--skip-morphology)")
+    print(f"\n[3/{total_steps}] Creating schema (migrations v1-v16)...")
+    with profiler.stage("schema"):
+        create_tables(conn, extra_tables)
+        # Note: Books are hardcoded in Book.swift, not stored in database
+        populate_translations(conn, translation_ids)
+
+    crossref_stats = {}
+    runners = {
+        "verses": lambda: import_verses(conn, translation_ids, args.jobs),
+        "fts": lambda: rebuild_fts_index(conn, args.fts_profile),
+        "ordinals": lambda: build_verse_ordinals(conn) if "verse_ordinals" in extra_tables else 0,
+        "crossrefs": lambda: import_cross_references(conn, min_votes=args.min_votes, low_votes=args.low_votes,
+                                                     stats=crossref_stats,
+                                                     reverse="crossref_reverse" in extra_tables),
+        "morphology": lambda: 0 if args.skip_morphology else import_morphology(conn, args.jobs, args.verse_tokens),
+        "concordance": lambda: build_strongs_concordance(conn) if "strongs_concordance" in extra_tables else 0,
+        "topk": lambda: build_crossref_topk(conn, args.crossref_topk) if args.crossref_topk > 0 else 0,
+        "graph": lambda: build_crossref_graph(conn, args.crossref_graph) if args.crossref_graph > 0 else 0,
+        "chapters": lambda: 0 if args.chapter_payloads == "none" else build_chapter_payloads(conn, args.chapter_payloads),
+    }
+
+    # Steps 4+: Data stages, skipping those whose fingerprint matches the last build
+    stage_rows = {}
+    for step, (name, stage) in enumerate(BUILD_STAGES.items(), start=4):
+        previous = previous_stages.get(name, {})
+        if previous.get("fingerprint") == fingerprints[name]:
+            print(f"\n[{step}/{total_steps}] {stage['title']}... unchanged, skipping")
+            stage_rows[name] = previous.get("rows", 0)
+            continue
+
+        if name == "morphology" and args.skip_morphology:
+            print(f"\n[{step}/{total_steps}] Skipping morphology (--skip-morphology)")
+        elif name == "ordinals" and "verse_ordinals" not in extra_tables:
+            print(f"\n[{step}/{total_steps}] Skipping verse ordinals (see --crossref-reverse, --concordance)")
+        elif name == "concordance" and "strongs_concordance" not in extra_tables:
+            print(f"\n[{step}/{total_steps}] Skipping Strong's concordance (see --concordance)")
+        elif name == "topk" and args.crossref_topk <= 0:
+            print(f"\n[{step}/{total_steps}] Skipping cross-reference ranking (see --crossref-topk)")
+        elif name == "graph" and args.crossref_graph <= 0:
+            print(f"\n[{step}/{total_steps}] Skipping cross-reference graph (see --crossref-graph)")
+        elif name == "chapters" and args.chapter_payloads == "none":
+            print(f"\n[{step}/{total_steps}] Skipping chapter payloads (see --chapter-payloads)")
+        else:
+            print(f"\n[{step}/{total_steps}] {stage['title']}...")
+        with profiler.stage(name) as record:
+            drop_indexes(conn, stage["tables"])
+            for table in stage["tables"]:
+                if table in BUILDER_TABLES:
+                    # Recreated below only if this build's options still fill it
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                elif table == "language_tokens" and is_compacted(conn):
+                    # Reload into the plain table; compact_tokens converts it again
+                    drop_compact_tokens(conn)
+                elif is_clustered(conn, table):
+                    # Reload into the rowid form; cluster_tables converts it again
+                    conn.execute(f"DROP TABLE {table}")
+                else:
+                    conn.execute(f"DELETE FROM {table}")
+            create_tables(conn, extra_tables)
+            stage_rows[name] = record["rows"] = runners[name]()
+
+    if args.layout == "clustered":
+        print("\n[*] Clustering tables on their verse columns...")
+        with profiler.stage("cluster") as record:
+            rebuilt = cluster_tables(conn)
+        print(f"  Rebuilt {rebuilt} tables as WITHOUT ROWID in {record['seconds']:.2f}s")
+
+    if args.token_storage == "compact":
+        print("\n[*] Dictionary-encoding language tokens...")
+        with profiler.stage("compact_tokens") as record:
+            before = table_bytes(conn, ["language_tokens"])
+            record["rows"] = compact_tokens(conn)
+        if record["rows"]:
+            after = table_bytes(conn, ["language_tokens_compact"] + [t for t, _ in TOKEN_DICTIONARIES.values()])
+            sizes = f": {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB before indexes" if before else ""
+            print(f"  Moved {record['rows']:,} tokens to language_tokens_compact{sizes}")
+        else:
+            print("  Already compact")
+
+    # Secondary indexes are built once, after all rows are in
+    print("\n[*] Building indexes...")
+    with profiler.stage("indexes") as record:
+        layout_indexes = clustered_indexes() if args.layout == "clustered" else set()
+        index_count = create_indexes(conn, skip=skipped_indexes | layout_indexes)
+    index_seconds = record["seconds"]
+    print(f"  Created {index_count} indexes in {index_seconds:.2f}s")
+    if skipped_indexes:
+        print(f"  Skipped {len(skipped_indexes)} per {args.index_plan.name}: {', '.join(sorted(skipped_indexes))}")
+    if layout_indexes:
+        print(f"  Left out {', '.join(sorted(layout_indexes))} (--layout clustered: the table key replaces it)")
+
+    verse_count = stage_rows["verses"]
+    crossref_count = stage_rows["crossrefs"]
+    token_count = stage_rows["morphology"]
 
     # Record data sources
     print("\n[*] Recording data sources...")
-    record_data_sources(conn, verse_count, crossref_count, token_count)
+    with profiler.stage("data_sources"):
+        record_data_sources(conn, crossref_count, token_count, checksums)
 
     # Optimize
     print("\n[*] Optimizing database...")
-    conn.execute("VACUUM")
-    conn.execute("ANALYZE")
+    if args.fast:
+        with profiler.stage("analyze"):
+            conn.execute("ANALYZE")
+        # VACUUM INTO is the --fast build's VACUUM
+        with profiler.stage("write"):
+            write_database_atomically(conn, args.output)
+    else:
+        with profiler.stage("vacuum"):
+            conn.execute("VACUUM")
+        with profiler.stage("analyze"):
+            conn.execute("ANALYZE")
+
+    # Measured size of the pruned cross-reference tables, indexes included
+    crossref_bytes = table_bytes(conn, CROSSREF_TABLES) if crossref_stats else None
 
     conn.close()
 
+    page_layout = None
+    if args.page_layout_search:
+        print("\n[*] Searching page sizes and layouts...")
+        with profiler.stage("page_layout"):
+            page_layout = search_page_layouts(args.output, args.page_sizes)
+
+    shard_manifest = None
+    if args.shards:
+        print(f"\n[*] Writing {args.shards} shard packs...")
+        with profiler.stage("shards"):
+            shard_manifest = write_shard_packs(args.output, args.shards)
+        for pack in shard_manifest["packs"]:
+            print(f"  {pack['file']:<28} {pack['size_bytes'] / 1e6:7.1f} MB  "
+                  f"{sum(pack['rows'][table] for table in SHARDED_TABLES if table in pack['rows']):>9,} sharded rows")
+
+    save_build_manifest({
+        "builder": builder_checksum,
+        "output": str(args.output.resolve()),
+        "built_at": datetime.utcnow().isoformat(),
+        "sources": {key: {"filename": SOURCES[key]["filename"], "checksum": checksum}
+                    for key, checksum in checksums.items()},
+        "stages": {name: {"fingerprint": fingerprints[name], "rows": stage_rows[name]}
+                   for name in BUILD_STAGES},
+    })
+
     # Report
     file_size = args.output.stat().st_size / (1024 * 1024)
     print("\n" + "=" * 60)
     print("BUILD COMPLETE")
     print("=" * 60)
     print(f"  Output: {args.output}")
-    print(f"  Size: {file_size:.2f} MB")
-    print(f"  Verses: {verse_count:,}")
+    print(f"  Size: {file_size:.2f} MB" + (f" (previous build {previous_size / (1024 * 1024):.2f} MB, "
+                                          f"{args.output.stat().st_size - previous_size:+,} bytes)"
+                                          if previous_size is not None else ""))
+    print(f"  Verses: {verse_count:,} ({', '.join(t.upper() for t in translation_ids)})")
     print(f"  Cross-references: {crossref_count:,}")
+    if crossref_stats:
+        print(f"    removed {crossref_stats['duplicates']:,} duplicates, {crossref_stats['low_votes']:,} "
+              f"below --min-votes {args.min_votes} ({'dropped' if args.low_votes == 'drop' else 'down-ranked'})"
+              + (f"; tables and indexes now {crossref_bytes / 1024:,.0f} KB" if crossref_bytes is not None else ""))
     print(f"  Language tokens: {token_count:,}")
+    print(f"  Index build: {index_seconds:.2f}s ({index_count} indexes)")
+    build_seconds = time.perf_counter() - build_start
+    print(f"  Build time: {build_seconds:.1f}s{' (--fast)' if args.fast else ''}")
+    rerun = [name for name in BUILD_STAGES if previous_stages.get(name, {}).get("fingerprint") != fingerprints[name]]
+    if reuse_output:
+        print(f"  Re-run stages: {', '.join(rerun) if rerun else 'none'}")
+    if args.profile:
+        profiler.print_summary()
+        profiler.write_report(report_path, {
+            "output": str(args.output.resolve()),
+            "built_at": datetime.utcnow().isoformat(),
+            "builder": builder_checksum,
+            "options": {"fast": args.fast, "incremental": args.incremental, "jobs": args.jobs,
+                        "fts_profile": args.fts_profile, "chapter_payloads": args.chapter_payloads,
+                        "layout": args.layout, "crossref_topk": args.crossref_topk,
+                        "crossref_graph": args.crossref_graph, "crossref_reverse": args.crossref_reverse,
+                        "token_storage": args.token_storage,
+                        "verse_tokens": args.verse_tokens, "concordance": args.concordance,
+                        "index_plan": sorted(skipped_indexes),
+                        "skip_morphology": args.skip_morphology,
+                        "min_votes": args.min_votes, "low_votes": args.low_votes,
+                        "trace_memory": args.trace_memory, "cprofile": args.cprofile},
+            "sources": checksums,
+            "rerun_stages": rerun,
+            "total_seconds": round(build_seconds, 3),
+            "size_bytes": args.output.stat().st_size,
+            "previous_size_bytes": previous_size,
+            "translations": translation_ids,
+            "rows": stage_rows,
+            "crossref_pruning": {**crossref_stats, "bytes": crossref_bytes} if crossref_stats else None,
+            "page_layout": page_layout,
+            "shards": [{key: pack[key] for key in ("name", "size_bytes", "rows")}
+                       for pack in shard_manifest["packs"]] if shard_manifest else None,
+        })
+        print(f"  Profile report: {report_path}")
     print("\nNext steps:")
     print("  1. Copy BibleData.sqlite to Xcode project")
     print("  2. Add to target as resource bundle")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+BibleData.sqlite Index Advisor
+==============================
+Replays the app's queries (app_workload.WORKLOAD) against a built database,
+records each query's plan and latency, and proposes dropping the builder's
+indexes that no query uses. The proposal is an index plan JSON that
+`build_bible_database.py --index-plan PATH` applies.
+
+Usage:
+    python index_advisor.py [--database PATH] [--samples N] [--output PATH]
+
+The database is copied into memory first, so the built file is never modified.
+An index is proposed for dropping when it is one of SCHEMA_INDEXES and either
+  - no workload query's plan uses it and its table has rows in the bundle
+    (tables that ship empty are written by the app on device, so their
+    indexes serve queries the workload does not cover), or
+  - its columns are a prefix of another index on the same table, which
+    serves every lookup it could. An index the app's migrations create is
+    never dropped for one only the builder creates (BUILDER_INDEXES), which
+    the app does not know about.
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import app_workload
+import build_bible_database as builder
+
+# Untracked (see .gitignore): a plan only changes a build through --index-plan
+DEFAULT_PLAN = builder.CACHE_DIR / "index_plan.json"
+
+PLAN_INDEX_RE = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, arguments: dict) -> list:
+    """EXPLAIN QUERY PLAN detail lines for one query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", arguments)]
+
+
+def full_scans(plan: list) -> list:
+    """Plan steps reading a whole table or index (FTS5 virtual table steps are searches)."""
+    return [detail for detail in plan if detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail]
+
+
+def run_workload(connections: list, samples: dict) -> list:
+    """
+    Plan, indexes used and p50/p99 latency (us) of each WORKLOAD query over its
+    samples, per connection. Connections are timed in turn on each sample, so
+    clock and cache drift hits them alike.
+    """
+    results = [{} for _ in connections]
+    for name, query in app_workload.WORKLOAD.items():
+        arguments = samples[name]
+        if not arguments:
+            continue
+        latencies = [[] for _ in connections]
+        for values in arguments:
+            for conn, timings in zip(connections, latencies):
+                start = time.perf_counter()
+                conn.execute(query["sql"], values).fetchall()
+                timings.append((time.perf_counter() - start) * 1e6)
+        for conn, result, timings in zip(connections, results, latencies):
+            plan = query_plan(conn, query["sql"], arguments[0])
+            result[name] = {
+                "source": query["source"],
+                "plan": plan,
+                "indexes": sorted({index for detail in plan for index in PLAN_INDEX_RE.findall(detail)}),
+                "full_scans": full_scans(plan),
+                "p50_us": round(statistics.median(timings), 1),
+                "p99_us": round(statistics.quantiles(timings, n=100)[98], 1) if len(timings) > 1 else None,
+            }
+    return results
+
+
+def index_columns(conn: sqlite3.Connection) -> dict:
+    """Every index (including UNIQUE constraint autoindexes): name -> (table, [columns], unique)."""
+    indexes = {}
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        for _, name, unique, _, _ in conn.execute(f"PRAGMA index_list('{table}')"):
+            columns = [row[2] for row in conn.execute(f"PRAGMA index_info('{name}')")]
+            indexes[name] = (table, columns, bool(unique))
+    return indexes
+
+
+def index_bytes(conn: sqlite3.Connection, name: str) -> int:
+    return conn.execute("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = ?", (name,)).fetchone()[0]
+
+
+def advise(conn: sqlite3.Connection, workload: dict) -> tuple:
+    """Split the builder's indexes into (drop, keep) lists of dicts, each with a reason."""
+    indexes = index_columns(conn)
+    used_by = {}
+    for query_name, result in workload.items():
+        for index in result["indexes"]:
+            used_by.setdefault(index, []).append(query_name)
+
+    builder_indexes = [(name, table) for name, table, _ in builder.SCHEMA_INDEXES if name in indexes]
+    unused = {name for name, table in builder_indexes
+              if name not in used_by and not indexes[name][2]
+              and conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None}
+
+    drop, keep = [], []
+    for name, table in builder_indexes:
+        _, columns, unique = indexes[name]
+        entry = {"name": name, "table": table, "columns": columns, "bytes": index_bytes(conn, name)}
+        # A longer (or UNIQUE) index starting with the same columns, and not itself dropped
+        wider = [other for other, (other_table, other_columns, other_unique) in indexes.items()
+                 if other != name and other not in unused and other_table == table
+                 and other_columns[:len(columns)] == columns
+                 and (len(other_columns) > len(columns) or other_unique)
+                 and (name in builder.BUILDER_INDEXES or other not in builder.BUILDER_INDEXES)]
+
+        if unique:
+            keep.append({**entry, "reason": "UNIQUE: the import relies on it"})
+        elif wider:
+            drop.append({**entry, "reason": f"columns are a prefix of {wider[0]}"})
+        elif name in unused:
+            drop.append({**entry, "reason": "no workload query uses it"})
+        elif name in used_by:
+            keep.append({**entry, "reason": "used by " + ", ".join(used_by[name])})
+        else:
+            keep.append({**entry, "reason": "table ships empty and is written on device"})
+    return drop, keep
+
+
+def print_workload(workload: dict, after: dict = None):
+    for name, result in workload.items():
+        line = f"  {name:<20} p50 {result['p50_us']:9.1f}us"
+        if after and name in after:
+            line += f" -> {after[name]['p50_us']:9.1f}us"
+        line += f"  {', '.join(result['indexes']) or '-'}"
+        print(line)
+        for detail in result["full_scans"]:
+            print(f"  {'':<20} full scan: {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose a pruned index set for BibleData.sqlite")
+    parser.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT, help="Built database")
+    parser.add_argument("--samples", type=int, default=200, help="Argument sets replayed per query")
+    parser.add_argument("--output", type=Path, default=DEFAULT_PLAN, help="Index plan to write")
+    args = parser.parse_args()
+
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    source = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    conn = sqlite3.connect(":memory:")
+    source.backup(conn)
+    try:
+        conn.execute("SELECT 1 FROM dbstat LIMIT 1")
+    except sqlite3.OperationalError:
+        print("Error: this SQLite was built without the dbstat virtual table.")
+        sys.exit(1)
+
+    samples = app_workload.sample_arguments(conn, args.samples)
+    print(f"Replaying {len(app_workload.WORKLOAD)} app queries x {args.samples} against {args.database.name}")
+    before, = run_workload([conn], samples)
+    drop, keep = advise(conn, before)
+
+    print("\nKeep:")
+    for entry in keep:
+        print(f"  {entry['name']:<36} {entry['bytes'] / 1024:9,.0f} KB  {entry['reason']}")
+    print("\nDrop:")
+    for entry in drop:
+        print(f"  {entry['name']:<36} {entry['bytes'] / 1024:9,.0f} KB  {entry['reason']}")
+
+    # Time the original against a second copy with the pruned set
+    pruned = sqlite3.connect(":memory:")
+    source.backup(pruned)
+    source.close()
+    for entry in drop:
+        pruned.execute(f"DROP INDEX {entry['name']}")
+    before, after = run_workload([conn, pruned], samples)
+    regressions = [name for name in after if len(after[name]["full_scans"]) > len(before[name]["full_scans"])]
+    bytes_saved = sum(entry["bytes"] for entry in drop)
+
+    print("\nQueries (p50 before -> after, indexes used before):")
+    print_workload(before, after)
+    print(f"\nBytes saved: {bytes_saved:,} ({bytes_saved / 1e6:.1f} MB)")
+    if regressions:
+        print(f"Warning: the pruned set adds full scans to {', '.join(regressions)}")
+
+    plan = {
+        "database": str(args.database),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "samples": args.samples,
+        "drop": drop,
+        "keep": keep,
+        "bytes_saved": bytes_saved,
+        "regressions": regressions,
+        "queries": {
+            name: {**result, "p50_us_after": after[name]["p50_us"], "p99_us_after": after[name]["p99_us"]}
+            for name, result in before.items()
+        },
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(plan, f, indent=2)
+    print(f"Wrote {args.output} (build with --index-plan {args.output})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+BibleData.sqlite Release Packaging
+==================================
+Packages a built database as a zstd-compressed release artifact, plus a
+page-level delta patch from the previous release, so a data refresh ships (or
+downloads over the air) only the pages that changed.
+
+Usage:
+    python package_release.py package [--database PATH] [--releases DIR] [--previous ID] [--level N]
+    python package_release.py apply --base OLD.sqlite --patch PATCH --output NEW.sqlite
+    python package_release.py verify [--releases DIR] [--release ID]
+
+Each release is keyed by the SHA-256 of its database and recorded in
+releases/<stem>-<id>.json with the build manifest it came from (source
+checksums and stage fingerprints, see build_bible_database.py --incremental),
+so the release notes can say which stages changed. releases/index.json lists
+the releases in order.
+
+Patch format (one zstd frame):
+    header: PATCH_HEADER (magic, page size, base/target sizes and SHA-256s)
+    runs:   RUN_HEADER (kind, base page, page count), then for RUN_LITERAL the
+            pages' bytes; RUN_COPY copies `count` pages starting at `base page`
+Target pages are matched against base pages by content, not position, so a
+table that grew by a page only costs the pages around it: the B-tree leaves
+after it are copied from their old positions.
+"""
+
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import build_bible_database as builder
+
+# Optional import: zstd for artifacts and patches
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_RELEASES_DIR = SCRIPT_DIR / "releases"
+RELEASE_INDEX = "index.json"
+# Artifacts are built rarely and downloaded often, so compress hard by default
+DEFAULT_ZSTD_LEVEL = 19
+
+PATCH_MAGIC = b"BDPATCH1"
+PATCH_HEADER = struct.Struct("<8sIQQ32s32s")
+RUN_HEADER = struct.Struct("<BII")
+RUN_COPY = 0
+RUN_LITERAL = 1
+
+
+def sqlite_page_size(data: bytes) -> int:
+    """Page size from a SQLite file header (bytes 16-17; 1 means 65536)."""
+    if not data.startswith(b"SQLite format 3\x00"):
+        raise ValueError("not a SQLite database")
+    size = int.from_bytes(data[16:18], "big")
+    return 65536 if size == 1 else size
+
+
+def make_patch(base: bytes, target: bytes) -> tuple:
+    """
+    Page-level delta turning `base` into `target`, paged at the target's page
+    size. Returns (patch bytes, pages copied, pages stored literally).
+    """
+    page_size = sqlite_page_size(target)
+    base_pages = {}
+    for number in range((len(base) + page_size - 1) // page_size):
+        page = base[number * page_size:(number + 1) * page_size]
+        base_pages.setdefault(hashlib.blake2b(page, digest_size=16).digest(), number)
+
+    runs = []  # [kind, base page, count, pages]
+    copied = literal = 0
+    for number in range((len(target) + page_size - 1) // page_size):
+        page = target[number * page_size:(number + 1) * page_size]
+        # Prefer the page in the same position, then any page with the same bytes
+        if base[number * page_size:(number + 1) * page_size] == page:
+            source = number
+        else:
+            source = base_pages.get(hashlib.blake2b(page, digest_size=16).digest())
+            if source is not None and base[source * page_size:(source + 1) * page_size] != page:
+                source = None
+
+        if source is not None:
+            copied += 1
+            if runs and runs[-1][0] == RUN_COPY and runs[-1][1] + runs[-1][2] == source:
+                runs[-1][2] += 1
+            else:
+                runs.append([RUN_COPY, source, 1, None])
+        else:
+            literal += 1
+            if runs and runs[-1][0] == RUN_LITERAL:
+                runs[-1][2] += 1
+                runs[-1][3].append(page)
+            else:
+                runs.append([RUN_LITERAL, 0, 1, [page]])
+
+    parts = [PATCH_HEADER.pack(PATCH_MAGIC, page_size, len(base), len(target),
+                               hashlib.sha256(base).digest(), hashlib.sha256(target).digest())]
+    for kind, source, count, pages in runs:
+        parts.append(RUN_HEADER.pack(kind, source, count))
+        if kind == RUN_LITERAL:
+            parts.extend(pages)
+    return b"".join(parts), copied, literal
+
+
+def apply_patch(base: bytes, patch: bytes) -> bytes:
+    """Rebuild the target of a make_patch patch from `base`. Raises ValueError on any mismatch."""
+    magic, page_size, base_size, target_size, base_sha256, target_sha256 = PATCH_HEADER.unpack_from(patch)
+    if magic != PATCH_MAGIC:
+        raise ValueError("not a BibleData patch")
+    if len(base) != base_size or hashlib.sha256(base).digest() != base_sha256:
+        raise ValueError("the base database is not the one this patch was made from")
+
+    target = bytearray()
+    offset = PATCH_HEADER.size
+    while offset < len(patch):
+        kind, source, count = RUN_HEADER.unpack_from(patch, offset)
+        offset += RUN_HEADER.size
+        if kind == RUN_COPY:
+            target += base[source * page_size:(source + count) * page_size]
+        elif kind == RUN_LITERAL:
+            # Only the file's last page can be short
+            length = min(count * page_size, target_size - len(target))
+            target += patch[offset:offset + length]
+            offset += length
+        else:
+            raise ValueError(f"unknown run kind {kind} at byte {offset}")
+
+    if len(target) != target_size or hashlib.sha256(target).digest() != target_sha256:
+        raise ValueError("the patched database does not match the patch's target checksum")
+    return bytes(target)
+
+
+def compress(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level, threads=-1).compress(data)
+
+
+def decompress(path: Path) -> bytes:
+    return zstandard.ZstdDecompressor().decompressobj().decompress(path.read_bytes())
+
+
+def load_index(releases: Path, stem: str = None) -> dict:
+    """releases/index.json: the database stem and release ids, oldest first."""
+    path = releases / RELEASE_INDEX
+    if not path.exists():
+        return {"stem": stem, "releases": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_release(releases: Path, stem: str, release_id: str) -> dict:
+    with open(releases / f"{stem}-{release_id}.json") as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: dict):
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
+
+
+def changed_stages(previous: dict, current: dict) -> list:
+    """Stages whose fingerprint differs between two releases' build manifests."""
+    before = (previous.get("build") or {}).get("stages", {})
+    after = (current.get("build") or {}).get("stages", {})
+    return [name for name in after if before.get(name, {}).get("fingerprint") != after[name].get("fingerprint")]
+
+
+def package(args):
+    """Write the artifact, the patch from the previous release and the release manifest."""
+    if not args.database.exists():
+        print(f"Error: {args.database} not found. Run build_bible_database.py first.")
+        sys.exit(1)
+    args.releases.mkdir(parents=True, exist_ok=True)
+    stem = args.database.stem
+    data = args.database.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    release_id = digest[:12]
+    index = load_index(args.releases, stem)
+    if index["stem"] != stem:
+        print(f"Error: {args.releases} holds {index['stem']} releases, not {stem}")
+        sys.exit(1)
+    if release_id in index["releases"]:
+        print(f"Release {release_id} already packaged; nothing to do")
+        return
+
+    # Load the base release before writing anything, so a bad --previous leaves no orphaned files
+    previous_id = args.previous or (index["releases"][-1] if index["releases"] else None)
+    previous = base = None
+    if previous_id:
+        if previous_id not in index["releases"]:
+            print(f"Error: release {previous_id} is not in {args.releases / RELEASE_INDEX}")
+            sys.exit(1)
+        try:
+            previous = load_release(args.releases, stem, previous_id)
+            base = decompress(args.releases / previous["artifact"]["file"])
+        except (OSError, ValueError, zstandard.ZstdError) as e:
+            print(f"Error: cannot load previous release {previous_id}: {e}")
+            sys.exit(1)
+
+    # The build manifest describes this file only if the last build wrote it
+    manifest = builder.load_build_manifest()
+    build = manifest if manifest.get("output") == str(args.database.resolve()) else None
+    if build is None:
+        print("  Warning: the build manifest is for another output; the release will not record it")
+
+    print(f"Packaging {args.database.name} ({len(data) / 1e6:.1f} MB) as release {release_id}")
+    start = time.perf_counter()
+    artifact = args.releases / f"{stem}-{release_id}.sqlite.zst"
+    artifact.write_bytes(compress(data, args.level))
+    print(f"  {artifact.name}: {artifact.stat().st_size / 1e6:.1f} MB "
+          f"(zstd -{args.level}, {time.perf_counter() - start:.1f}s)")
+
+    release = {
+        "id": release_id,
+        "database": args.database.name,
+        "sha256": digest,
+        "size_bytes": len(data),
+        "page_size": sqlite_page_size(data),
+        "artifact": {"file": artifact.name, "sha256": builder.compute_file_checksum(artifact, "sha256"),
+                     "size_bytes": artifact.stat().st_size, "zstd_level": args.level},
+        "packaged_at": datetime.now().isoformat(timespec="seconds"),
+        "build": build,
+        "previous": None,
+        "patch": None,
+    }
+
+    if previous_id:
+        start = time.perf_counter()
+        patch, copied, literal = make_patch(base, data)
+        if apply_patch(base, patch) != data:
+            raise RuntimeError("patch does not reproduce the database")
+        patch_path = args.releases / f"{stem}-{previous_id}-to-{release_id}.patch.zst"
+        patch_path.write_bytes(compress(patch, args.level))
+        release["previous"] = previous_id
+        release["patch"] = {"file": patch_path.name, "sha256": builder.compute_file_checksum(patch_path, "sha256"),
+                            "size_bytes": patch_path.stat().st_size,
+                            "pages_copied": copied, "pages_literal": literal,
+                            "changed_stages": changed_stages(previous, release)}
+        print(f"  {patch_path.name}: {patch_path.stat().st_size / 1e6:.2f} MB, "
+              f"{literal:,} of {copied + literal:,} pages new ({time.perf_counter() - start:.1f}s)")
+        if release["patch"]["changed_stages"]:
+            print(f"  Changed stages: {', '.join(release['patch']['changed_stages'])}")
+
+    write_json(args.releases / f"{stem}-{release_id}.json", release)
+    index["releases"].append(release_id)
+    index["latest"] = release_id
+    write_json(args.releases / RELEASE_INDEX, index)
+    print(f"  Wrote {stem}-{release_id}.json")
+
+
+def apply(args):
+    """Patch a database from the previous release into the new one."""
+    try:
+        target = apply_patch(args.base.read_bytes(), decompress(args.patch))
+    except (OSError, ValueError, zstandard.ZstdError, struct.error) as e:
+        print(f"Error: cannot apply {args.patch.name}: {e}")
+        sys.exit(1)
+    tmp_path = args.output.with_name(args.output.name + ".tmp")
+    tmp_path.write_bytes(target)
+    tmp_path.replace(args.output)
+    print(f"Wrote {args.output} ({len(target) / 1e6:.1f} MB, sha256 {hashlib.sha256(target).hexdigest()[:12]})")
+
+
+def verify(args):
+    """Check a release's artifact, and that its patch rebuilds it byte-for-byte from the previous release."""
+    index = load_index(args.releases)
+    release_id = args.release or index.get("latest")
+    if not release_id:
+        print(f"Error: no releases in {args.releases}")
+        sys.exit(1)
+    stem = index["stem"]
+    try:
+        release = load_release(args.releases, stem, release_id)
+    except OSError as e:
+        print(f"Error: cannot read release {release_id}: {e}")
+        sys.exit(1)
+    failures = []
+
+    # Each artifact is checked on its own, so one missing file does not hide the others' results
+    artifact_path = args.releases / release["artifact"]["file"]
+    try:
+        checksum = builder.compute_file_checksum(artifact_path, "sha256")
+        data = decompress(artifact_path)
+    except (OSError, zstandard.ZstdError) as e:
+        failures.append(f"{artifact_path.name}: {e}")
+    else:
+        if checksum != release["artifact"]["sha256"]:
+            failures.append(f"{artifact_path.name} checksum mismatch")
+        if hashlib.sha256(data).hexdigest() != release["sha256"]:
+            failures.append(f"{artifact_path.name} does not decompress to database {release['sha256'][:12]}")
+        else:
+            print(f"  {artifact_path.name}: decompresses to {release['database']} ({len(data):,} bytes)")
+
+    if release["patch"]:
+        patch_path = args.releases / release["patch"]["file"]
+        try:
+            previous = load_release(args.releases, stem, release["previous"])
+            base = decompress(args.releases / previous["artifact"]["file"])
+            patched = apply_patch(base, decompress(patch_path))
+        except (OSError, ValueError, zstandard.ZstdError, struct.error) as e:
+            failures.append(f"{patch_path.name}: {e}")
+        else:
+            if hashlib.sha256(patched).hexdigest() != release["sha256"]:
+                failures.append(f"{patch_path.name} does not reproduce release {release_id}")
+            else:
+                print(f"  {patch_path.name}: {release['previous']} + patch == {release_id}, byte for byte")
+
+    if failures:
+        for failure in failures:
+            print(f"  FAIL: {failure}")
+        sys.exit(1)
+    print(f"Release {release_id} verified")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Package BibleData.sqlite releases and delta patches")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    package_cmd = subparsers.add_parser("package", help="Compress a build and diff it against the last release")
+    package_cmd.add_argument("--database", type=Path, default=builder.DEFAULT_OUTPUT, help="Built database")
+    package_cmd.add_argument("--releases", type=Path, default=DEFAULT_RELEASES_DIR, help="Release directory")
+    package_cmd.add_argument("--previous", metavar="ID", help="Release to diff against (default: the latest)")
+    package_cmd.add_argument("--level", type=int, default=DEFAULT_ZSTD_LEVEL,
+                             help=f"zstd level (default: {DEFAULT_ZSTD_LEVEL})")
+    package_cmd.set_defaults(func=package)
+
+    apply_cmd = subparsers.add_parser("apply", help="Rebuild a release from the previous one and its patch")
+    apply_cmd.add_argument("--base", type=Path, required=True, help="Previous release's database")
+    apply_cmd.add_argument("--patch", type=Path, required=True, help="Patch (.patch.zst)")
+    apply_cmd.add_argument("--output", type=Path, required=True, help="Patched database to write")
+    apply_cmd.set_defaults(func=apply)
+
+    verify_cmd = subparsers.add_parser("verify", help="Check a release's artifact and patch")
+    verify_cmd.add_argument("--releases", type=Path, default=DEFAULT_RELEASES_DIR, help="Release directory")
+    verify_cmd.add_argument("--release", metavar="ID", help="Release to check (default: the latest)")
+    verify_cmd.set_defaults(func=verify)
+
+    args = parser.parse_args()
+    if not HAS_ZSTD:
+        print("Error: package_release.py needs zstandard. Run: pip install zstandard")
+        sys.exit(1)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""benchmark_database.compare and settings_mismatch on hand-written results."""
+
+import benchmark_database as bench
+
+SETTINGS = {"iterations": 5000, "warmup": 200, "seed": 0, "mmap_size": 0, "cache_kib": 2000}
+
+
+def query(count, p50, p95, p99):
+    return {"count": count, "p50_us": p50, "p95_us": p95, "p99_us": p99}
+
+
+def test_tail_noise_on_few_samples_is_not_a_regression():
+    baseline = {"queries": {"translations": query(40, 50.0, 70.0, 82.0)}}
+    results = {"translations": query(40, 51.0, 150.0, 179.0)}
+    assert bench.compare(results, baseline, 0.20, 5.0) == []
+
+
+def test_p50_regression_is_reported():
+    baseline = {"queries": {"chapter": query(40, 100.0, 150.0, 200.0)}}
+    results = {"chapter": query(40, 200.0, 150.0, 200.0)}
+    assert bench.compare(results, baseline, 0.20, 5.0) == [("chapter", "p50_us", 100.0, 200.0)]
+
+
+def test_tails_are_compared_with_enough_samples():
+    count = bench.MIN_TAIL_SAMPLES
+    baseline = {"queries": {"chapter": query(count, 100.0, 150.0, 200.0)}}
+    results = {"chapter": query(count, 100.0, 150.0, 400.0)}
+    assert bench.compare(results, baseline, 0.20, 5.0) == [("chapter", "p99_us", 200.0, 400.0)]
+
+
+def test_queries_below_the_sample_floor_are_not_compared():
+    baseline = {"queries": {"lemma": query(bench.MIN_COMPARED_SAMPLES - 1, 10.0, 10.0, 10.0)}}
+    results = {"lemma": query(bench.MIN_COMPARED_SAMPLES - 1, 100.0, 100.0, 100.0)}
+    assert bench.compare(results, baseline, 0.20, 5.0) == []
+
+
+def test_any_settings_difference_is_reported():
+    baseline = {"settings": {**SETTINGS, "cache_kib": 8000}}
+    assert bench.settings_mismatch(SETTINGS, {"settings": SETTINGS}) == []
+    assert bench.settings_mismatch(SETTINGS, baseline) == [("cache_kib", 8000, 2000)]
@@ -0,0 +1,61 @@
+"""Build manifest round trip and stage fingerprints (--incremental)."""
+
+import build_bible_database as builder
+
+CHECKSUMS = {key: f"md5-of-{key}" for key in builder.SOURCES}
+
+
+def fingerprints(checksums: dict = CHECKSUMS, options: dict = None) -> dict:
+    """Every stage's fingerprint, computed in BUILD_STAGES order as main() does."""
+    result = {}
+    for name in builder.BUILD_STAGES:
+        result[name] = builder.stage_fingerprint(name, checksums, options or {}, result)
+    return result
+
+
+def test_combined_checksum_is_md5_of_sorted_json():
+    # md5(b"[]"); key order never changes the checksum
+    assert builder.combined_checksum([]) == "d751713988987e9331980363e24189ce"
+    assert builder.combined_checksum({"b": 2, "a": 1}) == builder.combined_checksum({"a": 1, "b": 2})
+
+
+def test_fingerprints_are_stable():
+    assert fingerprints() == fingerprints()
+
+
+def test_changed_source_reruns_only_its_stages_and_downstream():
+    before = fingerprints()
+    after = fingerprints({**CHECKSUMS, "crossrefs": "md5-of-new-crossrefs"})
+    changed = {name for name in before if before[name] != after[name]}
+    # topk and graph read cross_references; chapters reads them for its counts
+    assert changed == {"crossrefs", "topk", "graph", "chapters"}
+
+
+def test_changed_verses_reruns_everything_downstream_of_ordinals():
+    before = fingerprints()
+    after = fingerprints({**CHECKSUMS, "kjv_sqlite": "md5-of-new-kjv"})
+    changed = {name for name in before if before[name] != after[name]}
+    assert changed == {"verses", "fts", "ordinals", "crossrefs", "concordance", "topk", "graph", "chapters"}
+
+
+def test_changed_option_reruns_its_stage():
+    before = fingerprints()
+    after = fingerprints(options={"fts": {"profile": "prefix"}})
+    changed = {name for name in before if before[name] != after[name]}
+    assert changed == {"fts"}
+
+
+def test_manifest_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(builder, "MANIFEST_PATH", tmp_path / "cache" / "build_manifest.json")
+    assert builder.load_build_manifest() == {}
+
+    manifest = {"builder": "abc", "stages": {"verses": {"fingerprint": "f1", "rows": 31102}}}
+    builder.save_build_manifest(manifest)
+    assert builder.load_build_manifest() == manifest
+    assert not builder.MANIFEST_PATH.with_suffix(".tmp").exists()
+
+
+def test_unreadable_manifest_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(builder, "MANIFEST_PATH", tmp_path / "build_manifest.json")
+    builder.MANIFEST_PATH.write_text("{not json")
+    assert builder.load_build_manifest() == {}
@@ -0,0 +1,29 @@
+"""cluster_tables on a small language_tokens table."""
+
+import sqlite3
+
+import build_bible_database as builder
+
+TOKEN_VERSE_SQL = ("SELECT * FROM language_tokens WHERE book_id = ? AND chapter = ? AND verse = ? "
+                   "ORDER BY position")
+
+
+def test_tokens_are_clustered_on_the_app_lookup():
+    conn = sqlite3.connect(":memory:")
+    builder.create_tables(conn)
+    # Inserted out of verse order
+    conn.executemany(builder.TOKEN_INSERT_SQL, [
+        (1, 1, 2, 1, "c", None, None, None, None, "hebrew"),
+        (1, 1, 1, 2, "b", None, None, None, None, "hebrew"),
+        (1, 1, 1, 1, "a", None, None, None, None, "hebrew"),
+    ])
+    builder.create_indexes(conn, ["language_tokens"])
+    assert builder.cluster_tables(conn) == 1
+    builder.create_indexes(conn, ["language_tokens"], skip=builder.clustered_indexes())
+
+    assert builder.is_clustered(conn, "language_tokens")
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list('language_tokens')")}
+    assert "idx_tokens_verse" not in indexes and "idx_tokens_lemma" in indexes
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {TOKEN_VERSE_SQL}", (1, 1, 1))]
+    assert plan == ["SEARCH language_tokens USING PRIMARY KEY (book_id=? AND chapter=? AND verse=?)"]
+    assert [(row[0], row[5]) for row in conn.execute(TOKEN_VERSE_SQL, (1, 1, 1))] == [(3, "a"), (2, "b")]
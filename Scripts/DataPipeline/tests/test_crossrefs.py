@@ -0,0 +1,106 @@
+"""Cross-reference parsing, duplicate removal and pruning on hand-written OpenBible lines."""
+
+import sqlite3
+
+import pytest
+
+import build_bible_database as builder
+
+# Genesis 1 (31 verses), Genesis 2 (25) and Genesis 3 (24), numbered as verse_ordinals would
+VERSE_KEYS = ([(1, 1, v) for v in range(1, 32)] + [(1, 2, v) for v in range(1, 26)]
+              + [(1, 3, v) for v in range(1, 25)])
+HEADER = "From Verse\tTo Verse\tVotes\t#www.openbible.info CC-BY 2012-01-01"
+
+
+def import_rows(*lines, **options):
+    stats = {"skipped": 0, "multi_chapter": 0, "duplicates": 0, "low_votes": 0}
+    rows = list(builder.iter_cross_reference_rows([HEADER, *lines], stats, VERSE_KEYS, **options))
+    return rows, stats
+
+
+def test_single_verse_reference():
+    rows, stats = import_rows("Gen.1.1\tGen.2.4\t51")
+    assert rows == [(1, 1, 1, 1, 1, 2, 4, 4, builder.vote_weight(51), "openbible")]
+    rows, stats = import_rows("Gen.1.1\tGen.2.4\t51", ordinals=True)
+    assert rows == [(1, 1, 1, 1, 1, 2, 4, 4, builder.vote_weight(51), "openbible", 1, 1, 35, 35)]
+    assert stats == {"skipped": 0, "multi_chapter": 0, "duplicates": 0, "low_votes": 0}
+
+
+def test_cross_chapter_target_is_truncated_but_keeps_its_ordinals():
+    rows, stats = import_rows("Gen.1.1\tGen.1.31-Gen.2.3\t10", ordinals=True)
+    assert rows[0][4:8] == (1, 1, 31, 31)
+    assert rows[0][12:] == (31, 34)
+    assert stats["multi_chapter"] == 1
+
+
+def test_exact_repeat_is_a_duplicate():
+    rows, stats = import_rows("Gen.1.1\tGen.2.4\t51", "Gen.1.1\tGen.2.4\t3")
+    assert len(rows) == 1
+    assert rows[0][8] == builder.vote_weight(51)
+    assert stats["duplicates"] == 1
+
+
+def test_targets_that_differ_only_in_end_chapter_are_both_kept():
+    rows, stats = import_rows("Gen.1.1\tGen.1.31-Gen.2.3\t10", "Gen.1.1\tGen.1.31-Gen.3.3\t10", ordinals=True)
+    assert [row[12:] for row in rows] == [(31, 34), (31, 59)]
+    assert stats["duplicates"] == 0
+
+
+def test_crossref_key_uses_the_full_spans():
+    source = ((1, 1, 1), (1, 1, 1))
+    assert builder.crossref_key(source, ((1, 1, 31), (1, 2, 3))) != builder.crossref_key(source, ((1, 1, 31), (1, 2, 5)))
+    assert builder.crossref_key(source, ((1, 1, 31), (1, 2, 3))) == builder.crossref_key(source, ((1, 1, 31), (1, 2, 3)))
+
+
+def test_low_votes_are_dropped_or_downranked():
+    rows, stats = import_rows("Gen.1.1\tGen.2.4\t-5", min_votes=0)
+    assert rows == [] and stats["low_votes"] == 1
+
+    rows, stats = import_rows("Gen.1.1\tGen.2.4\t-5", min_votes=0, low_votes="downrank")
+    assert rows[0][8] == builder.DOWNRANKED_WEIGHT and stats["low_votes"] == 1
+
+
+def test_unparseable_reference_is_skipped():
+    rows, stats = import_rows("Xyz.1.1\tGen.2.4\t5")
+    assert rows == [] and stats["skipped"] == 1
+
+
+
+def test_crossref_bytes_count_the_indexes():
+    conn = sqlite3.connect(":memory:")
+    builder.create_tables(conn)
+    conn.executemany(
+        "INSERT INTO cross_references (source_book_id, source_chapter, source_verse_start, source_verse_end, "
+        "target_book_id, target_chapter, target_verse_start, target_verse_end, weight, source) "
+        "VALUES (1, 1, ?, ?, 1, 2, ?, ?, 1.0, 'openbible')",
+        [(v, v, v, v) for v in range(1, 2001)])
+    without_indexes = builder.table_bytes(conn, builder.CROSSREF_TABLES)
+    if without_indexes is None:
+        pytest.skip("SQLite built without dbstat")
+    builder.create_indexes(conn, ["cross_references"])
+    assert builder.table_bytes(conn, builder.CROSSREF_TABLES) > without_indexes
+
+
+def import_file(tmp_path, lines, reverse):
+    """cross_references rows from import_cross_references over `lines` in a plain text file."""
+    source = tmp_path / "cross_references.txt"
+    source.write_text("\n".join([HEADER, *lines]) + "\n", encoding="utf-8")
+    conn = sqlite3.connect(":memory:")
+    builder.create_tables(conn, ["verse_ordinals", "crossref_ordinals", "crossref_reverse"] if reverse else [])
+    conn.executemany("INSERT INTO verses (translation_id, book_id, chapter, verse, text) VALUES ('kjv', ?, ?, ?, '')",
+                     VERSE_KEYS)
+    if reverse:
+        builder.build_verse_ordinals(conn)
+    builder.import_cross_references(conn, source, reverse=reverse)
+    return conn
+
+
+def test_direct_and_staged_imports_write_the_same_rows(tmp_path):
+    lines = ["Gen.1.1\tGen.2.4\t51", "Gen.1.1\tGen.2.4\t3", "Gen.1.2\tGen.1.31-Gen.2.3\t10", "Gen.3.1\tGen.1.1\t-2"]
+    direct = import_file(tmp_path, lines, reverse=False)
+    staged = import_file(tmp_path, lines, reverse=True)
+    rows = "SELECT * FROM cross_references ORDER BY id"
+    assert direct.execute(rows).fetchall() == staged.execute(rows).fetchall()
+    assert [row[0] for row in direct.execute(rows)] == [1, 2]
+    assert staged.execute("SELECT * FROM crossref_ordinals ORDER BY crossref_id").fetchall() == [
+        (1, 1, 1, 35, 35), (2, 2, 2, 31, 34)]
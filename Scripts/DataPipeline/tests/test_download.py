@@ -0,0 +1,108 @@
+"""download_file against a local HTTP server: full download, resume, revalidation and 416."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import build_bible_database as builder
+
+pytestmark = pytest.mark.skipif(not builder.HAS_REQUESTS, reason="needs requests and tqdm")
+
+PAYLOAD = bytes(range(256)) * 64
+ETAG = '"v1"'
+
+
+class SourceHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD with an ETag, honouring Range/If-Range and If-None-Match."""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.server.always_416:
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body, status = PAYLOAD, 200
+        requested = self.headers.get("Range")
+        if requested and self.headers.get("If-Range") == ETAG:
+            start = int(requested.removeprefix("bytes=").rstrip("-"))
+            body, status = PAYLOAD[start:], 206
+        self.send_response(status)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SourceHandler)
+    httpd.requests = []
+    httpd.always_416 = False
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/source.txt"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_full_download(server, tmp_path):
+    dest = tmp_path / "source.txt"
+    assert builder.download_file(server.url, dest) == "downloaded"
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "source.txt.part").exists()
+    assert json.loads((tmp_path / "source.txt.meta.json").read_text())["etag"] == ETAG
+
+
+def test_resume_requests_only_the_missing_bytes(server, tmp_path):
+    dest = tmp_path / "source.txt"
+    (tmp_path / "source.txt.part").write_bytes(PAYLOAD[:1000])
+    (tmp_path / "source.txt.meta.json").write_text(json.dumps({"etag": ETAG}))
+
+    assert builder.download_file(server.url, dest) == "downloaded"
+    assert dest.read_bytes() == PAYLOAD
+    assert server.requests[0]["Range"] == "bytes=1000-"
+    assert server.requests[0]["If-Range"] == ETAG
+
+
+def test_changed_remote_file_restarts_the_partial(server, tmp_path):
+    dest = tmp_path / "source.txt"
+    (tmp_path / "source.txt.part").write_bytes(b"stale bytes from an older version")
+    (tmp_path / "source.txt.meta.json").write_text(json.dumps({"etag": '"v0"'}))
+
+    # If-Range no longer matches, so the server answers 200 with the whole file
+    assert builder.download_file(server.url, dest) == "downloaded"
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_unchanged_cached_file_is_not_downloaded(server, tmp_path):
+    dest = tmp_path / "source.txt"
+    dest.write_bytes(PAYLOAD)
+    (tmp_path / "source.txt.meta.json").write_text(json.dumps({"etag": ETAG}))
+
+    assert builder.download_file(server.url, dest) == "not-modified"
+    assert server.requests[0]["If-None-Match"] == ETAG
+
+
+def test_repeated_416_restarts_once_then_fails(server, tmp_path):
+    server.always_416 = True
+    dest = tmp_path / "source.txt"
+    (tmp_path / "source.txt.part").write_bytes(PAYLOAD[:1000])
+    (tmp_path / "source.txt.meta.json").write_text(json.dumps({"etag": ETAG}))
+
+    assert builder.download_file(server.url, dest) is None
+    assert len(server.requests) == 2
+    assert "Range" in server.requests[0] and "Range" not in server.requests[1]
+    assert not (tmp_path / "source.txt.part").exists()
+    assert not dest.exists()
@@ -0,0 +1,48 @@
+"""import_morphology writes the same language_tokens rows with --jobs 1 and --jobs 2."""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import build_bible_database as builder
+
+
+def hebrew_line(ref: str, word: str) -> str:
+    # Ref | Hebrew | Transliteration | Translation | dStrongs | Grammar
+    return "\t".join([ref, word, word, "word", "H0430G", "HNcmpa"])
+
+
+def greek_line(ref: str, word: str) -> str:
+    # Ref | Greek (translit) | Translation | dStrongs=Grammar | Lemma=Gloss
+    return "\t".join([ref, f"{word} ({word})", "word", "G0976=N-NSF", "βίβλος=book"])
+
+
+# Neither file is in verse order
+SOURCE_LINES = {
+    "stepbible_hebrew_1": [hebrew_line("Gen.1.2#01=L", "c"), hebrew_line("Gen.1.1#02=L", "b"),
+                           hebrew_line("Gen.1.1#01=L", "a")],
+    "stepbible_greek_1": [greek_line("Matt.1.1#02=NKO", "e"), greek_line("Matt.1.1#01=NKO", "d")],
+}
+
+
+def import_tokens(jobs: int) -> tuple:
+    """(language_tokens rows, verse_tokens rows) from importing the test files with `jobs`."""
+    conn = sqlite3.connect(":memory:")
+    builder.create_tables(conn, ["verse_tokens"])
+    builder.import_morphology(conn, jobs=jobs, verse_tokens=True)
+    tokens = conn.execute("SELECT * FROM language_tokens ORDER BY id").fetchall()
+    packed = conn.execute("SELECT * FROM verse_tokens ORDER BY rowid").fetchall()
+    return tokens, packed
+
+
+def test_serial_and_parallel_imports_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(builder, "CACHE_DIR", tmp_path)
+    for source_key, lines in SOURCE_LINES.items():
+        (tmp_path / builder.SOURCES[source_key]["filename"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # Threads share the patched CACHE_DIR on every platform; the ordering logic is the same
+    monkeypatch.setattr(builder, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+    serial = import_tokens(jobs=1)
+    assert serial == import_tokens(jobs=2)
+    tokens, packed = serial
+    assert [token[5] for token in tokens] == ["a", "b", "c", "d", "e"]
+    assert len(packed) == 3
@@ -0,0 +1,29 @@
+"""import_verses skips a translation whose source fails part-way, on the serial path."""
+
+import sqlite3
+
+import build_bible_database as builder
+
+
+def verse_rows(translation_id, count):
+    return [(translation_id, 1, 1, verse, f"{translation_id} verse {verse}") for verse in range(1, count + 1)]
+
+
+def test_source_error_mid_stream_drops_the_partial_translation(tmp_path, monkeypatch):
+    monkeypatch.setattr(builder, "CACHE_DIR", tmp_path)
+    for translation_id in ("kjv", "asv"):
+        (tmp_path / builder.SOURCES[builder.TRANSLATIONS[translation_id]["source"]]["filename"]).touch()
+
+    def iter_verse_rows(source_db, translation_id):
+        # KJV fails after its first chunk has been written
+        yield from verse_rows(translation_id, builder.INSERT_CHUNK_SIZE + 1 if translation_id == "kjv" else 3)
+        if translation_id == "kjv":
+            raise sqlite3.DatabaseError("database disk image is malformed")
+
+    monkeypatch.setattr(builder, "iter_verse_rows", iter_verse_rows)
+    conn = sqlite3.connect(":memory:")
+    builder.create_tables(conn)
+    builder.populate_translations(conn, ["kjv", "asv"])
+
+    assert builder.import_verses(conn, ["kjv", "asv"], jobs=1) == 3
+    assert conn.execute("SELECT DISTINCT translation_id FROM verses").fetchall() == [("asv",)]
@@ -0,0 +1,42 @@
+"""index_advisor.advise on a small database with the builder's indexes."""
+
+import sqlite3
+
+import pytest
+
+import build_bible_database as builder
+import index_advisor
+
+CROSSREF_ROW = (1, 1, 1, 1, 1, 2, 4, 4, 1.0, "openbible")
+
+
+def advised(monkeypatch, extra_indexes: list, used: dict) -> tuple:
+    """advise() over cross_references with one row and the SCHEMA_INDEXES plus extra_indexes."""
+    monkeypatch.setattr(builder, "SCHEMA_INDEXES", builder.SCHEMA_INDEXES + extra_indexes)
+    monkeypatch.setattr(builder, "BUILDER_INDEXES", builder.BUILDER_INDEXES | {name for name, _, _ in extra_indexes})
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("SELECT 1 FROM dbstat LIMIT 1")
+    except sqlite3.OperationalError:
+        pytest.skip("SQLite built without dbstat")
+    builder.create_tables(conn)
+    conn.execute(builder.CROSSREF_INSERT_SQL, CROSSREF_ROW)
+    builder.create_indexes(conn, ["cross_references"])
+    workload = {query: {"indexes": indexes} for query, indexes in used.items()}
+    drop, keep = index_advisor.advise(conn, workload)
+    return {entry["name"]: entry["reason"] for entry in drop}, {entry["name"]: entry["reason"] for entry in keep}
+
+
+def test_app_index_is_not_dropped_for_a_wider_builder_index(monkeypatch):
+    wide = ("idx_crossrefs_wide", "cross_references", "source_book_id, source_chapter, source_verse_start, weight")
+    drop, keep = advised(monkeypatch, [wide], {"crossrefs": ["idx_crossrefs_source", "idx_crossrefs_wide"],
+                                               "incoming": ["idx_crossrefs_target"]})
+    assert "idx_crossrefs_source" in keep
+    assert "idx_crossrefs_source" not in drop
+
+
+def test_builder_index_is_dropped_for_a_wider_one(monkeypatch):
+    narrow = ("idx_crossrefs_narrow", "cross_references", "source_book_id, source_chapter")
+    drop, keep = advised(monkeypatch, [narrow], {"crossrefs": ["idx_crossrefs_source", "idx_crossrefs_narrow"],
+                                                 "incoming": ["idx_crossrefs_target"]})
+    assert drop == {"idx_crossrefs_narrow": "columns are a prefix of idx_crossrefs_source"}
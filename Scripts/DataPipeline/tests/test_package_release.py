@@ -0,0 +1,125 @@
+"""Page-level patches and release verification on small hand-made databases."""
+
+import argparse
+import sqlite3
+
+import pytest
+
+import package_release as release
+
+PAGE_SIZE = 512
+
+
+def pages(*fills) -> bytes:
+    """A fake SQLite file: a header page, then one PAGE_SIZE page per fill byte."""
+    header = b"SQLite format 3\x00" + PAGE_SIZE.to_bytes(2, "big")
+    data = header.ljust(PAGE_SIZE, b"\x00")
+    for fill in fills:
+        data += bytes([fill]) * PAGE_SIZE
+    return data
+
+
+def test_identical_files_copy_every_page():
+    base = pages(1, 2, 3)
+    patch, copied, literal = release.make_patch(base, base)
+    assert (copied, literal) == (4, 0)
+    assert release.apply_patch(base, patch) == base
+
+
+def test_inserted_page_is_the_only_literal():
+    base = pages(1, 2, 3)
+    target = pages(1, 9, 2, 3)
+    patch, copied, literal = release.make_patch(base, target)
+    assert (copied, literal) == (4, 1)
+    assert release.apply_patch(base, patch) == target
+
+
+def test_shrunk_and_reordered_target():
+    base = pages(1, 2, 3, 4)
+    target = pages(4, 3, 1)
+    patch, copied, literal = release.make_patch(base, target)
+    assert literal == 0
+    assert release.apply_patch(base, patch) == target
+
+
+def test_patch_rejects_another_base():
+    patch, _, _ = release.make_patch(pages(1, 2), pages(1, 3))
+    with pytest.raises(ValueError, match="base database"):
+        release.apply_patch(pages(1, 4), patch)
+
+
+def test_not_a_sqlite_file():
+    with pytest.raises(ValueError, match="not a SQLite database"):
+        release.make_patch(b"", b"plain text")
+
+
+@pytest.fixture
+def releases(tmp_path, monkeypatch):
+    """Two packaged releases of a small database, the second with a patch from the first."""
+    monkeypatch.setattr(release.builder, "MANIFEST_PATH", tmp_path / "build_manifest.json")
+    database = tmp_path / "BibleData.sqlite"
+    args = argparse.Namespace(database=database, releases=tmp_path / "releases", previous=None, level=3)
+    conn = sqlite3.connect(database)
+    conn.execute("CREATE TABLE verses (id INTEGER PRIMARY KEY, text TEXT)")
+    conn.executemany("INSERT INTO verses (text) VALUES (?)", [(f"verse {i}",) for i in range(500)])
+    conn.commit()
+    release.package(args)
+    conn.execute("UPDATE verses SET text = 'changed' WHERE id = 250")
+    conn.commit()
+    conn.close()
+    release.package(args)
+    return args.releases
+
+
+@pytest.mark.skipif(not release.HAS_ZSTD, reason="needs zstandard")
+def test_verify_passes(releases, capsys):
+    release.verify(argparse.Namespace(releases=releases, release=None))
+    assert "verified" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(not release.HAS_ZSTD, reason="needs zstandard")
+def test_verify_reports_a_missing_artifact(releases, capsys):
+    index = release.load_index(releases)
+    latest = release.load_release(releases, index["stem"], index["latest"])
+    (releases / latest["artifact"]["file"]).unlink()
+
+    with pytest.raises(SystemExit) as exit_info:
+        release.verify(argparse.Namespace(releases=releases, release=None))
+    assert exit_info.value.code == 1
+    out = capsys.readouterr().out
+    assert f"FAIL: {latest['artifact']['file']}" in out
+    # The patch is still checked against the release's checksum
+    assert f"{latest['patch']['file']}: {latest['previous']} + patch == {latest['id']}" in out
+
+
+@pytest.mark.skipif(not release.HAS_ZSTD, reason="needs zstandard")
+def test_package_with_a_missing_previous_artifact_writes_nothing(releases, tmp_path):
+    index = release.load_index(releases)
+    latest = release.load_release(releases, index["stem"], index["latest"])
+    (releases / latest["artifact"]["file"]).unlink()
+    before = sorted(releases.iterdir())
+
+    conn = sqlite3.connect(tmp_path / "BibleData.sqlite")
+    conn.execute("UPDATE verses SET text = 'changed again' WHERE id = 1")
+    conn.commit()
+    conn.close()
+    args = argparse.Namespace(database=tmp_path / "BibleData.sqlite", releases=releases, previous=None, level=3)
+    with pytest.raises(SystemExit) as exit_info:
+        release.package(args)
+    assert exit_info.value.code == 1
+    assert sorted(releases.iterdir()) == before
+
+
+@pytest.mark.skipif(not release.HAS_ZSTD, reason="needs zstandard")
+def test_package_rejects_an_unknown_previous_release(releases, tmp_path):
+    before = sorted(releases.iterdir())
+    conn = sqlite3.connect(tmp_path / "BibleData.sqlite")
+    conn.execute("UPDATE verses SET text = 'changed again' WHERE id = 1")
+    conn.commit()
+    conn.close()
+    args = argparse.Namespace(database=tmp_path / "BibleData.sqlite", releases=releases,
+                              previous="000000000000", level=3)
+    with pytest.raises(SystemExit) as exit_info:
+        release.package(args)
+    assert exit_info.value.code == 1
+    assert sorted(releases.iterdir()) == before
@@ -0,0 +1,18 @@
+import build_bible_database as builder
+
+
+def timings(*trials):
+    ordered = sorted(trials)
+    return {"trial_chapter_p50_us": list(trials), "chapter_p50_us": ordered[len(ordered) // 2]}
+
+
+def test_a_clear_win_in_every_trial_beats_the_built_file():
+    assert builder.layout_beats(timings(70.0, 72.0, 71.0), timings(100.0, 98.0, 101.0), 0.10)
+
+
+def test_a_win_within_the_margin_keeps_the_built_file():
+    assert not builder.layout_beats(timings(95.0, 94.0, 96.0), timings(100.0, 98.0, 101.0), 0.10)
+
+
+def test_losing_any_trial_keeps_the_built_file():
+    assert not builder.layout_beats(timings(60.0, 62.0, 110.0), timings(100.0, 98.0, 101.0), 0.10)
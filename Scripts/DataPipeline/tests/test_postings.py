@@ -0,0 +1,27 @@
+"""encode_postings/decode_postings on hand-written LEB128 gap bytes."""
+
+import build_bible_database as builder
+
+
+def test_small_gaps_are_one_byte_each():
+    assert builder.encode_postings([1, 2, 5]) == bytes([1, 1, 3])
+
+
+def test_large_gap_spans_several_bytes():
+    # 31102 - 1 = 31101 = 1 * 128**2 + 114 * 128 + 125: low 7 bits first, high bit on all but the last
+    assert builder.encode_postings([1, 31102]) == bytes([0x01, 0xFD, 0xF2, 0x01])
+    assert builder.decode_postings(bytes([0x01, 0xFD, 0xF2, 0x01])) == [1, 31102]
+
+
+def test_gap_of_128_needs_a_continuation_byte():
+    assert builder.encode_postings([128]) == bytes([0x80, 0x01])
+
+
+def test_empty_postings():
+    assert builder.encode_postings([]) == b""
+    assert builder.decode_postings(b"") == []
+
+
+def test_round_trip():
+    ordinals = [3, 4, 130, 131, 16_500, 31_102]
+    assert builder.decode_postings(builder.encode_postings(ordinals)) == ordinals
@@ -0,0 +1,50 @@
+"""parse_stepbible_line on hand-written TAHOT/TAGNT lines."""
+
+import build_bible_database as builder
+
+# Ref | Hebrew | Transliteration | Translation | dStrongs | Grammar | 5 unused columns | Expanded Strong tags
+TAHOT_LINE = "\t".join([
+    "Gen.1.1#01=L", "בְּ/רֵאשִׁ֖ית", "be./re.Shit", "in/ beginning", "H9003/{H7225G}", "HR/Ncfsa",
+    "Gen.1.1", "", "", "", "",
+    "H9003=ב=in/{H7225G=רֵאשִׁית=: beginning}",
+])
+
+# Ref | Greek (translit) | Translation | dStrongs=Grammar | Lemma=Gloss | editions
+TAGNT_LINE = "\t".join([
+    "Matt.1.1#01=NKO", "Βίβλος (Biblos)", "[The] book", "G0976=N-NSF", "βίβλος=book", "NA28+NA27+Tyn+SBL",
+])
+
+
+def test_hebrew_line():
+    assert builder.parse_stepbible_line(TAHOT_LINE, "hebrew") == (
+        1, 1, 1, 1, "בְּ/רֵאשִׁ֖ית", "רֵאשִׁית", "HR/Ncfsa", "H7225G", "in/ beginning", "hebrew",
+    )
+
+
+def test_hebrew_line_without_braced_strongs_or_expanded_tags():
+    line = "\t".join(["Gen.1.1#03=L", "אֱלֹהִ֑ים", "'e.lo.Him", "God", "H0430G", "HNcmpa"])
+    assert builder.parse_stepbible_line(line, "hebrew") == (
+        1, 1, 1, 3, "אֱלֹהִ֑ים", None, "HNcmpa", "H0430G", "God", "hebrew",
+    )
+
+
+def test_hebrew_versification_uses_english_reference():
+    line = TAHOT_LINE.replace("Gen.1.1#01=L", "Gen.31.55(32.1)#04=L", 1)
+    assert builder.parse_stepbible_line(line, "hebrew")[:4] == (1, 31, 55, 4)
+
+
+def test_greek_line():
+    assert builder.parse_stepbible_line(TAGNT_LINE, "greek") == (
+        40, 1, 1, 1, "Βίβλος", "βίβλος", "N-NSF", "G0976", "[The] book", "greek",
+    )
+
+
+def test_numbered_book():
+    line = TAGNT_LINE.replace("Matt.1.1#01", "1Cor.13.4#12", 1)
+    assert builder.parse_stepbible_line(line, "greek")[:4] == (46, 13, 4, 12)
+
+
+def test_rejected_lines():
+    assert builder.parse_stepbible_line("Eng (Heb) Ref & Type\tHebrew\tTransliteration", "hebrew") is None
+    assert builder.parse_stepbible_line(TAGNT_LINE.replace("Matt.", "Tob.", 1), "greek") is None
+    assert builder.parse_stepbible_line("Matt.1.1#01=NKO\tΒίβλος (Biblos)\t[The] book", "greek") is None
@@ -11,6 +11,7 @@ Usage:
     python generate_commentary.py --book john --all          # Generate all of John
     python generate_commentary.py --book romans --all        # Generate all of Romans
     python generate_commentary.py --validate                 # Validate existing DB
+    python generate_commentary.py --shards testament         # Split the DB into OT/NT packs
 
 Requirements:
     pip install openai
@@ -129,6 +130,14 @@ BIBLE_DB_PATH = PROJECT_ROOT / "BibleStudy" / "Resources" / "BibleData.sqlite"
 OUTPUT_DB_PATH = PROJECT_ROOT / "BibleStudy" / "Resources" / "CommentaryData.sqlite"
 PROMPT_PATH = SCRIPT_DIR / "prompts" / "marginalia_prompt.txt"
 
+# --shards: commentary_insights split into per-testament or per-book packs next to
+# the output by build_bible_database.py's own pack writer, so the packs and
+# manifest.json have the same layout as its --shards. The builder is only
+# imported for --shards (see write_shard_packs).
+DATA_PIPELINE_DIR = SCRIPT_DIR.parent / "DataPipeline"
+SHARD_LAYOUTS = ["testament", "book"]  # build_bible_database.SHARD_LAYOUTS
+SHARDED_TABLES = {"commentary_insights": "book_id IN ({books})"}
+
 
 def load_prompt_template() -> str:
     """Load the marginalia prompt template."""
@@ -186,6 +195,18 @@ def create_schema(conn: sqlite3.Connection):
     conn.commit()
 
 
+def write_shard_packs(layout: str) -> dict:
+    """
+    Split CommentaryData.sqlite into CommentaryData-packs/ with the builder's
+    write_shard_packs: a core pack, one pack per testament or book that has
+    insights, and manifest.json. Returns the manifest.
+    """
+    sys.path.insert(0, str(DATA_PIPELINE_DIR))
+    import build_bible_database as builder
+
+    return builder.write_shard_packs(OUTPUT_DB_PATH, layout, SHARDED_TABLES)
+
+
 def get_verses(conn: sqlite3.Connection, book_id: int, chapter: int) -> list[dict]:
     """Get all verses for a chapter."""
     cursor = conn.execute(
@@ -554,6 +575,8 @@ def main():
     parser.add_argument("--all", action="store_true", help="Generate all chapters")
     parser.add_argument("--validate", action="store_true", help="Validate existing database")
     parser.add_argument("--dry-run", action="store_true", help="Don't save to database")
+    parser.add_argument("--shards", choices=SHARD_LAYOUTS,
+                        help="Split the existing database into per-testament or per-book packs")
 
     args = parser.parse_args()
 
@@ -561,10 +584,21 @@ def main():
         print("Error: --verse requires --chapter")
         sys.exit(1)
 
-    if not (args.chapter or args.all or args.validate):
+    if not (args.chapter or args.all or args.validate or args.shards):
         parser.print_help()
         return
 
+    if args.shards:
+        if not OUTPUT_DB_PATH.exists():
+            print(f"Error: {OUTPUT_DB_PATH} not found. Generate commentary first.")
+            sys.exit(1)
+        manifest = write_shard_packs(args.shards)
+        for pack in manifest["packs"]:
+            print(f"  {pack['file']:<32} {pack['rows'].get('commentary_insights', 0):>6} insights  "
+                  f"{pack['size_bytes'] / 1024:,.0f} KB")
+        print(f"Wrote {len(manifest['packs'])} packs and manifest.json to {OUTPUT_DB_PATH.stem}-packs/")
+        return
+
     # Get book info
     book_info = BOOKS[args.book]
 
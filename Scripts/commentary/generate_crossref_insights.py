@@ -58,6 +58,7 @@ CONFIG = {
     "max_retries": 3,  # Retry on transient API failures
     "base_delay": 1.0,  # Base delay for exponential backoff (seconds)
     "translation_id": "kjv",  # Translation for verse lookups
+    "centrality_weight": 0.0,  # >0: rank targets by weight + this x PageRank percentile (needs --crossref-graph)
 }
 
 # Book mappings
@@ -134,6 +135,16 @@ STRICT RULES - You must follow these:
 class CrossRefGenerator:
     def __init__(self, bible_db_path: Path, dry_run: bool = False, output_sql: str = None):
         self.bible_db = sqlite3.connect(bible_db_path)
+        # crossref_topk only exists in builds with --crossref-topk
+        try:
+            self.has_topk = self.bible_db.execute("SELECT 1 FROM crossref_topk LIMIT 1").fetchone() is not None
+        except sqlite3.OperationalError:
+            self.has_topk = False
+        # verse_centrality only exists in builds with --crossref-graph
+        try:
+            self.verse_count = self.bible_db.execute("SELECT MAX(rank) FROM verse_centrality").fetchone()[0] or 0
+        except sqlite3.OperationalError:
+            self.verse_count = 0
         self.dry_run = dry_run
         self.output_sql = output_sql
         self.sql_values = []  # Collect SQL values for batch output
@@ -191,6 +202,20 @@ class CrossRefGenerator:
     def get_cross_references(self, book_id: int, chapter: int, verse: int) -> list:
         """Get all cross-references for a verse, ordered by weight with deterministic tie-breaking."""
         cursor = self.bible_db.cursor()
+
+        # Databases built with --crossref-topk hold the same ranking pre-sorted;
+        # use it unless this verse's list was truncated
+        if self.has_topk:
+            cursor.execute("""
+                SELECT target_book_id, target_chapter, target_verse_start, target_verse_end, weight, ref_count
+                FROM crossref_topk
+                WHERE source_book_id = ? AND source_chapter = ? AND source_verse = ?
+                ORDER BY rank
+            """, (book_id, chapter, verse))
+            rows = cursor.fetchall()
+            if not rows or rows[0][5] == len(rows):
+                return [row[:5] for row in rows]
+
         cursor.execute("""
             SELECT target_book_id, target_chapter, target_verse_start, target_verse_end, weight
             FROM cross_references
@@ -234,11 +259,31 @@ class CrossRefGenerator:
 
         return selected
 
+    def get_centrality(self, book_id: int, chapter: int, verse: int) -> float:
+        """PageRank percentile of a verse in the cross-reference graph: 1.0 is the most central."""
+        row = self.bible_db.execute("""
+            SELECT c.rank FROM verse_centrality c
+            JOIN verse_ordinals o ON o.ordinal = c.ordinal
+            WHERE o.book_id = ? AND o.chapter = ? AND o.verse = ?
+        """, (book_id, chapter, verse)).fetchone()
+        if row is None:
+            return 0.0
+        return 1.0 - (row[0] - 1) / self.verse_count
+
+    def rank_by_centrality(self, crossrefs: list) -> list:
+        """Re-rank by weight plus CONFIG["centrality_weight"] x the centrality of each first target verse."""
+        bonus = CONFIG["centrality_weight"]
+        # sorted() is stable, so equal scores keep the deterministic SQL order
+        return sorted(crossrefs, key=lambda ref: -(ref[4] + bonus * self.get_centrality(*ref[:3])))
+
     def diversify_crossrefs(self, crossrefs: list) -> list:
         """Select diversified cross-references (5-7, with fallback if constraints too strict)."""
         min_refs = CONFIG["min_crossrefs"]
         max_refs = CONFIG["max_crossrefs"]
 
+        if CONFIG["centrality_weight"] > 0 and self.verse_count:
+            crossrefs = self.rank_by_centrality(crossrefs)
+
         # Pass 1: Strict constraints
         selected = self._select_with_constraints(
             crossrefs,
@@ -6,7 +6,8 @@ Validates the generated CommentaryData.sqlite against:
 1. Schema correctness
 2. Segment locator bounds
 3. Cross-reference validity (against BibleData.sqlite)
-4. Strong's number format
+4. Strong's number format (and, when BibleData.sqlite has strongs_concordance,
+   that the number occurs in the insight's verses)
 5. Content quality checks (ban list, length)
 
 Usage:
@@ -19,6 +20,8 @@ import argparse
 import json
 import re
 import sqlite3
+import sys
+from bisect import bisect_left
 from pathlib import Path
 from typing import Optional
 
@@ -28,6 +31,10 @@ PROJECT_ROOT = SCRIPT_DIR.parent.parent
 BIBLE_DB_PATH = PROJECT_ROOT / "BibleStudy" / "Resources" / "BibleData.sqlite"
 COMMENTARY_DB_PATH = PROJECT_ROOT / "BibleStudy" / "Resources" / "CommentaryData.sqlite"
 
+# strongs_concordance postings are decoded with the builder's own decoder
+sys.path.insert(0, str(SCRIPT_DIR.parent / "DataPipeline"))
+from build_bible_database import decode_postings  # noqa: E402
+
 # Validation rules
 BAN_LIST = [
     # Doctrinal overreach
@@ -105,6 +112,35 @@ def verse_exists(bible_conn: sqlite3.Connection, book_id: int, chapter: int, ver
     return cursor.fetchone() is not None
 
 
+def strongs_verses(bible_conn: sqlite3.Connection, strong_id: str) -> Optional[list[int]]:
+    """
+    Verse ordinals using a Strong's number (e.g. "G26"), from strongs_concordance.
+    Empty if it never occurs; None if the database has no concordance.
+    """
+    try:
+        row = bible_conn.execute(
+            "SELECT postings FROM strongs_concordance WHERE strong_id = ?",
+            (strong_id,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return decode_postings(row[0]) if row else []
+
+
+def verse_ordinal_range(
+    bible_conn: sqlite3.Connection, book_id: int, chapter: int, verse_start: int, verse_end: int
+) -> Optional[tuple[int, int]]:
+    """First and last verse_ordinals ordinal of a passage, or None if it is not numbered."""
+    try:
+        row = bible_conn.execute(
+            "SELECT MIN(ordinal), MAX(ordinal) FROM verse_ordinals WHERE book_id = ? AND chapter = ? AND verse BETWEEN ? AND ?",
+            (book_id, chapter, verse_start, verse_end)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row if row[0] is not None else None
+
+
 def get_book_id(book_name: str) -> Optional[int]:
     """Convert book name to ID."""
     # Simplified mapping - expand as needed
@@ -276,6 +312,21 @@ def validate_sources(
                     if not (STRONGS_HEBREW_RANGE[0] <= number <= STRONGS_HEBREW_RANGE[1]):
                         result.add_warning(insight_id, f"Strong's number out of range: {ref}")
 
+                # Check the word is actually used in the passage the insight annotates
+                ordinals = strongs_verses(bible_conn, f"{prefix}{number}")
+                passage = verse_ordinal_range(
+                    bible_conn, insight["book_id"], insight["chapter"],
+                    insight["verse_start"], insight.get("verse_end") or insight["verse_start"]
+                )
+                if ordinals is not None and passage is not None:
+                    first, last = passage
+                    if not ordinals:
+                        result.add_warning(insight_id, f"Strong's number never occurs in the text: {ref}")
+                    else:
+                        index = bisect_left(ordinals, first)
+                        if index == len(ordinals) or ordinals[index] > last:
+                            result.add_warning(insight_id, f"Strong's number not used in this passage: {ref}")
+
     return True
 
 